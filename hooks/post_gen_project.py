@@ -2,11 +2,478 @@
 """Post-generation hook to set up the project."""
 
 import os
+import re
 import sys
+import time
+import keyword
 import subprocess
 import json
+import concurrent.futures
+import functools
+import hashlib
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+# Specs smaller than this are rendered serially; process start-up would dominate
+PARALLEL_GENERATION_THRESHOLD = 200
+LOCKFILE_NAME = "mcp-cookie-cutter.lock"
+LOCKFILE_VERSION = 1
+
+# Validate request bodies and responses of generated tools with Pydantic TypeAdapters
+VALIDATE_PAYLOADS = "{{ cookiecutter.validate_payloads }}" == "y"
+BATCH_TOOL = "{{ cookiecutter.batch_tool }}" == "y"
+BATCH_TOOL_NAME = "batch_call"
+
+PATH_PLACEHOLDER_RE = re.compile(r'\{([^}]+)\}')
+INVALID_IDENTIFIER_CHARS_RE = re.compile(r'[^a-zA-Z0-9_]')
+# Fallback auth detection for specs without security schemes. Names are split
+# into lowercase words ("X-API-Key" -> x, api, key; "accessToken" -> access, token)
+NAME_WORD_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
+AUTH_PARAM_NAMES = ('apikey', 'xapikey', 'appid', 'appkey', 'authorization', 'accesstoken', 'authtoken', 'apitoken', 'apisecret', 'clientsecret')
+AUTH_NAME_WORDS = ('token', 'secret', 'bearer', 'oauth', 'auth', 'authorization', 'credential', 'credentials')
+# Words that make a token-like name something else, e.g. page_token or next_token
+NON_AUTH_NAME_WORDS = ('page', 'next', 'cursor', 'continuation', 'sync', 'pagination', 'csrf')
+AUTH_PARAM_DESCRIPTION_RE = re.compile(
+    r'\bapi[ _-]?key\b|\baccess[ _-]?token\b|\bbearer\b|\bclient[ _-]?secret\b'
+    r'|\bauth(?:entication|orization)? (?:key|token|header|credential)'
+)
+# Query parameter names (lowercased, without "_" and "-") that mark a paginated listing
+PAGINATION_NAME_RE = re.compile(r'[_\-]')
+CURSOR_PARAM_NAMES = ('cursor', 'pagetoken', 'nextpagetoken', 'continuationtoken', 'nexttoken', 'startingafter')
+PAGE_PARAM_NAMES = ('page', 'pagenumber', 'pagenum', 'pageno')
+OFFSET_PARAM_NAMES = ('offset', 'skip', 'startindex', 'start')
+PAGE_SIZE_PARAM_NAMES = ('limit', 'perpage', 'pagesize', 'size', 'count', 'maxresults', 'top')
+# Request body encodings the generated runtime can produce
+REQUEST_ENCODINGS = ('gzip', 'deflate', 'br', 'zstd')
+# Form bodies: their media types, encodings and the httpx argument that sends them
+FORM_MEDIA_TYPES = (('application/x-www-form-urlencoded', 'form'), ('multipart/form-data', 'multipart'))
+FORM_REQUEST_ARGS = {'form': 'data=form', 'multipart': 'files=files'}
+# Media types of binary responses, which generated tools stream instead of buffering
+BINARY_MAIN_TYPES = ('image', 'audio', 'video', 'font')
+TEXT_APPLICATION_TYPES = ('json', 'xml', 'javascript', 'x-www-form-urlencoded', 'x-ndjson', 'yaml', 'x-yaml', 'csv')
+PYTHON_PARAM_TYPES = dict(string='str', integer='int', boolean='bool', number='float')
+
+# Code templates are compiled once per process (see get_code_template) and
+# rendered once per tool. Cookiecutter renders this hook with Jinja too, hence
+# the raw block around them.
+# {% raw %}
+FASTMCP_TOOL_TEMPLATE = r'''"""Auto-generated tool: {{ tool_name }}"""
+
+import os
+from typing import Any
+
+{% if not path_params %}
+import httpx
+
+{% endif %}
+{% if validate_payloads and (request_model or response_models) %}
+# Validators are built once at import and reused for every call
+try:
+    from pydantic import TypeAdapter
+    from {{ project_slug }}.models import {{ model_names | join(', ') }}
+
+    _REQUEST_ADAPTER = {{ 'TypeAdapter(%s)' % request_model if request_model else 'None' }}
+    _RESPONSE_ADAPTERS = {
+{% for status, model in response_models %}
+        "{{ status }}": TypeAdapter({{ model }}),
+{% endfor %}
+    }
+except ImportError:
+    _REQUEST_ADAPTER = None
+    _RESPONSE_ADAPTERS = {}
+
+{% elif model_names %}
+# Import only the models this tool uses; each loads lazily from models/
+try:
+    from {{ project_slug }}.models import {{ model_names | join(', ') }}
+except ImportError:
+    pass
+
+{% endif %}
+from {{ project_slug }}.runtime.binary import {{ 'is_binary, read_binary' if binary_response else 'binary_content, is_binary' }}
+from {{ project_slug }}.runtime.client import get_tool_client
+from {{ project_slug }}.runtime.output import guard_output
+{% if pagination_param %}
+from {{ project_slug }}.runtime.pagination import paginate
+{% endif %}
+{% if fields_param %}
+from {{ project_slug }}.runtime.projection import load_json{{ ', parse_fields, project' if pagination_param or (validate_payloads and response_models) }}
+{% endif %}
+{% if security %}
+from {{ project_slug }}.runtime.security import apply_security
+{% endif %}
+{% if body_encoding == 'multipart' %}
+from {{ project_slug }}.runtime.uploads import multipart_body
+{% elif body_encoding and body_encoding != 'form' %}
+from {{ project_slug }}.runtime.uploads import FileUpload
+{% endif %}
+{% if response_codec == 'xml' %}
+from {{ project_slug }}.runtime.xml_codec import parse_xml
+{% endif %}
+{% if uses_oauth %}
+from {{ project_slug }}.runtime.upstream_auth import upstream_credential
+{% endif %}
+
+# Get BASE_URL from environment or use default from OpenAPI spec
+BASE_URL = os.getenv("BASE_URL", "{{ base_url }}")
+{% if not path_params %}
+# Parsed once at import, since every call requests the same URL
+URL = httpx.URL(f"{BASE_URL}{{ url_path }}")
+{% endif %}
+{% if fields_param %}
+
+# Fields returned when the caller does not pass `{{ fields_param }}` (x-mcp-fields)
+DEFAULT_FIELDS = {{ default_fields }}
+{% endif %}
+
+# Upstream timeouts in seconds (x-mcp-timeout); see runtime/timeouts.py for overrides
+TIMEOUTS = {{ timeouts }}
+{% if request_encoding %}
+
+# Encoding the API accepts for request bodies; see runtime/compression.py
+REQUEST_ENCODING = "{{ request_encoding }}"
+{% endif %}
+{% if pagination_param %}
+
+# How this operation paginates (detected from its parameters and responses)
+PAGINATION = {{ pagination }}
+{% endif %}
+{% if security %}
+
+# Security requirements from the spec, alternatives in order (see runtime/security.py)
+SECURITY = {{ security }}
+{% endif %}
+
+{% for param_name, env_var_name in auth_vars %}
+# Authentication: {{ param_name }} from environment
+{{ env_var_name }} = os.getenv("{{ env_var_name }}", "")
+{% endfor %}
+{% if auth_vars %}
+
+{% endif %}
+@mcp.tool()  # type: ignore
+async def {{ tool_name }}(
+{% for name, type, param_desc in required_params %}
+    {{ name }}: {{ type }},  # {{ param_desc }}
+{% endfor %}
+{% if has_request_body %}
+    body: dict,  # Request body
+{% endif %}
+{% for name, type, param_desc, note in optional_params %}
+    {{ name }}: {{ type }} | None = None,  # {{ param_desc }}{{ note }}
+{% endfor %}
+{% if fields_param %}
+    {{ fields_param }}: str | None = None,  # Comma-separated fields to return, e.g. "id,name,owner.name" ("*" for all)
+{% endif %}
+{% if pagination_param %}
+    {{ pagination_param }}: int | None = None,  # Fetch following pages until this many items are collected
+{% endif %}
+) -> Any:
+    """{{ description }}"""
+{% if validate_payloads and request_model and json_arg %}
+    if _REQUEST_ADAPTER is not None{{ ' and %s is not None' % json_arg if not has_request_body }}:
+        # Reject invalid bodies before they reach the API
+        {{ json_arg }} = _REQUEST_ADAPTER.dump_python(
+            _REQUEST_ADAPTER.validate_python({{ json_arg }}), mode="json", by_alias=True, exclude_unset=True
+        )
+{% endif %}
+    url = {{ 'f"{BASE_URL}%s"' % url_path if path_params else 'URL' }}
+
+    # Prepare request headers
+    headers = {{ '{"Accept": "%s"}' % accept if accept else '{}' }}
+{% for original, name, env_var, token in header_params %}
+{% if env_var %}
+    # Auto-inject {{ original }} header from parameter or environment{{ ' (or an OAuth token)' if token }}
+    {{ name }}_value = {{ name }} or {{ env_var }}{{ ' or await upstream_credential("%s")' % token if token }}
+    if not {{ name }}_value:
+        raise ValueError("{{ original }} required. Provide as parameter or set {{ env_var }} environment variable{{ ' (or UPSTREAM_OAUTH_* for OAuth client credentials)' if token }}.")
+    headers["{{ original }}"] = {{ name }}_value
+{% else %}
+    if {{ name }} is not None:
+        headers["{{ original }}"] = {{ name }}
+{% endif %}
+{% endfor %}
+{% if has_params %}
+
+    params = {}
+{% for original, name, env_var, token in query_params %}
+{% if env_var %}
+    # Auto-inject {{ original }} from parameter or environment{{ ' (or an OAuth token)' if token }}
+    {{ name }}_value = {{ name }} or {{ env_var }}{{ ' or await upstream_credential("%s")' % token if token }}
+    if not {{ name }}_value:
+        raise ValueError("{{ original }} required. Provide as parameter or set {{ env_var }} environment variable{{ ' (or UPSTREAM_OAUTH_* for OAuth client credentials)' if token }}.")
+    params["{{ original }}"] = {{ name }}_value
+{% else %}
+    if {{ name }} is not None:
+        params["{{ original }}"] = {{ name }}
+{% endif %}
+{% endfor %}
+{% endif %}
+{% if security %}
+    # Credentials of the first security requirement that is configured
+    await apply_security(SECURITY, headers, params)
+{% endif %}
+
+    # Timeouts and the call's deadline apply to every request below, retries included
+    client = get_tool_client("{{ tool_name }}", TIMEOUTS{{ ', REQUEST_ENCODING' if request_encoding }})
+{% if pagination_param %}
+
+    if {{ pagination_param }} is not None:
+        # Fetch the following pages too and merge their items
+        data = await paginate(client, url, {{ 'params' if has_params else '{}' }}, headers, PAGINATION, {{ pagination_param }}{{ ', _RESPONSE_ADAPTERS.get("200")' if validate_payloads and response_models }}{{ ', credential_params=%s' % credential_params if credential_params }})
+        return guard_output(project(data, parse_fields({{ fields_param }} if {{ fields_param }} is not None else DEFAULT_FIELDS)), {{ pagination_param }})
+{% endif %}
+
+{% if body_encoding in ('form', 'multipart') %}
+    # Form fields{{ ', and files streamed from disk (paths or file:// URIs)' if body_encoding == 'multipart' else ', sent url-encoded' }}
+    form = {}
+{% for original, name in form_fields %}
+    if {{ name }} is not None:
+        form["{{ original }}"] = {{ name }}
+{% endfor %}
+{% endif %}
+{% if body_encoding == 'form' %}
+    response = await client.{{ method | lower }}({{ request_args }})
+{% elif body_encoding == 'multipart' %}
+    with multipart_body(form, {
+{% for original, name in file_fields %}
+        "{{ original }}": {{ name }},
+{% endfor %}
+    }) as files:
+        response = await client.{{ method | lower }}({{ request_args }})
+{% elif body_encoding %}
+    # The file is streamed from disk in chunks (a path or file:// URI)
+    upload = FileUpload({{ upload_arg }})
+    headers.setdefault("Content-Type", "{{ body_encoding }}")
+    headers["Content-Length"] = str(upload.size)
+    response = await client.{{ method | lower }}({{ request_args }})
+{% elif binary_response %}
+    # The API answers with binary content, streamed into a spool file instead of memory
+    response = await client.{{ method | lower }}({{ request_args }})
+{% else %}
+    response = await client.{{ method | lower }}({{ request_args }})
+{% endif %}
+{% if binary_response %}
+    try:
+        response.raise_for_status()
+        if is_binary(response):
+            return await read_binary(response, client)
+        await client.read(response)
+    finally:
+        await response.aclose()
+{% else %}
+    response.raise_for_status()
+{% endif %}
+
+{% set text_codec = 'json' if response_codec == 'binary' else response_codec %}
+    # Try to parse as {{ text_codec | upper }}, fallback to text if not {{ text_codec | upper }}
+    if not response.content:
+        return {"status": "success"}
+{% if not binary_response %}
+    if is_binary(response):
+        # Images and other binary content are returned as MCP content, not as text
+        return binary_content(response)
+{% endif %}
+
+{% if validate_payloads and response_models %}
+    status = str(response.status_code)
+    adapter = (_RESPONSE_ADAPTERS.get(status) or _RESPONSE_ADAPTERS.get(status[0] + "XX")
+               or _RESPONSE_ADAPTERS.get("default"))
+    if adapter is not None:
+        # Parse and validate in one step, then return plain JSON data
+{% if fields_param %}
+        data = adapter.dump_python(adapter.validate_json(response.content), mode="json", by_alias=True, exclude_unset=True)
+        return guard_output(project(data, parse_fields({{ fields_param }} if {{ fields_param }} is not None else DEFAULT_FIELDS)))
+{% else %}
+        return guard_output(adapter.dump_python(adapter.validate_json(response.content), mode="json", by_alias=True, exclude_unset=True))
+{% endif %}
+
+{% endif %}
+    try:
+{% if response_codec == 'xml' %}
+        # The API answers with XML: elements become keys, attributes "@name" keys
+        data = parse_xml(response.content)
+{% elif fields_param %}
+        # Unselected fields are dropped while the response is parsed
+        data = load_json(response.content, {{ fields_param }} if {{ fields_param }} is not None else DEFAULT_FIELDS)
+{% else %}
+        data = response.json()
+{% endif %}
+    except Exception:
+        # Response is not {{ text_codec | upper }}, return as text
+        data = {"text": response.text}
+    return guard_output(data)
+'''
+
+PYTHON_TOOLS_TEMPLATE = r'''"""Auto-generated tool implementations from OpenAPI spec."""
+
+import logging
+from typing import Any, Dict, List
+from mcp.types import Tool, TextContent
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Base URL from OpenAPI spec
+BASE_URL = "{{ base_url }}"
+
+def get_generated_tools() -> List[Tool]:
+    """Get list of auto-generated tools."""
+    return [
+{% for tool in tools %}
+        Tool(
+            name="{{ tool.name }}",
+            description="{{ tool.description }}",
+            inputSchema={{ tool.input_schema }}
+        ),
+{% endfor %}
+    ]
+
+async def call_generated_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+    """Execute a generated tool."""
+    logger.info(f"Calling generated tool: {name}")
+
+{% for tool in tools %}
+    if name == "{{ tool.name }}":
+        # {{ tool.method }} {{ tool.path }}
+{% for param_name in tool.path_params %}
+        {{ param_name }} = arguments.get("{{ param_name }}")
+{% endfor %}
+        url = f"{BASE_URL}{{ tool.path }}"
+{% if tool.query_params %}
+        params = {}
+{% for param_name in tool.query_params %}
+        if "{{ param_name }}" in arguments:
+            params["{{ param_name }}"] = arguments["{{ param_name }}"]
+{% endfor %}
+{% endif %}
+
+        async with httpx.AsyncClient() as client:
+{% if tool.method == 'GET' %}
+            response = await client.get(url{{ ', params=params' if tool.query_params else '' }})
+{% elif tool.method in ('POST', 'PUT', 'PATCH') %}
+            body = arguments.get("body", {})
+            response = await client.{{ tool.method | lower }}(url, json=body)
+{% elif tool.method == 'DELETE' %}
+            response = await client.delete(url)
+{% endif %}
+            response.raise_for_status()
+            return [TextContent(type="text", text=response.text)]
+
+{% endfor %}
+    raise ValueError(f"Unknown generated tool: {name}")
+'''
+
+MODELS_INIT_TEMPLATE = r'''"""OpenAPI schema models.
+
+Each model lives in its own module and is imported on first access, so a tool
+only loads the models it uses.
+"""
+
+import importlib
+from typing import Any
+
+_MODEL_MODULES = {
+{% for class_name, module_name in class_modules %}
+    "{{ class_name }}": "{{ module_name }}",
+{% endfor %}
+}
+
+__all__ = list(_MODEL_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _MODEL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
+'''
+
+MODELS_SCHEMAS_TEMPLATE = r'''"""All OpenAPI schema models (imports every model module).
+
+Prefer `from <package>.models import Name`, which loads only that model.
+"""
+
+{% for module_name, class_names in modules %}
+from .{{ module_name }} import {{ class_names | join(', ') }}
+{% endfor %}
+
+__all__ = [
+{% for class_name in class_names %}
+    "{{ class_name }}",
+{% endfor %}
+]
+'''
+
+BATCH_TOOL_TEMPLATE = r'''"""Auto-generated tool: {{ tool_name }}"""
+
+from typing import Any
+
+from {{ project_slug }}.runtime.batch import run_batch
+
+@mcp.tool()  # type: ignore
+async def {{ tool_name }}(
+    calls: list[dict],  # Calls to run: [{"tool": "<tool name>", "arguments": {...}}, ...]
+) -> Any:
+    """Run several tools of this server in one call.
+
+    Each call names another tool of this server and its arguments. The calls
+    run concurrently; the results come back in the same order, each as
+    {"tool", "result"} or {"tool", "error"} if that call failed.
+    """
+    return await run_batch("{{ project_slug }}", calls, exclude="{{ tool_name }}")
+'''
+
+SECURITY_SCHEMES_TEMPLATE = r'''"""Security schemes of the upstream API, generated from its OpenAPI spec.
+
+Each tool names the schemes it needs in its SECURITY constant;
+runtime/security.py builds one credential injector per scheme from these.
+"""
+
+SCHEMES = {
+{% for name, config in schemes %}
+    {{ name }}: {{ config }},
+{% endfor %}
+}
+'''
+
+# {% endraw %}
+
+CODE_TEMPLATE_SOURCES = {
+    'fastmcp_tool': FASTMCP_TOOL_TEMPLATE,
+    'python_tools': PYTHON_TOOLS_TEMPLATE,
+    'models_init': MODELS_INIT_TEMPLATE,
+    'models_schemas': MODELS_SCHEMAS_TEMPLATE,
+    'batch_tool': BATCH_TOOL_TEMPLATE,
+    'security_schemes': SECURITY_SCHEMES_TEMPLATE,
+}
+_compiled_code_templates: Dict[str, Any] = {}
+
+def get_code_template(name: str):
+    """Return the compiled code template `name`, compiling it on first use."""
+    template = _compiled_code_templates.get(name)
+    if template is None:
+        import jinja2
+        env = jinja2.Environment(trim_blocks=True, lstrip_blocks=True, keep_trailing_newline=True)
+        template = env.from_string(CODE_TEMPLATE_SOURCES[name])
+        _compiled_code_templates[name] = template
+    return template
+
+def render_code_template(name: str, variables: Dict[str, Any]) -> str:
+    """Render a code template with `variables` as its only context.
+
+    The templates use no Jinja globals, so the context is shared instead of
+    being merged with them on every call, which is most of the cost of
+    Template.render() for a template this small.
+    """
+    template = get_code_template(name)
+    return ''.join(template.root_render_func(template.new_context(variables, shared=True)))
 
 def setup_python_project():
     """Set up Python project dependencies using uv."""
@@ -55,11 +522,19 @@ def create_env_template():
     # Get base URL and detected API auth from OpenAPI tools if available
     base_url = ""
     detected_auth_vars = set()
+    # OAuth client credentials apply to token parameters, or to oauth2 schemes if the spec has any
+    oauth_schemes = None
     if os.path.exists('./.openapi_tools.json'):
         with open('./.openapi_tools.json', 'r') as f:
             tool_data = json.load(f)
             base_url = tool_data.get('base_url', '')
             detected_auth_vars = set(tool_data.get('auth_env_vars', []))
+            if tool_data.get('has_security_schemes'):
+                oauth_schemes = [
+                    get_security_scheme_config(name, scheme)
+                    for name, scheme in (tool_data.get('security_schemes') or {}).items()
+                    if scheme.get('type') in ('oauth2', 'openIdConnect')
+                ]
 
     # Start building env content
     env_content = "# =============================================================================\n"
@@ -84,6 +559,57 @@ def create_env_template():
         for auth_var in sorted(detected_auth_vars):
             env_content += f"{auth_var}=your-api-key-here\n"
         env_content += "\n"
+    if detected_auth_vars and (oauth_schemes is None or oauth_schemes):
+        token_url = next((config['token_url'] for config in oauth_schemes or [] if config['token_url']), '')
+        if oauth_schemes:
+            env_content += "# Or let the OAuth 2.0 schemes fetch tokens with client credentials\n"
+        else:
+            env_content += "# Or let token parameters (Authorization, *token*) use OAuth client credentials\n"
+        env_content += f"# UPSTREAM_OAUTH_TOKEN_URL={token_url or 'https://auth.example.com/oauth/token'}\n"
+        env_content += "# UPSTREAM_OAUTH_CLIENT_ID=\n"
+        env_content += "# UPSTREAM_OAUTH_CLIENT_SECRET=\n"
+        env_content += "# UPSTREAM_OAUTH_SCOPE=\n\n"
+
+    # Tuning knobs of the shared runtime, commented out at their defaults
+    env_content += "# Upstream HTTP client (shared connection pool)\n"
+    env_content += "# UPSTREAM_MAX_CONNECTIONS=100\n"
+    env_content += "# UPSTREAM_MAX_KEEPALIVE_CONNECTIONS=20\n"
+    env_content += "# Timeouts in seconds; per tool: UPSTREAM_TIMEOUT_<TOOL_NAME>=\"read=10,total=20\"\n"
+    env_content += "# UPSTREAM_CONNECT_TIMEOUT=5\n"
+    env_content += "# UPSTREAM_READ_TIMEOUT=30\n"
+    env_content += "# UPSTREAM_TOTAL_TIMEOUT=60\n"
+    env_content += "# UPSTREAM_LATENCY_PROFILE=latency-profile.json\n"
+    env_content += "# Retries of idempotent requests (timeouts, 429/502/503/504) within the deadline\n"
+    env_content += "# UPSTREAM_RETRIES=0\n"
+    env_content += "# UPSTREAM_RETRY_BACKOFF=0.2\n"
+    env_content += "# Pages requested at once when a list tool is called with max_items\n"
+    env_content += "# PAGINATION_PREFETCH=4\n"
+    env_content += "# Compression: Accept-Encoding override, and JSON request bodies (auto|gzip|deflate|br|zstd|off)\n"
+    env_content += "# UPSTREAM_ACCEPT_ENCODING=gzip, br, zstd\n"
+    env_content += "# UPSTREAM_REQUEST_COMPRESSION=auto\n"
+    env_content += "# UPSTREAM_COMPRESS_MIN_BYTES=8192\n"
+    env_content += "# Size limits of tool output (0 disables one), and compact JSON text output\n"
+    env_content += "# OUTPUT_MAX_BYTES=200000\n"
+    env_content += "# OUTPUT_MAX_ITEMS=100\n"
+    env_content += "# OUTPUT_MAX_STRING_CHARS=4000\n"
+    env_content += "# OUTPUT_COMPACT_JSON=false\n"
+    env_content += "# Binary (image/file) responses: size limit, and in-memory size before spooling to disk\n"
+    env_content += "# BINARY_MAX_BYTES=5242880\n"
+    env_content += "# BINARY_SPOOL_BYTES=1048576\n"
+    env_content += "# File uploads: refused until UPLOAD_DIR names the only directory they may come from\n"
+    env_content += "# UPLOAD_DIR=/srv/mcp-uploads\n"
+    env_content += "# UPLOAD_CHUNK_BYTES=65536\n"
+    env_content += "# Response cache of GET requests (off|memory|sqlite|module:Class); sqlite is shared by workers\n"
+    env_content += "# RESPONSE_CACHE=off\n"
+    env_content += "# RESPONSE_CACHE_TTL=60\n"
+    env_content += "# RESPONSE_CACHE_MAX_ENTRIES=1024\n"
+    env_content += "# RESPONSE_CACHE_MAX_BYTES=67108864\n"
+    env_content += "# RESPONSE_CACHE_PATH=\n"
+    if BATCH_TOOL:
+        env_content += "# Calls of one batch_call run at once, and calls accepted per batch\n"
+        env_content += "# BATCH_CONCURRENCY=8\n"
+        env_content += "# BATCH_MAX_CALLS=100\n"
+    env_content += "\n"
 
     # Add PORT and HOST for remote deployment
     if deployment_type == "remote":
@@ -169,34 +695,328 @@ def print_next_steps():
     print("   • CUSTOMIZATION.md - How to add your API tools")
     print("\n" + "="*70)
 
-def generate_pydantic_models():
-    """Generate Pydantic models from OpenAPI spec using datamodel-code-generator."""
-    if not os.path.exists('./.openapi_spec.json'):
-        return False
-
-    try:
-        # Check if datamodel-code-generator is available
-        import subprocess
-        subprocess.run(['datamodel-codegen', '--version'], check=True, capture_output=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
+def model_module_name(class_name: str) -> str:
+    """snake_case module name for a model class (PetStatus -> pet_status)."""
+    name = re.sub(r'([A-Z]+)([A-Z][a-z])', r'\1_\2', class_name)
+    name = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', name).lower()
+    name = INVALID_IDENTIFIER_CHARS_RE.sub('_', name).strip('_') or 'model'
+    if name[0].isdigit() or keyword.iskeyword(name):
+        name = f'model_{name}'
+    return name
+
+def group_recursive_models(dependencies: Dict[str, set], order: List[str]) -> List[List[str]]:
+    """Group models into strongly connected components of their reference graph.
+
+    Models that (indirectly) reference each other end up in the same group, so
+    the modules built from the groups never import each other in a cycle.
+    Groups are returned in dependency order, members in source order.
+    """
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack = set()
+    groups = []
+
+    for root in order:
+        if root in index:
+            continue
+        # Iterative Tarjan: (node, iterator over its dependencies)
+        work = [(root, iter(sorted(dependencies[root])))]
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, deps = work[-1]
+            for dep in deps:
+                if dep not in index:
+                    index[dep] = lowlink[dep] = len(index)
+                    stack.append(dep)
+                    on_stack.add(dep)
+                    work.append((dep, iter(sorted(dependencies[dep]))))
+                    break
+                if dep in on_stack:
+                    lowlink[node] = min(lowlink[node], index[dep])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    group = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.add(member)
+                        if member == node:
+                            break
+                    groups.append([name for name in order if name in group])
+    return groups
+
+def split_models_source(source: str) -> Optional[Tuple[Dict[str, str], Dict[str, str]]]:
+    """Split datamodel-codegen output into one module per model.
+
+    Returns the source of each module and the module of each model class, or
+    None if the output contains statements other than imports, classes and
+    `Model.model_rebuild()` calls (it is then kept as a single module).
+    """
+    import ast
+
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+
+    header = []
+    for line in lines:
+        if not line.startswith('#'):
+            break
+        header.append(line)
+
+    future_imports = []
+    imports = []
+    classes: Dict[str, Any] = {}
+    order: List[str] = []
+    rebuilds: Dict[str, List[str]] = {}
+
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module == '__future__':
+            future_imports.append(ast.get_source_segment(source, node))
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            imports.append(node)
+        elif isinstance(node, ast.ClassDef):
+            start = node.decorator_list[0].lineno if node.decorator_list else node.lineno
+            classes[node.name] = (node, ''.join(lines[start - 1:node.end_lineno]).rstrip() + '\n')
+            order.append(node.name)
+        elif (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+              and isinstance(node.value.func, ast.Attribute)
+              and isinstance(node.value.func.value, ast.Name)
+              and node.value.func.value.id in classes):
+            rebuilds.setdefault(node.value.func.value.id, []).append(ast.get_source_segment(source, node))
+        else:
+            return None
+
+    # Names used by each class, including string forward references
+    used_names: Dict[str, set] = {}
+    for name, (node, _) in classes.items():
+        names = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+        names.update(n.value for n in ast.walk(node)
+                     if isinstance(n, ast.Constant) and isinstance(n.value, str) and n.value in classes)
+        used_names[name] = names
+    dependencies = {name: (used_names[name] & classes.keys()) - {name} for name in classes}
+
+    modules: Dict[str, str] = {}
+    class_modules: Dict[str, str] = {}
+    for group in group_recursive_models(dependencies, order):
+        module_name = model_module_name(group[0])
+        suffix = 2
+        while module_name in modules or module_name == 'schemas':
+            module_name = f'{model_module_name(group[0])}_{suffix}'
+            suffix += 1
+        for name in group:
+            class_modules[name] = module_name
+        modules[module_name] = group
+
+    sources = {}
+    for module_name, group in modules.items():
+        used = set().union(*(used_names[name] for name in group))
+
+        import_lines = []
+        for node in imports:
+            aliases = [a for a in node.names if (a.asname or a.name).split('.')[0] in used]
+            if not aliases:
+                continue
+            names = ', '.join(f'{a.name} as {a.asname}' if a.asname else a.name for a in aliases)
+            if isinstance(node, ast.ImportFrom):
+                import_lines.append(f"from {'.' * node.level}{node.module or ''} import {names}")
+            else:
+                import_lines.append(f'import {names}')
+
+        local_imports: Dict[str, List[str]] = {}
+        for name in group:
+            for dep in dependencies[name]:
+                if class_modules[dep] != module_name:
+                    local_imports.setdefault(class_modules[dep], []).append(dep)
+        model_import_lines = [
+            f"from .{dep_module} import {', '.join(sorted(set(local_imports[dep_module])))}"
+            for dep_module in sorted(local_imports)
+        ]
+
+        parts = [''.join(header) + '\n' if header else '']
+        if future_imports:
+            parts.append('\n'.join(future_imports) + '\n\n')
+        for group_lines in (import_lines, model_import_lines):
+            if group_lines:
+                parts.append('\n'.join(group_lines) + '\n\n')
+        parts.append('\n')
+        parts.append('\n\n'.join(classes[name][1] for name in group))
+        trailing = [stmt for name in group for stmt in rebuilds.get(name, [])]
+        if trailing:
+            parts.append('\n\n' + '\n'.join(trailing) + '\n')
+        sources[module_name] = ''.join(parts)
+
+    return sources, class_modules
+
+def map_schema_classes(spec: Dict[str, Any], class_names: List[str]) -> Dict[str, str]:
+    """Map each schema $ref of the spec to the model class generated for it.
+
+    datamodel-codegen turns schema names into class names (pet-status ->
+    PetStatus, 2fa -> Field2fa), so names are compared case- and
+    punctuation-insensitively.
+    """
+    def normalize(name: str) -> str:
+        return re.sub(r'[^a-z0-9]', '', name.lower())
+
+    by_key: Dict[str, str] = {}
+    for class_name in class_names:
+        by_key.setdefault(normalize(class_name), class_name)
+
+    schema_classes = {}
+    for prefix, schemas in (('#/components/schemas/', spec.get('components', {}).get('schemas', {})),
+                            ('#/definitions/', spec.get('definitions', {}))):
+        for schema_name in schemas or {}:
+            key = normalize(schema_name)
+            class_name = by_key.get(key) or by_key.get(f'field{key}')
+            if class_name:
+                schema_classes[prefix + schema_name] = class_name
+    return schema_classes
+
+def write_models_package(models_dir: Path, source: str) -> List[str]:
+    """Write the models package: one module per model plus a lazy __init__.py.
+
+    `schemas.py` re-exports every model for code that still star-imports it.
+    Returns the generated class names.
+    """
+    # The package is fully generated; drop modules of models that no longer exist
+    for stale in models_dir.glob('*.py'):
+        stale.unlink()
+
+    split = split_models_source(source)
+    if split is None:
+        # Unrecognised output: keep the single module, still loaded on first access
+        (models_dir / 'schemas.py').write_text(source)
+        import ast
+        class_names = [n.name for n in ast.parse(source).body if isinstance(n, ast.ClassDef)]
+        class_modules = {name: 'schemas' for name in class_names}
+    else:
+        sources, class_modules = split
+        for module_name, module_source in sources.items():
+            (models_dir / f'{module_name}.py').write_text(module_source)
+        class_names = list(class_modules)
+
+        by_module: Dict[str, List[str]] = {}
+        for class_name, module_name in class_modules.items():
+            by_module.setdefault(module_name, []).append(class_name)
+        (models_dir / 'schemas.py').write_text(render_code_template('models_schemas', {
+            'modules': sorted(by_module.items()),
+            'class_names': class_names,
+        }))
+
+    (models_dir / '__init__.py').write_text(render_code_template('models_init', {
+        'class_modules': sorted(class_modules.items()),
+    }))
+    return class_names
+
+def as_openapi3_schemas(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Spec with Swagger 2 `definitions` moved to OpenAPI 3 `components/schemas`.
+
+    datamodel-code-generator only reads `components/schemas`; the schema
+    objects themselves are compatible, so only the $refs need rewriting.
+    """
+    if 'definitions' not in spec or 'components' in spec:
+        return spec
+
+    def rewrite(node: Any) -> Any:
+        if isinstance(node, dict):
+            return {
+                key: (value.replace('#/definitions/', '#/components/schemas/', 1)
+                      if key == '$ref' and isinstance(value, str) else rewrite(value))
+                for key, value in node.items()
+            }
+        if isinstance(node, list):
+            return [rewrite(item) for item in node]
+        return node
+
+    return {
+        'openapi': '3.0.3',
+        'info': spec.get('info', {'title': 'API', 'version': '1.0.0'}),
+        'paths': {},
+        'components': {'schemas': rewrite(spec['definitions'])},
+    }
+
+def run_datamodel_codegen(spec: Dict[str, Any]) -> Optional[str]:
+    """Generate Pydantic v2 models in-process from the parsed spec.
+
+    The spec is passed as JSON text and the models are written to a file, the
+    one form of generate() that every release since 0.25.0 supports (newer
+    ones also take a dict and return the source). Returns the generated
+    module source, or None after reporting why generation failed.
+    """
+    import tempfile
+    import warnings
+    import datamodel_code_generator
+    from datamodel_code_generator import DataModelType, InputFileType, PythonVersion
+
+    with tempfile.TemporaryDirectory(prefix="mcp-models-") as work_dir, \
+            warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        output = Path(work_dir) / 'schemas.py'
+        try:
+            datamodel_code_generator.generate(
+                json.dumps(as_openapi3_schemas(spec)),
+                input_filename='.openapi_spec.json',
+                input_file_type=InputFileType.OpenAPI,
+                output=output,
+                output_model_type=DataModelType.PydanticV2BaseModel,
+                target_python_version=PythonVersion.PY_310,
+                use_standard_collections=True,
+                use_schema_description=True,
+                field_constraints=True,
+                snake_case_field=True,
+                use_double_quotes=True,
+                use_field_description=True,
+                field_extra_keys_without_x_prefix={'example'},
+            )
+        except Exception as e:
+            error = getattr(e, 'message', None) or str(e)
+            print(f"⚠️  Warning: Model generation failed ({type(e).__name__})")
+            print(f"   The server will still work - you can define models manually if needed")
+            for line in error.strip().splitlines()[:5]:
+                print(f"   {line[:200]}")
+            return None
+        source = output.read_text() if output.is_file() else None
+
+    # Surface spec problems (dangling refs, unsupported keywords); skip deprecation noise
+    problems = [w for w in caught if not issubclass(w.category, (DeprecationWarning, FutureWarning))]
+    for problem in problems[:5]:
+        print(f"   ⚠️  {problem.category.__name__}: {str(problem.message).splitlines()[0][:200]}")
+    if len(problems) > 5:
+        print(f"   ... and {len(problems) - 5} more warning(s)")
+
+    if source is None:
+        # Schema names with dots make datamodel-codegen emit a package of modules
+        print("⚠️  Warning: Model generation produced multiple modules, which is not supported")
+        return None
+    return source
+
+def run_datamodel_codegen_cli(models_dir: Path) -> Optional[str]:
+    """Generate models with the datamodel-codegen command.
+
+    Used when the package is not importable by the interpreter running
+    cookiecutter (for example when the CLI was installed with pipx).
+    """
+    import shutil
+    if not shutil.which('datamodel-codegen'):
         print("\n⚠️  Warning: datamodel-code-generator not installed.")
         print("   Models will not be auto-generated. Install with:")
         print("   pip install datamodel-code-generator")
-        return False
-
-    print("\n🔧 Generating Pydantic models from OpenAPI schemas...")
-
-    project_slug = "{{ cookiecutter.project_slug }}"
-    models_dir = Path(f"src/{project_slug}/models")
-    models_dir.mkdir(parents=True, exist_ok=True)
+        return None
 
     # Generate models using datamodel-code-generator
+    schemas_file = models_dir / 'schemas.py'
     try:
         subprocess.run([
             'datamodel-codegen',
             '--input', './.openapi_spec.json',
             '--input-file-type', 'openapi',
-            '--output', str(models_dir / 'schemas.py'),
+            '--output', str(schemas_file),
             '--target-python-version', '3.10',
             '--use-standard-collections',
             '--use-schema-description',
@@ -206,30 +1026,6 @@ def generate_pydantic_models():
             '--use-field-description',
             '--field-extra-keys-without-x-prefix', 'example'
         ], check=True, capture_output=True)
-
-        print(f"✓ Generated Pydantic models in {models_dir}/schemas.py")
-
-        # Fix Pydantic v2 deprecation warnings by converting example= to json_schema_extra
-        schemas_file = models_dir / 'schemas.py'
-        if schemas_file.exists():
-            content = schemas_file.read_text()
-            # Simple find and replace for example= parameter
-            import re
-            # Pattern: example=VALUE where VALUE can be a number, string, or identifier
-            # Replace with json_schema_extra={"example": VALUE}
-            content = re.sub(
-                r',\s*example=([^,)]+)',
-                r', json_schema_extra={"example": \1}',
-                content
-            )
-            schemas_file.write_text(content)
-
-        # Create __init__.py for models package
-        init_file = models_dir / '__init__.py'
-        init_file.write_text('"""OpenAPI schema models."""\n')
-
-        return True
-
     except subprocess.CalledProcessError as e:
         print(f"⚠️  Warning: Model generation failed")
         print(f"   This can happen with very large or complex OpenAPI specs (like GitHub's)")
@@ -239,14 +1035,75 @@ def generate_pydantic_models():
             # Only show first few lines of error to avoid clutter
             error_lines = stderr_text.split('\n')[:5]
             print(f"   Error: {error_lines[0]}")
-        return False
+        return None
+
+    # Fix Pydantic v2 deprecation warnings by converting example= to json_schema_extra
+    content = schemas_file.read_text()
+    # Pattern: example=VALUE where VALUE can be a number, string, or identifier
+    # Replace with json_schema_extra={"example": VALUE}
+    return re.sub(
+        r',\s*example=([^,)]+)',
+        r', json_schema_extra={"example": \1}',
+        content
+    )
+
+def generate_pydantic_models() -> Optional[Dict[str, str]]:
+    """Generate Pydantic models from OpenAPI spec using datamodel-code-generator.
+
+    Models are generated in-process from the parsed spec; the datamodel-codegen
+    command is only used when the package cannot be imported. Returns the model
+    class generated for each schema $ref, or None if no models were generated.
+    """
+    if not os.path.exists('./.openapi_spec.json'):
+        return None
+
+    with open('./.openapi_spec.json', 'r') as f:
+        spec = json.load(f)
+
+    schemas = spec.get('components', {}).get('schemas') or spec.get('definitions')
+    if not schemas:
+        print("\n⏭️  No schemas in the OpenAPI spec - skipping Pydantic model generation")
+        return None
+
+    print("\n🔧 Generating Pydantic models from OpenAPI schemas...")
+
+    project_slug = "{{ cookiecutter.project_slug }}"
+    models_dir = Path(f"src/{project_slug}/models")
+    models_dir.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    try:
+        import datamodel_code_generator  # noqa: F401
+    except ImportError:
+        source = run_datamodel_codegen_cli(models_dir)
+    else:
+        source = run_datamodel_codegen(spec)
+    if source is None:
+        return None
+
+    try:
+        # One module per model behind a lazily importing package
+        class_names = write_models_package(models_dir, source)
     except Exception as e:
         print(f"⚠️  Warning: Model generation failed: {str(e)[:100]}")
         print(f"   The server will still work without generated models")
-        return False
+        return None
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ Generated {len(class_names)} Pydantic model(s) in {models_dir}/ ({elapsed:.2f}s)")
+    return map_schema_classes(spec, class_names)
+
+def get_tool_category(tool: dict) -> str:
+    """Prompt category of a tool: its first tag, or 'general'."""
+    operation = tool.get('operation', {})
+    tags = operation.get('tags', ['general'])
+    return tags[0] if tags else 'general'
 
-def generate_fastmcp_prompts(tools: list):
-    """Generate helpful prompts from OpenAPI operations."""
+def generate_fastmcp_prompts(tools: list, categories: Optional[set] = None):
+    """Generate helpful prompts from OpenAPI operations.
+
+    When `categories` is given only those prompt files are rewritten.
+    """
     project_slug = "{{ cookiecutter.project_slug }}"
     prompts_dir = Path(f"src/{project_slug}/prompts")
     prompts_dir.mkdir(parents=True, exist_ok=True)
@@ -258,15 +1115,16 @@ def generate_fastmcp_prompts(tools: list):
     # Group tools by tags/category
     by_category = {}
     for tool in tools:
-        operation = tool.get('operation', {})
-        tags = operation.get('tags', ['general'])
-        category = tags[0] if tags else 'general'
+        category = get_tool_category(tool)
         if category not in by_category:
             by_category[category] = []
         by_category[category].append(tool)
 
     # Generate a prompt for each category
     for category, category_tools in by_category.items():
+        if categories is not None and category not in categories:
+            continue
+
         # Sanitize category name for use in filename and function name
         category_sanitized = sanitize_tool_name(category)
 
@@ -297,11 +1155,11 @@ def generate_fastmcp_prompts(tools: list):
         prompt_file.write_text(code)
         print(f"   ✓ Generated {category_sanitized}_operations.py prompt")
 
+@functools.lru_cache(maxsize=None)
 def sanitize_tool_name(name: str) -> str:
     """Sanitize tool name to be a valid Python identifier and filename."""
-    import re
     # Replace invalid characters with underscore
-    sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', name)
+    sanitized = INVALID_IDENTIFIER_CHARS_RE.sub('_', name)
     # Remove leading/trailing underscores
     sanitized = sanitized.strip('_')
     # Ensure it doesn't start with a number
@@ -309,11 +1167,11 @@ def sanitize_tool_name(name: str) -> str:
         sanitized = f'tool_{sanitized}'
     return sanitized or 'tool'
 
+@functools.lru_cache(maxsize=None)
 def sanitize_param_name(name: str, fallback: str = 'param') -> str:
     """Sanitize parameter name to be a valid Python identifier."""
-    import re
     # Replace invalid characters with underscore
-    sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', name)
+    sanitized = INVALID_IDENTIFIER_CHARS_RE.sub('_', name)
     # Remove leading/trailing underscores
     sanitized = sanitized.strip('_')
     # Ensure it doesn't start with a number
@@ -323,7 +1181,6 @@ def sanitize_param_name(name: str, fallback: str = 'param') -> str:
     if not sanitized:
         sanitized = fallback
     # Ensure it's not a Python keyword
-    import keyword
     if keyword.iskeyword(sanitized):
         sanitized = f'{sanitized}_'
     return sanitized
@@ -344,31 +1201,18 @@ def sanitize_description(desc: str) -> str:
 def is_auth_parameter(param: dict) -> bool:
     """
     Detect if a parameter is likely an authentication credential.
-    Checks for common patterns in parameter names.
+    Only used for specs that declare no security schemes; matches whole words
+    of the name, so `key` needs an auth description and `monkey` never matches.
     """
-    param_name = param.get('name', '').lower()
-
-    # Common authentication parameter patterns
-    auth_patterns = [
-        'api_key', 'apikey', 'api-key',
-        'appid', 'app_id', 'app-id',
-        'token', 'access_token', 'auth_token',
-        'authorization', 'auth',
-        'key', 'secret',
-        'bearer', 'oauth'
-    ]
-
-    # Check if parameter name matches any auth pattern
-    for pattern in auth_patterns:
-        if pattern in param_name:
-            return True
-
-    # Also check description for auth-related keywords
-    description = param.get('description', '').lower()
-    if any(keyword in description for keyword in ['api key', 'authentication', 'authorization', 'token', 'secret']):
+    name = param.get('name', '')
+    if re.sub(r'[^a-z0-9]', '', name.lower()) in AUTH_PARAM_NAMES:
         return True
-
-    return False
+    words = {word.lower() for word in NAME_WORD_RE.findall(name)}
+    if words & set(NON_AUTH_NAME_WORDS):
+        return False
+    if words & set(AUTH_NAME_WORDS):
+        return True
+    return bool(AUTH_PARAM_DESCRIPTION_RE.search(param.get('description', '').lower()))
 
 def get_env_var_name(param_name: str) -> str:
     """
@@ -389,293 +1233,591 @@ def get_env_var_name(param_name: str) -> str:
         return 'API_SECRET'
     else:
         # Convert to uppercase and replace special chars with underscore
-        import re
         env_name = re.sub(r'[^A-Z0-9]', '_', param_name.upper())
         env_name = re.sub(r'_+', '_', env_name)  # Remove duplicate underscores
         return env_name.strip('_')
 
+def get_oauth_credential_kind(param_name: str) -> Optional[str]:
+    """How an OAuth access token fills an auth parameter: a bearer header value, a bare token, or not at all."""
+    name = param_name.lower()
+    if name == 'authorization':
+        return 'bearer'
+    if 'token' in name:
+        return 'token'
+    return None
+
+def get_scheme_env_prefix(scheme_name: str) -> str:
+    """Environment variable prefix of a security scheme, e.g. 'petstoreAuth' -> 'PETSTORE_AUTH'."""
+    env_name = re.sub(r'[^A-Z0-9]', '_', '_'.join(NAME_WORD_RE.findall(scheme_name)).upper())
+    return re.sub(r'_+', '_', env_name).strip('_') or 'API'
+
+def get_security_scheme_config(scheme_name: str, scheme: dict) -> Dict[str, Any]:
+    """Injector settings of a declared security scheme, precomputed for runtime/security.py."""
+    scheme_type = scheme.get('type', '')
+    http_scheme = str(scheme.get('scheme', '')).lower()
+    prefix = get_scheme_env_prefix(scheme_name)
+
+    if scheme_type == 'apiKey':
+        name = scheme.get('name') or scheme_name
+        return {'type': 'apiKey', 'in': scheme.get('in', 'header'), 'name': name, 'env': [get_env_var_name(name)]}
+    if scheme_type == 'basic' or (scheme_type == 'http' and http_scheme == 'basic'):
+        return {'type': 'basic', 'env': [f'{prefix}_USERNAME', f'{prefix}_PASSWORD']}
+    if scheme_type == 'http' and http_scheme == 'bearer':
+        return {'type': 'bearer', 'env': [f'{prefix}_TOKEN']}
+    if scheme_type in ('oauth2', 'openIdConnect'):
+        # A client-credentials flow (Swagger 2: "application") names the token endpoint
+        flow = scheme.get('flows', {}).get('clientCredentials') or (scheme if scheme.get('flow') == 'application' else {})
+        return {'type': 'oauth2', 'env': [f'{prefix}_TOKEN'], 'token_url': flow.get('tokenUrl', '')}
+    # Schemes without a credential to inject (e.g. thecatapi's "noauth") are sent as is
+    return {'type': 'none', 'env': []}
+
+def describe_param(param: dict) -> Tuple[str, str, str]:
+    """Name, Python type and one-line description of a tool parameter."""
+    # Swagger 2.0 declares the type on the parameter itself
+    param_type = param.get('schema', param).get('type')
+    python_type = PYTHON_PARAM_TYPES.get(param_type, 'Any')
+    param_desc_raw = param.get('description', '')
+    param_desc = param_desc_raw.replace('\n', ' ').replace('\r', '')[:200] if param_desc_raw else ''
+    return param['sanitized_name'], python_type, param_desc
+
+def get_default_fields(operation: dict) -> Optional[str]:
+    """Default response projection of an operation from its `x-mcp-fields` extension."""
+    fields = operation.get('x-mcp-fields')
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    if not isinstance(fields, list):
+        return None
+    fields = [str(field).strip() for field in fields if str(field).strip()]
+    return ','.join(fields) or None
+
+def get_operation_timeouts(operation: dict) -> Dict[str, float]:
+    """Timeouts from an operation's `x-mcp-timeout`: seconds (total) or connect/read/total."""
+    value = operation.get('x-mcp-timeout')
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {'total': float(value)}
+    if not isinstance(value, dict):
+        return {}
+    timeouts = {}
+    for key in ('connect', 'read', 'total'):
+        try:
+            timeouts[key] = float(value[key])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return timeouts
+
+def get_request_encoding(parameters: list, operation: dict) -> Optional[str]:
+    """Encoding the API accepts for request bodies, from `x-mcp-request-compression` or a Content-Encoding header enum."""
+    value = operation.get('x-mcp-request-compression')
+    if isinstance(value, str) and value.lower() in REQUEST_ENCODINGS:
+        return value.lower()
+    for param in parameters:
+        if param.get('in') == 'header' and param.get('name', '').lower() == 'content-encoding':
+            schema = param.get('schema', param)
+            for encoding in schema.get('enum') or []:
+                if str(encoding).lower() in REQUEST_ENCODINGS:
+                    return str(encoding).lower()
+    return None
+
+def is_binary_media_type(media_type: str) -> bool:
+    """Whether a media type is binary, e.g. image/png or application/octet-stream."""
+    main, _, sub = media_type.split(';', 1)[0].strip().lower().partition('/')
+    if main in BINARY_MAIN_TYPES:
+        return True
+    return main == 'application' and sub not in TEXT_APPLICATION_TYPES and sub.rsplit('+', 1)[-1] not in TEXT_APPLICATION_TYPES
+
+def has_binary_response(operation: dict) -> bool:
+    """Whether an operation declares a binary 2xx response (a binary media type, `format: binary` or a Swagger 2 file)."""
+    for status, response in operation.get('responses', {}).items():
+        if not str(status).startswith('2') or not isinstance(response, dict):
+            continue
+        if response.get('schema', {}).get('type') == 'file':
+            return True
+        for media_type, content in (response.get('content') or {}).items():
+            schema = (content or {}).get('schema') or {}
+            if is_binary_media_type(media_type) or schema.get('format') == 'binary':
+                return True
+    if any(is_binary_media_type(media_type) for media_type in operation.get('produces', [])):
+        return True
+    return False
+
+def is_file_field(param: dict) -> bool:
+    """Whether a form field carries a file (`format: binary`, or a Swagger 2 `file`)."""
+    schema = param.get('schema', param)
+    return schema.get('format') == 'binary' or schema.get('type') == 'file'
+
+def is_json_media_type(media_type: str) -> bool:
+    """Whether a media type is JSON, e.g. application/json or application/problem+json."""
+    sub = media_type.split(';', 1)[0].strip().lower().partition('/')[2]
+    return sub == 'json' or sub.endswith('+json')
+
+def is_xml_media_type(media_type: str) -> bool:
+    """Whether a media type is XML, e.g. application/xml, text/xml or application/atom+xml."""
+    sub = media_type.split(';', 1)[0].strip().lower().partition('/')[2]
+    return sub == 'xml' or sub.endswith('+xml')
+
+def get_body_encoding(operation: dict) -> Optional[Dict[str, Any]]:
+    """How an operation sends a request body that is not JSON.
+
+    Returns None for JSON bodies, otherwise the encoding's type: 'form'
+    (url-encoded fields), 'multipart' (fields and files) or the media type of
+    a raw file body. Form fields come from the properties of an OpenAPI 3
+    form schema (returned as formData parameters) or are the operation's
+    Swagger 2 formData parameters.
+    """
+    request_body = operation.get('requestBody') or {}
+    content = request_body.get('content') or {}
+    if any(map(is_json_media_type, content)):
+        return None
+    for media_type, encoding in FORM_MEDIA_TYPES:
+        if media_type in content:
+            schema = content[media_type].get('schema') or {}
+            required = set(schema.get('required', []))
+            fields = [
+                {'name': name, 'in': 'formData', 'schema': field, 'required': name in required,
+                 'description': field.get('description', '')}
+                for name, field in (schema.get('properties') or {}).items()
+            ]
+            return {'type': encoding, 'fields': fields}
+    for media_type in content:
+        if is_binary_media_type(media_type):
+            return {'type': media_type, 'required': bool(request_body.get('required'))}
+
+    form_params = [p for p in operation.get('parameters', []) if p.get('in') == 'formData']
+    if form_params:
+        multipart = 'multipart/form-data' in operation.get('consumes', []) or any(map(is_file_field, form_params))
+        return {'type': 'multipart' if multipart else 'form', 'fields': []}
+    return None
+
+def get_response_codec(operation: dict) -> Tuple[Optional[str], Optional[str]]:
+    """How to decode an operation's responses ('json', 'xml' or 'binary') and the Accept header to ask for it.
+
+    JSON is preferred whenever the operation offers it. 'binary' operations
+    answer only with images, files and the like; their other responses (such
+    as errors) are still parsed as JSON. The Accept header is only sent when
+    the operation offers more than one media type, or only XML, and no
+    binary one.
+    """
+    media_types = []
+    for status, response in operation.get('responses', {}).items():
+        if str(status).startswith('2') and isinstance(response, dict):
+            media_types.extend(response.get('content') or {})
+    media_types = list(dict.fromkeys(media_types or operation.get('produces', [])))
+    json_types = [media_type for media_type in media_types if is_json_media_type(media_type)]
+    xml_types = [media_type for media_type in media_types if is_xml_media_type(media_type)]
+    # Asking for JSON or XML alone would turn away the file of an operation
+    # that answers with either
+    binary = has_binary_response(operation)
+    if json_types:
+        return 'json', json_types[0] if len(media_types) > 1 and not binary else None
+    if xml_types:
+        return 'xml', None if binary else xml_types[0]
+    if binary:
+        return 'binary', None
+    return 'json', None
+
+def get_pagination(parameters: list, operation: dict) -> Optional[Dict[str, Any]]:
+    """Detect how a GET operation paginates, from its query parameters and response headers."""
+    query = {}
+    for param in parameters:
+        if param.get('in') == 'query' and param.get('name'):
+            query[PAGINATION_NAME_RE.sub('', param['name'].lower())] = param
+
+    for style, names in (('cursor', CURSOR_PARAM_NAMES), ('page', PAGE_PARAM_NAMES), ('offset', OFFSET_PARAM_NAMES)):
+        param = next((query[name] for name in names if name in query), None)
+        if param is None:
+            continue
+        if style == 'offset' and not any(name in query for name in PAGE_SIZE_PARAM_NAMES):
+            continue  # An offset alone is not a listing (e.g. a timezone offset)
+
+        pagination = {'style': style, 'param': param['name']}
+        if style == 'page':
+            # Zero-based when the spec says so through its minimum, default or example
+            schema = param.get('schema', param)
+            hints = (schema.get('minimum'), schema.get('default'), param.get('example'), schema.get('example'))
+            pagination['first'] = 0 if any(str(hint) == '0' for hint in hints if hint is not None) else 1
+        return pagination
+
+    for status, response in operation.get('responses', {}).items():
+        if str(status).startswith('2') and isinstance(response, dict):
+            if any(name.lower() == 'link' for name in response.get('headers', {})):
+                return {'style': 'link'}
+    return None
+
+def render_fastmcp_tool(tool: dict, base_url: str, models: Optional[Dict[str, Any]] = None,
+                        security_schemes: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Tuple[str, str, Dict[str, str]]]:
+    """Render the source of a single FastMCP tool file.
+
+    `models` holds the generated model classes of the tool's request body and
+    responses (see get_tool_models). `security_schemes` maps the spec's scheme
+    names to their injector settings (see get_security_scheme_config); it is
+    None for specs without schemes, whose auth parameters are then detected by
+    name. Returns the sanitized tool name, the module source and the auth parameters
+    mapped to their environment variables, or None if the tool has no usable name.
+    """
+    project_slug = "{{ cookiecutter.project_slug }}"
+
+    tool_name_raw = tool['name']
+    method = tool['method']
+    path = tool['path']
+    description = sanitize_description(tool.get('description', ''))
+    parameters = tool.get('parameters', [])
+
+    # Sanitize tool name for filename and function name
+    tool_name = sanitize_tool_name(tool_name_raw)
+
+    # Skip if tool name is invalid after sanitization
+    if not tool_name or tool_name == 'tool':
+        return None
+
+    # Declared security schemes drive auth; parameters carrying an apiKey
+    # scheme's credential become optional overrides of its injector
+    security = ()
+    key_params = {}
+    if security_schemes is not None:
+        security = tuple(tuple(requirement) for requirement in tool.get('security', []))
+        for param in parameters:
+            for name in {name for requirement in security for name in requirement}:
+                config = security_schemes[name]
+                if (config['type'] == 'apiKey' and config['in'] == param.get('in')
+                        and config['name'].lower() == param.get('name', '').lower()):
+                    key_params[param.get('name', '')] = config['env'][0]
+
+    # Without schemes, detect authentication parameters and generate env var handling
+    auth_params = [p for p in parameters if is_auth_parameter(p)] if security_schemes is None else []
+    auth_env_vars = {}
+    auth_vars = []
+
+    for auth_param in auth_params:
+        param_name = auth_param.get('name', '')
+        env_var_name = get_env_var_name(param_name)
+        auth_env_vars[param_name] = env_var_name
+        auth_vars.append((param_name, env_var_name))
+
+    # Extract path parameter names directly from URL template
+    path_placeholders = PATH_PLACEHOLDER_RE.findall(path)
+
+    # Non-path params (path params are handled separately below)
+    non_path_params = [p for p in parameters if p.get('in') != 'path']
+
+    # Form and upload operations take fields and file paths instead of a JSON body
+    body_encoding = get_body_encoding(tool.get('operation', {})) if method in ['POST', 'PUT', 'PATCH'] else None
+    if body_encoding and body_encoding['type'] in ('form', 'multipart'):
+        # httpx sets the form Content-Type (with the multipart boundary)
+        non_path_params = [p for p in non_path_params if not (p.get('in') == 'header' and p.get('name', '').lower() == 'content-type')]
+        non_path_params += body_encoding['fields']
+    elif body_encoding:
+        non_path_params.append({'name': 'file', 'in': 'file', 'required': body_encoding['required'], 'schema': {'format': 'binary'}})
+    if body_encoding:
+        # File arguments are paths or file:// URIs, passed as strings
+        non_path_params = [
+            dict(p, schema={'type': 'string'}, upload_file=True, description=(
+                f"{p['description']} (path relative to UPLOAD_DIR, or file:// URI)" if p.get('description') else 'Path (relative to UPLOAD_DIR) or file:// URI of the file to upload'
+            )) if is_file_field(p) else p
+            for p in non_path_params
+        ]
+
+    # Build parameter list with path params first (using URL template names)
+    final_params = []
+    used_param_names = set()
+
+    # Add path parameters using names from URL template
+    for placeholder in path_placeholders:
+        # Create or update parameter with the placeholder name
+        param_name = sanitize_param_name(placeholder)
+
+        # Handle duplicates
+        original_name = param_name
+        counter = 1
+        while param_name in used_param_names:
+            param_name = f'{original_name}_{counter}'
+            counter += 1
+        used_param_names.add(param_name)
+
+        # Create param dict
+        path_param = {
+            'name': placeholder,
+            'sanitized_name': param_name,
+            'in': 'path',
+            'required': True,  # Path params are always required
+            'schema': {'type': 'string'},
+            'description': f'Path parameter: {placeholder}'
+        }
+        final_params.append(path_param)
+
+    # Add non-path parameters
+    param_counter = 0
+    for param in non_path_params:
+        param_name_raw = param.get('name', '')
+        if not param_name_raw:
+            param_counter += 1
+            param_name_raw = f'param_{param_counter}'
+
+        param_name = sanitize_param_name(param_name_raw)
+
+        # Handle duplicates
+        original_name = param_name
+        counter = 1
+        while param_name in used_param_names:
+            param_name = f'{original_name}_{counter}'
+            counter += 1
+        used_param_names.add(param_name)
+
+        param['sanitized_name'] = param_name
+        if not param.get('name'):
+            param['name'] = param_name_raw
+        final_params.append(param)
+
+    # Form fields and files of a multipart body, or the file argument of a raw one
+    form_fields = [(p['name'], p['sanitized_name']) for p in final_params if p.get('in') == 'formData' and not p.get('upload_file')]
+    file_fields = [(p['name'], p['sanitized_name']) for p in final_params if p.get('in') == 'formData' and p.get('upload_file')]
+    upload_arg = next((p['sanitized_name'] for p in final_params if p.get('in') == 'file'), None)
+
+    # Check if this endpoint needs a body parameter
+    body_param = next((p for p in final_params if p.get('in') == 'body'), None)
+    has_request_body = method in ['POST', 'PUT', 'PATCH'] and not body_encoding and body_param is None and (
+        tool.get('request_schema_ref') or
+        tool.get('operation', {}).get('requestBody')
+    )
+    # Swagger 2.0 passes the body as an `in: body` parameter instead
+    json_arg = 'body' if has_request_body else body_param['sanitized_name'] if body_param else None
+
+    # Separate required and optional parameters (considering auth params are optional)
+    required_params = []
+    optional_params = []
+
+    for param in final_params:
+        original_name = param.get('name', '')
+        is_auth = original_name in auth_env_vars
+        is_required = param.get('required') and not is_auth and original_name not in key_params
+
+        if is_required:
+            required_params.append(describe_param(param))
+        else:
+            opt_note = ' (optional if env var set)' if is_auth else ''
+            if original_name in key_params:
+                opt_note = f' (optional, defaults to {key_params[original_name]})'
+            optional_params.append(describe_param(param) + (opt_note,))
+
+    # Build URL with path parameters (use sanitized names)
+    url_path = path
+    for param in parameters:
+        if param.get('in') == 'path':
+            original_name = param.get('name', '')
+            sanitized_name = param.get('sanitized_name', original_name)
+            if original_name:
+                # Replace the placeholder with the sanitized parameter name
+                url_path = url_path.replace('{' + original_name + '}', '{' + sanitized_name + '}')
+
+    # Header and query parameters, with env var fallback for auth parameters
+    def assignment(param: dict) -> Tuple[str, str, Optional[str], Optional[str]]:
+        original_name = param.get('name', '')
+        env_var = auth_env_vars.get(original_name)
+        token = get_oauth_credential_kind(original_name) if env_var else None
+        return original_name, param.get('sanitized_name', original_name), env_var, token
+
+    header_params = [assignment(p) for p in final_params if p.get('in') == 'header']
+    query_params = [assignment(p) for p in final_params if p.get('in') == 'query']
+    uses_oauth = any(token for *_, token in header_params + query_params)
+    # Tools without query parameters or credentials to add send no params at all
+    has_params = bool(query_params or security)
+
+    # GET tools can project their JSON response down to selected fields
+    response_codec, accept = get_response_codec(tool.get('operation', {}))
+    fields_param = None
+    default_fields = None
+    if method == 'GET' and response_codec == 'json':
+        fields_param = 'fields' if 'fields' not in used_param_names else 'response_fields'
+        default_fields = get_default_fields(tool.get('operation', {}))
+
+    # List operations can fetch and merge several pages in one call
+    pagination = get_pagination(parameters, tool.get('operation', {})) if method == 'GET' and response_codec == 'json' else None
+    pagination_param = None
+    credential_params = None
+    if pagination:
+        pagination_param = 'max_items' if 'max_items' not in used_param_names else 'pagination_max_items'
+        # Query credentials, sent with next-page URLs too
+        credential_names = [original for original, _, env_var, _ in query_params if env_var]
+        for name in sorted({name for requirement in security for name in requirement}):
+            config = security_schemes[name]
+            if config['type'] == 'apiKey' and config['in'] == 'query' and config['name'] not in credential_names:
+                credential_names.append(config['name'])
+        if credential_names:
+            credential_params = '(%s,)' % ', '.join(f'"{name}"' for name in credential_names)
+
+    binary_response = has_binary_response(tool.get('operation', {}))
+    request_args = ['url']
+    if json_arg:
+        request_args.append(f'json={json_arg}')
+    if body_encoding:
+        request_args.append(FORM_REQUEST_ARGS.get(body_encoding['type'], 'content=upload'))
+    if has_params:
+        request_args.append('params=params')
+    request_args.append('headers=headers')
+    if binary_response:
+        request_args.append('stream=True')
+
+    code = render_code_template('fastmcp_tool', {
+        'project_slug': project_slug,
+        'tool_name': tool_name,
+        'base_url': base_url,
+        'model_names': models['names'] if models else (),
+        'request_model': models['request'] if models else None,
+        'response_models': models['responses'] if models else [],
+        'validate_payloads': VALIDATE_PAYLOADS,
+        'description': description,
+        'method': method,
+        'url_path': url_path,
+        'path_params': bool(path_placeholders),
+        'auth_vars': auth_vars,
+        'required_params': required_params,
+        'optional_params': optional_params,
+        'has_request_body': has_request_body,
+        'json_arg': json_arg,
+        'header_params': header_params,
+        'query_params': query_params,
+        'uses_oauth': uses_oauth,
+        'has_params': has_params,
+        'security': repr(security) if security else None,
+        'fields_param': fields_param,
+        'default_fields': repr(default_fields),
+        'pagination_param': pagination_param,
+        'credential_params': credential_params,
+        'pagination': repr(pagination),
+        'timeouts': repr(get_operation_timeouts(tool.get('operation', {}))),
+        'request_encoding': get_request_encoding(parameters, tool.get('operation', {})) if json_arg else None,
+        'binary_response': binary_response,
+        'body_encoding': body_encoding['type'] if body_encoding else None,
+        'response_codec': response_codec,
+        'accept': accept,
+        'form_fields': form_fields,
+        'file_fields': file_fields,
+        'upload_arg': upload_arg,
+        'request_args': ', '.join(request_args),
+    })
+
+    return tool_name, code, auth_env_vars
+
+def render_fastmcp_tool_job(job: Tuple[dict, str, Dict[str, Any], Optional[Dict[str, Dict[str, Any]]]]) -> Tuple[Optional[Tuple[str, str, Dict[str, str]]], Optional[str]]:
+    """Worker entry point: render one tool and capture its error instead of raising."""
+    tool, base_url, models, security_schemes = job
+    try:
+        return render_fastmcp_tool(tool, base_url, models, security_schemes), None
+    except Exception as e:
+        return None, str(e)[:100]
+
+def get_tool_models(tool: dict, model_classes: Dict[str, str]) -> Dict[str, Any]:
+    """Model classes for the request body and responses a tool references."""
+    request = model_classes.get(tool.get('request_schema_ref') or '')
+    responses = [
+        (status, model_classes[ref])
+        for status, ref in tool.get('response_schema_refs', {}).items()
+        if ref in model_classes
+    ]
+    names = {name for _, name in responses}
+    if request:
+        names.add(request)
+    return {'request': request, 'responses': responses, 'names': tuple(sorted(names))}
+
+def get_generation_workers(job_count: int) -> int:
+    """Number of worker processes to use for tool generation (1 means serial)."""
+    workers = os.environ.get("MCP_COOKIE_CUTTER_WORKERS")
+    if workers:
+        try:
+            return max(1, int(workers))
+        except ValueError:
+            pass
+
+    # Process start-up costs more than rendering a handful of tools
+    if job_count < PARALLEL_GENERATION_THRESHOLD:
+        return 1
+    return max(1, min(os.cpu_count() or 1, job_count // PARALLEL_GENERATION_THRESHOLD + 1))
+
 def generate_fastmcp_tools(tools: list, tool_data: dict) -> set:
-    """Generate individual FastMCP tool files and return detected auth env vars."""
+    """Generate individual FastMCP tool files and return detected auth env vars.
+
+    Tool sources are rendered across a process pool for large specs; results are
+    collected in input order so the output is identical to a serial run.
+    """
     project_slug = "{{ cookiecutter.project_slug }}"
     tools_dir = Path(f"src/{project_slug}/tools")
     tools_dir.mkdir(parents=True, exist_ok=True)
 
     base_url = tool_data.get('base_url', '')
+    model_classes = tool_data.get('model_classes') or {}
 
-    # Track all detected authentication environment variables across all tools
+    # Specs with security schemes get one shared injector per scheme
+    security_schemes = None
     all_auth_env_vars = set()
-
-    for tool in tools:
+    if tool_data.get('has_security_schemes'):
+        security_schemes = {
+            name: get_security_scheme_config(name, scheme)
+            for name, scheme in (tool_data.get('security_schemes') or {}).items()
+        }
+        write_security_schemes(security_schemes)
+        for config in security_schemes.values():
+            all_auth_env_vars.update(config['env'])
+
+    jobs = [(tool, base_url, get_tool_models(tool, model_classes), security_schemes) for tool in tools]
+    workers = get_generation_workers(len(jobs))
+    started = time.perf_counter()
+
+    results = None
+    if workers > 1:
         try:
-            tool_name_raw = tool['name']
-            method = tool['method']
-            path = tool['path']
-            description = sanitize_description(tool.get('description', ''))
-            parameters = tool.get('parameters', [])
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                chunksize = max(1, len(jobs) // (workers * 4))
+                results = list(executor.map(render_fastmcp_tool_job, jobs, chunksize=chunksize))
+        except (OSError, concurrent.futures.process.BrokenProcessPool) as e:
+            print(f"   ⚠️  Parallel generation unavailable ({e}), falling back to serial")
+            workers = 1
+    if results is None:
+        results = [render_fastmcp_tool_job(job) for job in jobs]
 
-            # Sanitize tool name for filename and function name
-            tool_name = sanitize_tool_name(tool_name_raw)
+    # Track all detected authentication environment variables across all tools
+    failures = []
 
-            # Skip if tool name is invalid after sanitization
-            if not tool_name or tool_name == 'tool':
-                print(f"   ⚠️  Skipping tool with invalid name: {tool_name_raw}")
-                continue
+    for tool, (rendered, error) in zip(tools, results, strict=True):
+        tool_name_raw = tool['name']
+        if error:
+            failures.append((tool_name_raw, error))
+            continue
+        if rendered is None:
+            print(f"   ⚠️  Skipping tool with invalid name: {tool_name_raw}")
+            continue
 
-            # Generate individual tool file
-            tool_file = tools_dir / f"{tool_name}.py"
-
-            code = f'"""Auto-generated tool: {tool_name}"""\n\n'
-            code += 'import httpx\n'
-            code += 'import os\n'
-            code += 'from typing import Any\n\n'
-
-            # Import Pydantic models if they exist
-            code += f'try:\n'
-            code += f'    from {project_slug}.models.schemas import *\n'
-            code += f'except ImportError:\n'
-            code += f'    pass\n\n'
-
-            code += f'# Get BASE_URL from environment or use default from OpenAPI spec\n'
-            code += f'BASE_URL = os.getenv("BASE_URL", "{base_url}")\n\n'
-
-            # Detect authentication parameters and generate env var handling
-            auth_params = [p for p in parameters if is_auth_parameter(p)]
-            auth_env_vars = {}
-
-            for auth_param in auth_params:
-                param_name = auth_param.get('name', '')
-                env_var_name = get_env_var_name(param_name)
-                auth_env_vars[param_name] = env_var_name
-                all_auth_env_vars.add(env_var_name)  # Track for .env generation
-                code += f'# Authentication: {param_name} from environment\n'
-                code += f'{env_var_name} = os.getenv("{env_var_name}", "")\n'
-
-            if auth_env_vars:
-                code += '\n'
-
-            # Extract path parameter names directly from URL template
-            import re
-            path_placeholders = re.findall(r'\{([^}]+)\}', path)
-
-            # Separate path params and non-path params
-            path_params = [p for p in parameters if p.get('in') == 'path']
-            non_path_params = [p for p in parameters if p.get('in') != 'path']
-
-            # Build parameter list with path params first (using URL template names)
-            final_params = []
-            used_param_names = set()
-
-            # Add path parameters using names from URL template
-            for placeholder in path_placeholders:
-                # Create or update parameter with the placeholder name
-                param_name = sanitize_param_name(placeholder)
-
-                # Handle duplicates
-                original_name = param_name
-                counter = 1
-                while param_name in used_param_names:
-                    param_name = f'{original_name}_{counter}'
-                    counter += 1
-                used_param_names.add(param_name)
-
-                # Create param dict
-                path_param = {
-                    'name': placeholder,
-                    'sanitized_name': param_name,
-                    'in': 'path',
-                    'required': True,  # Path params are always required
-                    'schema': {'type': 'string'},
-                    'description': f'Path parameter: {placeholder}'
-                }
-                final_params.append(path_param)
-
-            # Add non-path parameters
-            param_counter = 0
-            for param in non_path_params:
-                param_name_raw = param.get('name', '')
-                if not param_name_raw:
-                    param_counter += 1
-                    param_name_raw = f'param_{param_counter}'
-
-                param_name = sanitize_param_name(param_name_raw)
-
-                # Handle duplicates
-                original_name = param_name
-                counter = 1
-                while param_name in used_param_names:
-                    param_name = f'{original_name}_{counter}'
-                    counter += 1
-                used_param_names.add(param_name)
-
-                param['sanitized_name'] = param_name
-                if not param.get('name'):
-                    param['name'] = param_name_raw
-                final_params.append(param)
-
-            # Check if this endpoint needs a body parameter
-            has_request_body = method in ['POST', 'PUT', 'PATCH'] and (
-                tool.get('request_schema_ref') or
-                tool.get('operation', {}).get('requestBody')
-            )
+        tool_name, code, auth_env_vars = rendered
+        all_auth_env_vars.update(auth_env_vars.values())  # Track for .env generation
 
-            # Separate required and optional parameters (considering auth params are optional)
-            required_params = []
-            optional_params = []
-
-            for param in final_params:
-                original_name = param.get('name', '')
-                is_auth = original_name in auth_env_vars
-                is_required = param.get('required') and not is_auth
-
-                if is_required:
-                    required_params.append(param)
-                else:
-                    optional_params.append(param)
-
-            # Generate tool function with FastMCP decorator
-            code += f'@mcp.tool()  # type: ignore\n'
-            code += f'async def {tool_name}(\n'
-
-            # Add required parameters first (path params, etc.)
-            for param in required_params:
-                param_name = param['sanitized_name']
-                param_type = param.get('schema', dict()).get('type', 'str')
-                python_type = dict(string='str', integer='int', boolean='bool', number='float').get(param_type, 'Any')
-                param_desc_raw = param.get('description', '')
-                param_desc = param_desc_raw.replace('\n', ' ').replace('\r', '')[:200] if param_desc_raw else ''
-                code += f'    {param_name}: {python_type},  # {param_desc}\n'
-
-            # Add body parameter (required) before optional parameters
-            if has_request_body:
-                code += f'    body: dict,  # Request body\n'
-
-            # Add optional parameters last
-            for param in optional_params:
-                param_name = param['sanitized_name']
-                original_name = param.get('name', '')
-                param_type = param.get('schema', dict()).get('type', 'str')
-                python_type = dict(string='str', integer='int', boolean='bool', number='float').get(param_type, 'Any')
-                param_desc_raw = param.get('description', '')
-                param_desc = param_desc_raw.replace('\n', ' ').replace('\r', '')[:200] if param_desc_raw else ''
-                is_auth = original_name in auth_env_vars
-                opt_note = ' (optional if env var set)' if is_auth else ''
-                code += f'    {param_name}: {python_type} | None = None,  # {param_desc}{opt_note}\n'
-
-            code += f') -> Any:\n'
-            code += f'    """{description}"""\n'
-
-            # Build URL with path parameters (use sanitized names)
-            url_path = path
-            for param in parameters:
-                if param.get('in') == 'path':
-                    original_name = param.get('name', '')
-                    sanitized_name = param.get('sanitized_name', original_name)
-                    if original_name:
-                        # Replace the placeholder with the sanitized parameter name
-                        url_path = url_path.replace('{' + original_name + '}', '{' + sanitized_name + '}')
-
-            code += '    url = f"{BASE_URL}' + url_path + '"\n\n'
-
-            # Prepare headers (including auth headers)
-            code += '    # Prepare request headers\n'
-            code += '    headers = {}\n'
-            header_params = [p for p in parameters if p.get('in') == 'header']
-            if header_params:
-                for param in header_params:
-                    original_name = param.get('name', '')
-                    sanitized_name = param.get('sanitized_name', original_name)
-
-                    # Handle auth parameters with env var fallback
-                    if original_name in auth_env_vars:
-                        env_var_name = auth_env_vars[original_name]
-                        code += f'    # Auto-inject {original_name} header from parameter or environment\n'
-                        code += f'    {sanitized_name}_value = {sanitized_name} or {env_var_name}\n'
-                        code += f'    if not {sanitized_name}_value:\n'
-                        code += f'        raise ValueError("{original_name} required. Provide as parameter or set {env_var_name} environment variable.")\n'
-                        code += f'    headers["{original_name}"] = {sanitized_name}_value\n'
-                    else:
-                        code += f'    if {sanitized_name} is not None:\n'
-                        code += f'        headers["{original_name}"] = {sanitized_name}\n'
-            code += '\n'
-
-            # Handle different request methods
-            code += f'    async with httpx.AsyncClient(follow_redirects=True) as client:\n'
-
-            if method == 'GET':
-                code += f'        params = ' + '{}\n'
-                for param in parameters:
-                    if param.get('in') == 'query':
-                        original_name = param.get('name', '')
-                        sanitized_name = param.get('sanitized_name', original_name)
-
-                        # Handle auth parameters with env var fallback
-                        if original_name in auth_env_vars:
-                            env_var_name = auth_env_vars[original_name]
-                            code += f'        # Auto-inject {original_name} from parameter or environment\n'
-                            code += f'        {sanitized_name}_value = {sanitized_name} or {env_var_name}\n'
-                            code += f'        if not {sanitized_name}_value:\n'
-                            code += f'            raise ValueError("{original_name} required. Provide as parameter or set {env_var_name} environment variable.")\n'
-                            code += f'        params["{original_name}"] = {sanitized_name}_value\n'
-                        else:
-                            code += f'        if {sanitized_name} is not None:\n'
-                            code += f'            params["{original_name}"] = {sanitized_name}\n'
-                code += f'\n        response = await client.get(url, params=params, headers=headers)\n'
-
-            elif method in ['POST', 'PUT', 'PATCH']:
-                code += f'        response = await client.{method.lower()}(url, json=body, headers=headers)\n'
-
-            elif method == 'DELETE':
-                # DELETE can have query parameters (including auth)
-                query_params = [p for p in parameters if p.get('in') == 'query']
-                if query_params:
-                    code += f'        params = ' + '{}\n'
-                    for param in query_params:
-                        original_name = param.get('name', '')
-                        sanitized_name = param.get('sanitized_name', original_name)
-
-                        # Handle auth parameters with env var fallback
-                        if original_name in auth_env_vars:
-                            env_var_name = auth_env_vars[original_name]
-                            code += f'        # Auto-inject {original_name} from parameter or environment\n'
-                            code += f'        {sanitized_name}_value = {sanitized_name} or {env_var_name}\n'
-                            code += f'        if not {sanitized_name}_value:\n'
-                            code += f'            raise ValueError("{original_name} required. Provide as parameter or set {env_var_name} environment variable.")\n'
-                            code += f'        params["{original_name}"] = {sanitized_name}_value\n'
-                        else:
-                            code += f'        if {sanitized_name} is not None:\n'
-                            code += f'            params["{original_name}"] = {sanitized_name}\n'
-                    code += f'\n        response = await client.delete(url, params=params, headers=headers)\n'
-                else:
-                    code += f'        response = await client.delete(url, headers=headers)\n'
-
-            code += f'        response.raise_for_status()\n'
-            code += '        \n'
-            code += '        # Try to parse as JSON, fallback to text if not JSON\n'
-            code += '        if not response.text:\n'
-            code += '            return {"status": "success"}\n'
-            code += '        \n'
-            code += '        try:\n'
-            code += '            return response.json()\n'
-            code += '        except Exception:\n'
-            code += '            # Response is not JSON, return as text\n'
-            code += '            return {"text": response.text}\n'
-
-            tool_file.write_text(code)
-            print(f"   ✓ Generated {tool_name}.py")
+        # Generate individual tool file
+        tool_file = tools_dir / f"{tool_name}.py"
+        tool_file.write_text(code)
+        print(f"   ✓ Generated {tool_name}.py")
 
-        except Exception as e:
-            print(f"   ⚠️  Failed to generate tool {tool_name_raw}: {str(e)[:100]}")
-            continue
+    for tool_name_raw, error in failures:
+        print(f"   ⚠️  Failed to generate tool {tool_name_raw}: {error}")
+
+    elapsed = time.perf_counter() - started
+    print(f"   ⏱️  Rendered {len(jobs)} tool(s) in {elapsed:.2f}s ({workers} worker(s))")
 
     return all_auth_env_vars
 
-def generate_tool_implementations():
+def write_security_schemes(security_schemes: Dict[str, Dict[str, Any]]):
+    """Write the security_schemes module read by runtime/security.py."""
+    project_slug = "{{ cookiecutter.project_slug }}"
+    schemes_file = Path(f"src/{project_slug}/security_schemes.py")
+    schemes_file.write_text(render_code_template('security_schemes', {
+        'schemes': [(repr(name), repr(config)) for name, config in sorted(security_schemes.items())],
+    }))
+    print(f"   ✓ Generated {schemes_file.name} ({len(security_schemes)} scheme(s))")
+
+def generate_tool_implementations(model_classes: Optional[Dict[str, str]] = None):
     """Generate tool implementations for selected OpenAPI operations."""
     if not os.path.exists('./.openapi_tools.json'):
         return
 
     with open('./.openapi_tools.json', 'r') as f:
         tool_data = json.load(f)
+    tool_data['model_classes'] = model_classes or {}
 
     tools = tool_data.get('tools', [])
     if not tools:
@@ -693,40 +1835,92 @@ def generate_tool_implementations():
             json.dump(tool_data, f, indent=2)
         print(f"   ℹ️  Detected API authentication: {', '.join(sorted(detected_auth_vars))}")
 
+    if BATCH_TOOL:
+        generate_batch_tool(tools)
+
     # Generate prompts from OpenAPI operations
     print(f"\n✨ Generating helpful prompts from API operations...")
     generate_fastmcp_prompts(tools)
 
-def generate_python_tools(tools: List[Dict[str, Any]], tool_data: Dict[str, Any]) -> str:
-    """Generate Python tool implementation code."""
-    import json as json_module
+    # Record what was generated so `mcp-cookie-cutter update` can diff against it
+    write_lockfile(tools, tool_data)
 
-    base_url = tool_data.get('base_url', 'https://api.example.com')
+def generate_batch_tool(tools: list):
+    """Write the batch_call tool, which runs several of the other tools in one call."""
+    project_slug = "{{ cookiecutter.project_slug }}"
+    if any(sanitize_tool_name(tool['name']) == BATCH_TOOL_NAME for tool in tools):
+        print(f"   ⚠️  An operation is already named {BATCH_TOOL_NAME}, skipping the batch tool")
+        return
 
-    code = '''"""Auto-generated tool implementations from OpenAPI spec."""
+    tool_file = Path(f"src/{project_slug}/tools/{BATCH_TOOL_NAME}.py")
+    tool_file.write_text(render_code_template('batch_tool', {
+        'project_slug': project_slug,
+        'tool_name': BATCH_TOOL_NAME,
+    }))
+    print(f"   ✓ Generated {tool_file.name} (runs several tools in one call)")
 
-import logging
-from typing import Any, Dict, List
-from mcp.types import Tool, TextContent
-import httpx
+def file_sha256(path: Path) -> Optional[str]:
+    """SHA-256 of a generated file, or None if it does not exist."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
 
-logger = logging.getLogger(__name__)
+def write_lockfile(tools: list, tool_data: dict, file_hashes: Optional[Dict[str, str]] = None):
+    """Write mcp-cookie-cutter.lock describing the generated operations.
 
-# Base URL from OpenAPI spec
-BASE_URL = "{base_url}"
+    The lockfile stores the template context, the tool selection and, per
+    operation, the spec fingerprint and the hash of the file generated for it.
+    `file_hashes` keeps previously recorded hashes for files that were not
+    regenerated, so local edits are still detected on the next update.
+    """
+    file_hashes = file_hashes or {}
+    project_slug = "{{ cookiecutter.project_slug }}"
+    tools_dir = Path(f"src/{project_slug}/tools")
+    context = tool_data.get('context') or json.loads({{ cookiecutter | jsonify | tojson }})
 
-'''.format(base_url=base_url)
+    operations = {}
+    for tool in tools:
+        tool_name = sanitize_tool_name(tool['name'])
+        if not tool_name or tool_name == 'tool':
+            continue
+        tool_file = tools_dir / f"{tool_name}.py"
+        operations[tool['name']] = {
+            'method': tool['method'],
+            'path': tool['path'],
+            'fingerprint': tool.get('fingerprint'),
+            'category': get_tool_category(tool),
+            'tool_file': tool_file.as_posix(),
+            'sha256': file_hashes.get(tool['name']) or file_sha256(tool_file),
+        }
+
+    context = {k: v for k, v in context.items() if not k.startswith('_')}
+    spec_path = context.get('openapi_spec_path', '')
+    if spec_path and not spec_path.startswith(('http://', 'https://')):
+        # Relative paths resolve from the project directory, the hooks' working
+        # directory; stored absolute, `update` finds the spec from anywhere
+        context['openapi_spec_path'] = os.path.abspath(os.path.expanduser(spec_path))
+
+    lock = {
+        'version': LOCKFILE_VERSION,
+        'context': context,
+        'base_url': tool_data.get('base_url', ''),
+        'selection': tool_data.get('selection', {'mode': 'manual'}),
+        'operations': operations,
+    }
+
+    with open(LOCKFILE_NAME, 'w') as f:
+        json.dump(lock, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def generate_python_tools(tools: List[Dict[str, Any]], tool_data: Dict[str, Any]) -> str:
+    """Generate Python tool implementation code."""
+    import json as json_module
 
-    # Generate list_tools function
-    code += 'def get_generated_tools() -> List[Tool]:\n'
-    code += '    """Get list of auto-generated tools."""\n'
-    code += '    return [\n'
+    base_url = tool_data.get('base_url', 'https://api.example.com')
 
+    rendered_tools = []
     for tool in tools:
-        code += f'        Tool(\n'
-        code += f'            name="{tool["name"]}",\n'
-        code += f'            description="{tool["description"]}",\n'
-
         # Build input schema from parameters
         schema = dict(type='object', properties=dict(), required=[])
 
@@ -743,75 +1937,27 @@ BASE_URL = "{base_url}"
             if param.get('required', False):
                 schema['required'].append(param_name)
 
-        # Add request body if present
-        if tool.get('request_schema_ref'):
+        # Add request body if present (Swagger 2.0 body parameters are listed above)
+        if tool.get('request_schema_ref') and not any(p.get('in') == 'body' for p in tool.get('parameters', [])):
             schema['properties']['body'] = dict(
                 type='object',
                 description='Request body'
             )
             schema['required'].append('body')
 
-        # Use json.dumps to safely serialize the schema
-        schema_str = json_module.dumps(schema)
-        code += f'            inputSchema={schema_str}\n'
-        code += '        ),\n'
-
-    code += '    ]\n\n'
-
-    # Generate call_tool implementation
-    code += 'async def call_generated_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:\n'
-    code += '    """Execute a generated tool."""\n'
-    code += '    logger.info(f"Calling generated tool: {name}")\n\n'
-
-    for tool in tools:
-        code += f'    if name == "{tool["name"]}":\n'
-        code += f'        # {tool["method"]} {tool["path"]}\n'
-
-        # Build URL with path parameters
-        path = tool['path']
-        path_params = [p for p in tool.get('parameters', []) if p.get('in') == 'path']
-
-        if path_params:
-            for param in path_params:
-                param_name = param['name']
-                code += f'        {param_name} = arguments.get("{param_name}")\n'
-                # Replace {paramName} with {paramName} in the path for f-string interpolation
-                path = path.replace('{' + param_name + '}', '{' + param_name + '}')
-
-            code += '        url = f"{BASE_URL}' + path + '"\n'
-        else:
-            code += '        url = f"{BASE_URL}' + path + '"\n'
-
-        # Add query parameters
-        query_params = [p for p in tool.get('parameters', []) if p.get('in') == 'query']
-        if query_params:
-            code += '        params = ' + '{}' + '\n'
-            for param in query_params:
-                param_name = param['name']
-                code += f'        if "{param_name}" in arguments:\n'
-                code += f'            params["{param_name}"] = arguments["{param_name}"]\n'
-
-        # Make HTTP request
-        code += '\n        async with httpx.AsyncClient() as client:\n'
-
-        method_lower = tool['method'].lower()
-        if method_lower == 'get':
-            if query_params:
-                code += '            response = await client.get(url, params=params)\n'
-            else:
-                code += '            response = await client.get(url)\n'
-        elif method_lower in ['post', 'put', 'patch']:
-            code += '            body = arguments.get("body", ' + '{}' + ')\n'
-            code += f'            response = await client.{method_lower}(url, json=body)\n'
-        elif method_lower == 'delete':
-            code += f'            response = await client.delete(url)\n'
-
-        code += '            response.raise_for_status()\n'
-        code += '            return [TextContent(type="text", text=response.text)]\n\n'
-
-    code += '    raise ValueError(f"Unknown generated tool: {name}")\n'
+        parameters = tool.get('parameters', [])
+        rendered_tools.append({
+            'name': tool['name'],
+            'description': tool['description'],
+            # Use json.dumps to safely serialize the schema
+            'input_schema': json_module.dumps(schema),
+            'method': tool['method'],
+            'path': tool['path'],
+            'path_params': [p['name'] for p in parameters if p.get('in') == 'path'],
+            'query_params': [p['name'] for p in parameters if p.get('in') == 'query'],
+        })
 
-    return code
+    return render_code_template('python_tools', {'base_url': base_url, 'tools': rendered_tools})
 
 def setup_fastmcp_project():
     """Setup FastMCP-specific project structure (always used now)."""
@@ -946,14 +2092,14 @@ def main():
     cleanup_unused_files()
 
     # Generate Pydantic models if OpenAPI spec was provided
-    models_generated = generate_pydantic_models()
+    model_classes = generate_pydantic_models()
 
     # Setup FastMCP project structure
     setup_fastmcp_project()
 
     # Generate tool implementations if tools were selected
     # This must run BEFORE create_env_template to detect auth vars
-    generate_tool_implementations()
+    generate_tool_implementations(model_classes)
 
     # Create environment template (after tool generation to include detected auth)
     create_env_template()
@@ -42,6 +42,11 @@ def get_template_dir():
 def main():
     """Main entry point for the mcp-cookie-cutter CLI."""
     try:
+        # `mcp-cookie-cutter update [PROJECT_DIR]` refreshes an existing project
+        if sys.argv[1:2] == ["update"]:
+            from mcp_cookie_cutter.update import main as update_main
+            sys.exit(update_main(sys.argv[2:]))
+
         template_dir = get_template_dir()
 
         # Pass any command-line arguments to cookiecutter
@@ -4,6 +4,8 @@
 import json
 from typing import Dict, List, Any, Optional
 
+UPLOAD_FILE_DESCRIPTION = 'Path (relative to UPLOAD_DIR) or file:// URI of the file to upload'
+
 
 class OpenAPIToolGenerator:
     """Generate MCP tools from OpenAPI specifications."""
@@ -83,7 +85,8 @@ class OpenAPIToolGenerator:
             'input_schema': input_schema,
             'responses': operation.get('responses', {}),
             'tags': operation.get('tags', []),
-            'security': operation.get('security', []),
+            # The operation's own requirements replace the global ones
+            'security': operation.get('security', self.spec.get('security', [])),
         }
 
     def _build_input_schema(self, parameters: List[Dict], request_body: Dict) -> Dict[str, Any]:
@@ -112,6 +115,9 @@ class OpenAPIToolGenerator:
                 'type': param_schema.get('type', 'string'),
                 'description': param.get('description', ''),
             }
+            if param_schema.get('type') == 'file':
+                # Swagger 2.0 file upload, given as a local path
+                schema['properties'][param_name] = {'type': 'string', 'description': UPLOAD_FILE_DESCRIPTION}
 
             if 'enum' in param_schema:
                 schema['properties'][param_name]['enum'] = param_schema['enum']
@@ -128,6 +134,21 @@ class OpenAPIToolGenerator:
                 schema['properties']['body'] = body_schema
                 if request_body.get('required', False):
                     schema['required'].append('body')
+            elif 'multipart/form-data' in content or 'application/x-www-form-urlencoded' in content:
+                # Form and upload operations take their fields as arguments, files as local paths
+                form_content = content.get('multipart/form-data') or content['application/x-www-form-urlencoded']
+                form_schema = form_content.get('schema', {})
+                for field_name, field_schema in form_schema.get('properties', {}).items():
+                    if field_schema.get('format') == 'binary':
+                        field_schema = {'type': 'string', 'description': UPLOAD_FILE_DESCRIPTION}
+                    schema['properties'][field_name] = field_schema
+                schema['required'].extend(form_schema.get('required', []))
+            elif any(media_type == 'application/octet-stream' or media_type.split('/')[0] in ('image', 'audio', 'video')
+                     for media_type in content):
+                # A raw body (e.g. application/octet-stream) is sent from a local file
+                schema['properties']['file'] = {'type': 'string', 'description': UPLOAD_FILE_DESCRIPTION}
+                if request_body.get('required', False):
+                    schema['required'].append('file')
 
         return schema
 
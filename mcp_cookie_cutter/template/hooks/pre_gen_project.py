@@ -3,8 +3,36 @@
 
 import sys
 import os
+import re
 import json
-from typing import Dict, List, Any, Optional
+import bisect
+import concurrent.futures
+import fnmatch
+import hashlib
+import importlib.metadata
+from pathlib import Path
+from typing import Dict, List, Any, NoReturn, Optional, Tuple
+
+# Bump when the cached entry layout changes so stale entries are ignored
+SPEC_CACHE_VERSION = 2
+
+# Read/download specs in chunks so large specs are never buffered twice
+SPEC_CHUNK_SIZE = 64 * 1024
+
+# off: skip validation, fast: structural checks of selected operations only,
+# full: openapi-pydantic validation of the whole spec in a background thread
+VALIDATION_MODES = ('off', 'fast', 'full')
+
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'DELETE', 'PATCH')
+
+SELECTION_RULE_KEYS = ('include', 'exclude', 'deprecated', 'max_tools')
+SELECTION_FILTER_KEYS = ('tags', 'methods', 'paths', 'operation_ids')
+
+# Operations listed per page during interactive selection
+SELECTION_PAGE_SIZE = 20
+
+WORD_RE = re.compile(r'[A-Za-z0-9]+')
+CAMEL_CASE_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
 
 def validate_project_name():
     """Validate project name."""
@@ -27,86 +55,468 @@ def validate_deployment_auth_combo():
         print("\nℹ️  Info: API key authentication selected.")
         print("For public clients, consider OAuth 2.1 for enhanced security.\n")
 
-def load_openapi_spec(spec_path: str) -> Optional[Dict[str, Any]]:
-    """Load OpenAPI spec from file or URL with proper parsing."""
+def get_spec_cache_dir() -> Optional[Path]:
+    """Return the parsed-spec cache directory, or None if caching is disabled."""
+    if os.environ.get("MCP_COOKIE_CUTTER_NO_CACHE"):
+        return None
+
+    cache_root = os.environ.get("MCP_COOKIE_CUTTER_CACHE_DIR")
+    if cache_root:
+        cache_dir = Path(cache_root)
+    else:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+        cache_dir = Path(xdg_cache) / "mcp-cookie-cutter"
+
     try:
-        # Try to import optional dependencies
-        try:
-            import yaml
-        except ImportError:
-            yaml = None
+        (cache_dir / "specs").mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return cache_dir
+
+def get_validator_version() -> str:
+    """Installed openapi-pydantic version, which decides the cached validation result."""
+    try:
+        return importlib.metadata.version("openapi-pydantic")
+    except importlib.metadata.PackageNotFoundError:
+        return "none"
+
+def get_spec_cache_path(cache_dir: Path, digest: str) -> Path:
+    """Cache entry path for a spec digest and the installed validator."""
+    return cache_dir / "specs" / f"{digest}-{get_validator_version()}.json"
+
+def touch(entry_path: Path):
+    """Bump a cache entry's mtime so eviction treats it as recently used."""
+    try:
+        os.utime(entry_path)
+    except OSError:
+        pass
+
+def load_cached_spec(digest: str) -> Optional[Dict[str, Any]]:
+    """Load a parsed spec entry from the cache by SHA-256 of the raw spec bytes."""
+    cache_dir = get_spec_cache_dir()
+    if cache_dir is None:
+        return None
+
+    # JSON rather than pickle: the cache directory may be shared, and loading
+    # an entry must never run code someone else put there
+    entry_path = get_spec_cache_path(cache_dir, digest)
+    try:
+        with open(entry_path, 'rb') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(entry, dict) or entry.get('version') != SPEC_CACHE_VERSION:
+        return None
+
+    touch(entry_path)
+    return entry
+
+def store_cached_spec(digest: str, spec_dict: Dict[str, Any], validated: bool,
+                      validation_error: Optional[str]):
+    """Store a parsed spec and its validation result in the cache."""
+    cache_dir = get_spec_cache_dir()
+    if cache_dir is None:
+        return
+
+    entry = {
+        'version': SPEC_CACHE_VERSION,
+        'spec': spec_dict,
+        'validated': validated,
+        'validation_error': validation_error,
+    }
 
+    entry_path = get_spec_cache_path(cache_dir, digest)
+    tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, separators=(',', ':'))
+        os.replace(tmp_path, entry_path)
+    except (OSError, TypeError, ValueError):
+        if tmp_path.exists():
+            tmp_path.unlink()
+        return
+
+    evict_spec_cache(cache_dir)
+
+def evict_spec_cache(cache_dir: Path):
+    """Remove least recently used cache entries until the cache fits its size budget.
+
+    Parsed specs (specs/<digest>.json) and downloaded remote specs
+    (http/<key>.body with its http/<key>.json metadata) share the budget; a
+    download and its metadata are evicted together.
+    """
+    try:
+        max_bytes = int(float(os.environ.get("MCP_COOKIE_CUTTER_CACHE_MAX_MB", "256")) * 1024 * 1024)
+    except ValueError:
+        max_bytes = 256 * 1024 * 1024
+
+    groups: Dict[Path, List[Path]] = {}
+    for entry_path in (cache_dir / "specs").glob("*.json"):
+        groups[entry_path] = [entry_path]
+    for pattern in ("*.body", "*.json"):
+        for entry_path in (cache_dir / "http").glob(pattern):
+            groups.setdefault(entry_path.with_suffix(""), []).append(entry_path)
+
+    entries = []
+    total_bytes = 0
+    for paths in groups.values():
+        mtime, size = 0.0, 0
+        for entry_path in paths:
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            mtime, size = max(mtime, stat.st_mtime), size + stat.st_size
+        entries.append((mtime, size, paths))
+        total_bytes += size
+
+    # Oldest first
+    for _, size, paths in sorted(entries, key=lambda entry: entry[:2]):
+        if total_bytes <= max_bytes:
+            break
         try:
-            import requests
-        except ImportError:
-            requests = None
+            for entry_path in paths:
+                entry_path.unlink(missing_ok=True)
+            total_bytes -= size
+        except OSError:
+            continue
+
+def hash_file(path: str) -> str:
+    """Compute the SHA-256 of a file without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(SPEC_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def fetch_remote_spec(url: str, cache_dir: Path) -> Optional[Tuple[str, Path]]:
+    """Fetch a remote spec into the cache with a conditional, gzip-compressed request.
+
+    The previous ETag/Last-Modified are sent back so an unchanged spec costs a
+    304 round-trip, and the body is streamed to disk while being hashed.
+    Returns the SHA-256 of the body and the path it was stored at.
+    """
+    try:
+        import requests
+    except ImportError:
+        print("⚠️  Warning: 'requests' library not installed. Cannot fetch from URL.")
+        print("   Install with: pip install requests")
+        return None
+
+    http_dir = cache_dir / "http"
+    http_dir.mkdir(parents=True, exist_ok=True)
+    url_key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    body_path = http_dir / f"{url_key}.body"
+    meta_path = http_dir / f"{url_key}.json"
 
+    meta = {}
+    if body_path.exists() and meta_path.exists():
         try:
-            from openapi_pydantic import OpenAPI
-            has_openapi_pydantic = True
-        except ImportError:
-            has_openapi_pydantic = False
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            meta = {}
 
-        spec_dict = None
+    headers = {'Accept-Encoding': 'gzip'}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
 
-        # Load from URL
-        if spec_path.startswith(('http://', 'https://')):
-            if requests is None:
-                print("⚠️  Warning: 'requests' library not installed. Cannot fetch from URL.")
-                print("   Install with: pip install requests")
-                return None
+    try:
+        with requests.get(url, headers=headers, timeout=10, stream=True) as response:
+            if response.status_code == 304 and meta:
+                print("   ⚡ Remote spec not modified since last fetch")
+                touch(body_path)
+                return meta.get('sha256') or hash_file(str(body_path)), body_path
 
-            response = requests.get(spec_path, timeout=10)
             response.raise_for_status()
 
-            # Try JSON first
+            # Stream the (transparently decompressed) body to disk, hashing as we go
+            digest = hashlib.sha256()
+            tmp_path = body_path.with_suffix(f".{os.getpid()}.tmp")
             try:
-                spec_dict = response.json()
-            except json.JSONDecodeError:
-                # Try YAML
-                if yaml:
-                    spec_dict = yaml.safe_load(response.text)
-                else:
-                    print("⚠️  Warning: 'pyyaml' library not installed. Cannot parse YAML.")
-                    print("   Install with: pip install pyyaml")
-                    return None
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=SPEC_CHUNK_SIZE):
+                        digest.update(chunk)
+                        f.write(chunk)
+                # Drop the old metadata first: a body without metadata is
+                # fetched again, a new body with old metadata would be trusted
+                meta_path.unlink(missing_ok=True)
+                os.replace(tmp_path, body_path)
+            except BaseException:
+                # Leave no partial download behind in the cache
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+            meta = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'sha256': digest.hexdigest(),
+            }
+    except requests.RequestException as e:
+        if not meta:
+            raise
+        # Fall back to the last good copy so generation works offline
+        print(f"⚠️  Warning: Could not refresh remote spec ({e}). Using cached copy.")
+        touch(body_path)
+        return meta.get('sha256') or hash_file(str(body_path)), body_path
+
+    tmp_path = meta_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+    except OSError:
+        # Without metadata the next run simply fetches the spec again
+        tmp_path.unlink(missing_ok=True)
+
+    return meta['sha256'], body_path
+
+def read_spec_bytes(spec_path: str) -> Optional[bytes]:
+    """Read the raw bytes of an OpenAPI spec from a file or URL."""
+    # Load from URL
+    if spec_path.startswith(('http://', 'https://')):
+        try:
+            import requests
+        except ImportError:
+            print("⚠️  Warning: 'requests' library not installed. Cannot fetch from URL.")
+            print("   Install with: pip install requests")
+            return None
+
+        response = requests.get(spec_path, timeout=10)
+        response.raise_for_status()
+        return response.content
+
+    # Load from file
+    if not os.path.exists(spec_path):
+        print(f"⚠️  Warning: OpenAPI spec file not found: {spec_path}")
+        return None
+
+    with open(spec_path, 'rb') as f:
+        return f.read()
+
+def parse_spec_bytes(content: bytes) -> Optional[Dict[str, Any]]:
+    """Parse raw spec bytes as JSON, falling back to YAML."""
+    # Try JSON first
+    try:
+        return json.loads(content)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        pass
+
+    # Try YAML
+    try:
+        import yaml
+    except ImportError:
+        print("⚠️  Warning: 'pyyaml' library not installed. Cannot parse YAML.")
+        print("   Install with: pip install pyyaml")
+        return None
+
+    # Keep only JSON types (string keys, no dates), as the spec cache stores
+    # JSON and cached and freshly parsed specs must be the same
+    return json.loads(json.dumps(yaml.safe_load(content), default=str))
 
-        # Load from file
+def load_spec_entry(spec_path: str) -> Optional[Dict[str, Any]]:
+    """Load OpenAPI spec from file or URL with proper parsing.
+
+    Parsed specs are cached on disk keyed by the SHA-256 of the raw bytes, so
+    regenerating from an unchanged spec skips parsing entirely. Returns the
+    cache entry: the parsed spec plus its digest and any stored validation result.
+    """
+    try:
+        cache_dir = get_spec_cache_dir()
+        content = None
+        if cache_dir is not None and spec_path.startswith(('http://', 'https://')):
+            fetched = fetch_remote_spec(spec_path, cache_dir)
+            if fetched is None:
+                return None
+            digest, spec_file = fetched
+        elif cache_dir is not None and os.path.exists(spec_path):
+            digest, spec_file = hash_file(spec_path), spec_path
         else:
-            if not os.path.exists(spec_path):
-                print(f"⚠️  Warning: OpenAPI spec file not found: {spec_path}")
+            content = read_spec_bytes(spec_path)
+            if content is None:
                 return None
+            digest, spec_file = hashlib.sha256(content).hexdigest(), None
 
-            with open(spec_path, 'r') as f:
-                content = f.read()
+        cached = load_cached_spec(digest)
+        if cached is not None:
+            print("   ⚡ Using cached parse of this spec")
+            cached['digest'] = digest
+            return cached
 
-                # Try JSON first
-                try:
-                    spec_dict = json.loads(content)
-                except json.JSONDecodeError:
-                    # Try YAML
-                    if yaml:
-                        spec_dict = yaml.safe_load(content)
-                    else:
-                        print("⚠️  Warning: 'pyyaml' library not installed. Cannot parse YAML.")
-                        print("   Install with: pip install pyyaml")
-                        return None
+        if content is None:
+            with open(spec_file, 'rb') as f:
+                content = f.read()
 
-        # Validate with openapi-pydantic if available
-        if spec_dict and has_openapi_pydantic:
-            try:
-                # Validate the spec using Pydantic models
-                OpenAPI.model_validate(spec_dict)
-            except Exception as e:
-                print(f"⚠️  Warning: OpenAPI spec validation failed: {e}")
-                print("   Proceeding with basic parsing...")
+        spec_dict = parse_spec_bytes(content)
+        if not spec_dict:
+            return None
 
-        return spec_dict
+        store_cached_spec(digest, spec_dict, False, None)
+        return {
+            'digest': digest,
+            'spec': spec_dict,
+            'validated': False,
+            'validation_error': None,
+        }
 
     except Exception as e:
         print(f"⚠️  Warning: Error loading OpenAPI spec: {e}")
         return None
 
+def load_openapi_spec(spec_path: str) -> Optional[Dict[str, Any]]:
+    """Load OpenAPI spec from file or URL, without validating it."""
+    entry = load_spec_entry(spec_path)
+    return entry['spec'] if entry else None
+
+def validate_spec_full(spec_dict: Dict[str, Any]) -> Optional[str]:
+    """Validate a whole spec with openapi-pydantic and return the error, if any."""
+    from openapi_pydantic import OpenAPI
+
+    try:
+        # Validate the spec using Pydantic models
+        OpenAPI.model_validate(spec_dict)
+    except Exception as e:
+        return str(e)
+    return None
+
+def validate_operations_fast(spec: Dict[str, Any], tools: List[Dict[str, Any]]) -> List[str]:
+    """Check the structure of the selected operations only.
+
+    This is a cheap stand-in for full validation: it looks at the pieces the
+    generator relies on (parameters, path placeholders, request bodies,
+    responses and local $refs) without building an object graph of the spec.
+    """
+    is_swagger = 'swagger' in spec
+    valid_locations = {'query', 'header', 'path', 'cookie'}
+    if is_swagger:
+        valid_locations |= {'body', 'formData'}
+
+    problems = []
+    for tool in tools:
+        label = f"{tool['method']} {tool['path']}"
+        operation = tool.get('operation', {})
+
+        if not isinstance(operation.get('responses'), dict) or not operation['responses']:
+            problems.append(f"{label}: missing 'responses'")
+
+        path_level = spec.get('paths', {}).get(tool['path'], {}).get('parameters', [])
+        declared_path_params = set()
+        for param in list(path_level) + list(tool.get('parameters', [])):
+            if not isinstance(param, dict):
+                problems.append(f"{label}: parameter is not an object")
+                continue
+            # Parameters shared through components/parameters (or Swagger 2 parameters)
+            seen_refs = set()
+            while '$ref' in param and param['$ref'] not in seen_refs:
+                ref = param['$ref']
+                seen_refs.add(ref)
+                param = resolve_local_ref(spec, ref)
+                if param is None:
+                    problems.append(f"{label}: unresolvable $ref {ref}")
+                    break
+            if not isinstance(param, dict) or not param or '$ref' in param:
+                # Unresolvable, external (resolved to {}) or circular: nothing to check
+                continue
+            if not param.get('name'):
+                problems.append(f"{label}: parameter without 'name'")
+            if param.get('in') not in valid_locations:
+                problems.append(f"{label}: parameter '{param.get('name')}' has invalid 'in': {param.get('in')}")
+            if param.get('in') == 'path':
+                declared_path_params.add(param.get('name'))
+                if not param.get('required'):
+                    problems.append(f"{label}: path parameter '{param.get('name')}' must be required")
+
+        for placeholder in re.findall(r'\{([^}]+)\}', tool['path']):
+            if placeholder not in declared_path_params:
+                problems.append(f"{label}: path parameter '{placeholder}' is not declared")
+
+        request_body = operation.get('requestBody')
+        if request_body is not None and '$ref' not in request_body:
+            if not isinstance(request_body.get('content'), dict):
+                problems.append(f"{label}: requestBody without 'content'")
+
+        for ref in (tool.get('request_schema_ref'), *tool.get('response_schema_refs', {}).values()):
+            if ref and resolve_local_ref(spec, ref) is None:
+                problems.append(f"{label}: unresolvable $ref {ref}")
+
+    return problems
+
+def resolve_local_ref(spec: Dict[str, Any], ref: str) -> Optional[Any]:
+    """Resolve a local JSON pointer ($ref starting with '#/') against the spec."""
+    if not ref.startswith('#/'):
+        # External refs are out of scope for structural checks
+        return {}
+
+    node = spec
+    for part in ref[2:].split('/'):
+        part = part.replace('~1', '/').replace('~0', '~')
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node
+
+def start_spec_validation(entry: Dict[str, Any], validation_mode: str) -> Optional[concurrent.futures.Future]:
+    """Kick off full validation in a background thread.
+
+    The thread runs while the user is still picking tools, so the slowest step
+    for large specs overlaps with interactive input instead of delaying it.
+    """
+    if validation_mode != 'full' or entry['validated']:
+        return None
+
+    try:
+        import openapi_pydantic  # noqa: F401
+    except ImportError:
+        return None
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="spec-validation")
+    future = executor.submit(validate_spec_full, entry['spec'])
+    executor.shutdown(wait=False)
+    return future
+
+def report_spec_validation(entry: Dict[str, Any], validation_mode: str,
+                           future: Optional[concurrent.futures.Future],
+                           selected_tools: List[Dict[str, Any]]):
+    """Report validation results before generation starts."""
+    if validation_mode == 'off':
+        return
+
+    if validation_mode == 'fast':
+        problems = validate_operations_fast(entry['spec'], selected_tools)
+        if problems:
+            print(f"\n⚠️  Warning: Found {len(problems)} structural issue(s) in the selected operations:")
+            for problem in problems[:10]:
+                print(f"   • {problem}")
+            if len(problems) > 10:
+                print(f"   ... and {len(problems) - 10} more")
+            print("   Proceeding with basic parsing...")
+        return
+
+    if future is not None:
+        if not future.done():
+            print("\n⏳ Waiting for OpenAPI spec validation to finish...")
+        entry['validation_error'] = future.result()
+        entry['validated'] = True
+        store_cached_spec(entry['digest'], entry['spec'], True, entry['validation_error'])
+
+    if entry['validation_error']:
+        print(f"⚠️  Warning: OpenAPI spec validation failed: {entry['validation_error']}")
+        print("   Proceeding with basic parsing...")
+
+def get_json_content(content: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The JSON entry of a `content` map: application/json, or a +json type such as application/problem+json."""
+    if 'application/json' in content:
+        return content['application/json'] or {}
+    for media_type, media in content.items():
+        sub = media_type.split(';', 1)[0].strip().lower().partition('/')[2]
+        if sub == 'json' or sub.endswith('+json'):
+            return media or {}
+    return None
+
 def extract_tools_from_spec(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Extract available tools from OpenAPI spec with full operation details."""
     tools = []
@@ -116,7 +526,7 @@ def extract_tools_from_spec(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
 
     for path, methods in paths.items():
         for method, operation in methods.items():
-            if method.upper() not in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
+            if method.upper() not in HTTP_METHODS:
                 continue
 
             # Extract operation details
@@ -130,19 +540,22 @@ def extract_tools_from_spec(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
             request_body = operation.get('requestBody', {})
             request_schema_ref = None
             if request_body:
-                content = request_body.get('content', {})
-                if 'application/json' in content:
-                    schema = content['application/json'].get('schema', {})
-                    request_schema_ref = schema.get('$ref')
+                json_content = get_json_content(request_body.get('content', {}))
+                if json_content is not None:
+                    request_schema_ref = json_content.get('schema', {}).get('$ref')
+            else:
+                # Swagger 2.0 declares the body as an `in: body` parameter
+                body_param = next((p for p in parameters if isinstance(p, dict) and p.get('in') == 'body'), None)
+                if body_param is not None:
+                    request_schema_ref = body_param.get('schema', {}).get('$ref')
 
             # Extract response schema references
             responses = operation.get('responses', {})
             response_schema_refs = {}
             for status_code, response_obj in responses.items():
-                content = response_obj.get('content', {})
-                if 'application/json' in content:
-                    schema = content['application/json'].get('schema', {})
-                    schema_ref = schema.get('$ref')
+                json_content = get_json_content(response_obj.get('content', {}))
+                if json_content is not None:
+                    schema_ref = json_content.get('schema', {}).get('$ref')
                     if schema_ref:
                         response_schema_refs[status_code] = schema_ref
 
@@ -159,6 +572,121 @@ def extract_tools_from_spec(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
 
     return tools
 
+def tokenize_text(text: str) -> List[str]:
+    """Split text into lowercase search tokens, breaking camelCase identifiers apart."""
+    tokens = []
+    for word in WORD_RE.findall(text or ''):
+        tokens.append(word.lower())
+        parts = CAMEL_CASE_RE.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return tokens
+
+def build_operation_index(tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build an inverted index over operationId, path, tags, summary and description.
+
+    Free-text terms are answered by prefix lookups into the sorted vocabulary,
+    tags and methods by direct lookups, so filtering thousands of operations
+    never has to rescan their text.
+    """
+    tokens: Dict[str, set] = {}
+    tags: Dict[str, set] = {}
+    methods: Dict[str, set] = {}
+
+    for i, tool in enumerate(tools):
+        operation = tool.get('operation', {})
+        tool_tags = operation.get('tags', [])
+        text = ' '.join([
+            tool['name'],
+            tool['path'],
+            tool.get('description', '') or '',
+            operation.get('description', '') or '',
+            ' '.join(tool_tags),
+        ])
+        for token in tokenize_text(text):
+            tokens.setdefault(token, set()).add(i)
+        for tag in tool_tags:
+            tags.setdefault(tag.lower(), set()).add(i)
+        methods.setdefault(tool['method'], set()).add(i)
+
+    return {
+        'tools': tools,
+        'tokens': tokens,
+        'vocabulary': sorted(tokens),
+        'tags': tags,
+        'methods': methods,
+    }
+
+def search_operations(index: Dict[str, Any], query: str) -> List[int]:
+    """Return the indices of operations matching every term of the query.
+
+    Supported terms:
+      tag:pets        operations tagged 'pets' (glob patterns allowed)
+      GET / method:get operations using that HTTP method
+      /store*         operations whose path matches the glob (prefix if no wildcard)
+      anything else   free text, matched as word prefixes
+    """
+    tools = index['tools']
+    matches = None  # None means "everything" until the first term narrows it down
+
+    for term in query.split():
+        if matches is not None and not matches:
+            break
+
+        lowered = term.lower()
+        if lowered.startswith('tag:'):
+            pattern = lowered[4:]
+            if any(c in pattern for c in '*?['):
+                term_matches = set()
+                for tag, ids in index['tags'].items():
+                    if fnmatch.fnmatchcase(tag, pattern):
+                        term_matches |= ids
+            else:
+                term_matches = index['tags'].get(pattern, set())
+
+        elif lowered.startswith('method:') or term in HTTP_METHODS:
+            term_matches = index['methods'].get(term.split(':', 1)[-1].upper(), set())
+
+        elif term.startswith('/') or lowered.startswith('path:'):
+            pattern = term[5:] if lowered.startswith('path:') else term
+            if not any(c in pattern for c in '*?['):
+                pattern += '*'
+            path_matches = re.compile(fnmatch.translate(pattern)).match
+            candidates = range(len(tools)) if matches is None else matches
+            term_matches = {i for i in candidates if path_matches(tools[i]['path'])}
+
+        else:
+            vocabulary = index['vocabulary']
+            term_matches = None
+            for token in tokenize_text(term):
+                token_matches = set()
+                pos = bisect.bisect_left(vocabulary, token)
+                while pos < len(vocabulary) and vocabulary[pos].startswith(token):
+                    token_matches |= index['tokens'][vocabulary[pos]]
+                    pos += 1
+                term_matches = token_matches if term_matches is None else term_matches & token_matches
+            if term_matches is None:
+                continue
+
+        matches = set(term_matches) if matches is None else matches & term_matches
+
+    return sorted(range(len(tools)) if matches is None else matches)
+
+def print_operation_page(tools: List[Dict[str, Any]], view: List[int], page: int):
+    """Print one page of the current (possibly filtered) operation list."""
+    pages = max(1, (len(view) + SELECTION_PAGE_SIZE - 1) // SELECTION_PAGE_SIZE)
+    first = page * SELECTION_PAGE_SIZE
+
+    for i in view[first:first + SELECTION_PAGE_SIZE]:
+        tool = tools[i]
+        print(f"{i + 1:2d}. [{tool['method']:6s}] {tool['path']:35s} - {tool['name']}")
+        if tool['description']:
+            print(f"    {tool['description'][:60]}")
+
+    if pages > 1:
+        last = min(first + SELECTION_PAGE_SIZE, len(view))
+        print(f"\n   Showing {first + 1}-{last} of {len(view)} (page {page + 1}/{pages}, '>'/'<' to page)")
+
 def prompt_tool_selection(tools: List[Dict[str, str]]) -> List[Dict[str, str]]:
     """Prompt user to select which tools to implement."""
     print("\n🔧 Interactive Tool Selection")
@@ -166,58 +694,85 @@ def prompt_tool_selection(tools: List[Dict[str, str]]) -> List[Dict[str, str]]:
     print("Select which API operations to implement as MCP tools.")
     print("You can always add more tools later using CUSTOMIZATION.md\n")
 
-    # Show all tools with numbers
-    for i, tool in enumerate(tools, 1):
-        print(f"{i:2d}. [{tool['method']:6s}] {tool['path']:35s} - {tool['name']}")
-        if tool['description']:
-            print(f"    {tool['description'][:60]}")
+    index = build_operation_index(tools)
+    view = list(range(len(tools)))
+    page = 0
+
+    # Show the first page of operations with numbers
+    print_operation_page(tools, view, page)
 
     print("\n" + "=" * 70)
     print("Enter your choices:")
     print("  • Specific numbers: 1,3,5")
     print("  • Ranges: 1-5")
-    print("  • All: 'all' or press Enter")
+    print("  • All: 'all' or press Enter (all matches when a search is active)")
     print("  • Skip: 'none' or 'skip'")
+    print("  • Search: /tag:pets, /GET /store*, /free text ('/' alone clears)")
+    if len(tools) > SELECTION_PAGE_SIZE:
+        print("  • Pages: '>' next, '<' previous")
 
     while True:
         try:
-            choice = input("\nYour selection: ").strip().lower()
+            raw_choice = input("\nYour selection: ").strip()
+            choice = raw_choice.lower()
+
+            # Search within the catalog
+            if choice.startswith('/'):
+                query = raw_choice[1:].strip()
+                view = search_operations(index, query) if query else list(range(len(tools)))
+                page = 0
+                if query:
+                    print(f"\n🔎 {len(view)} operation(s) match '{query}':\n")
+                else:
+                    print(f"\n🔎 Search cleared, showing all {len(view)} operation(s):\n")
+                print_operation_page(tools, view, page)
+                continue
+
+            if choice in ['>', '<']:
+                pages = max(1, (len(view) + SELECTION_PAGE_SIZE - 1) // SELECTION_PAGE_SIZE)
+                page = min(page + 1, pages - 1) if choice == '>' else max(page - 1, 0)
+                print()
+                print_operation_page(tools, view, page)
+                continue
 
             # Handle special cases
             if not choice or choice == 'all':
-                return tools
+                if len(view) == len(tools):
+                    return tools
+                selected_indices = set(view)
 
-            if choice in ['none', 'skip', 'n']:
+            elif choice in ['none', 'skip', 'n']:
                 print("\n⏭️  Skipping tool generation. You can add tools manually later.")
                 return []
 
-            # Parse selection
-            selected_indices = set()
-            parts = choice.split(',')
-
-            for part in parts:
-                part = part.strip()
-
-                # Handle ranges (e.g., "1-5")
-                if '-' in part:
-                    start, end = part.split('-')
-                    start_idx = int(start.strip()) - 1
-                    end_idx = int(end.strip()) - 1
-
-                    if 0 <= start_idx < len(tools) and 0 <= end_idx < len(tools):
-                        selected_indices.update(range(start_idx, end_idx + 1))
-                    else:
-                        print(f"⚠️  Range {part} is out of bounds (1-{len(tools)})")
-                        continue
-
-                # Handle single numbers
-                else:
-                    idx = int(part) - 1
-                    if 0 <= idx < len(tools):
-                        selected_indices.add(idx)
+            else:
+                # Parse selection
+                selected_indices = set()
+                parts = choice.split(',')
+
+                for part in parts:
+                    part = part.strip()
+
+                    # Handle ranges (e.g., "1-5")
+                    if '-' in part:
+                        start, end = part.split('-')
+                        start_idx = int(start.strip()) - 1
+                        end_idx = int(end.strip()) - 1
+
+                        if 0 <= start_idx < len(tools) and 0 <= end_idx < len(tools):
+                            selected_indices.update(range(start_idx, end_idx + 1))
+                        else:
+                            print(f"⚠️  Range {part} is out of bounds (1-{len(tools)})")
+                            continue
+
+                    # Handle single numbers
                     else:
-                        print(f"⚠️  Number {part} is out of bounds (1-{len(tools)})")
-                        continue
+                        idx = int(part) - 1
+                        if 0 <= idx < len(tools):
+                            selected_indices.add(idx)
+                        else:
+                            print(f"⚠️  Number {part} is out of bounds (1-{len(tools)})")
+                            continue
 
             selected = [tools[i] for i in sorted(selected_indices)]
 
@@ -233,16 +788,139 @@ def prompt_tool_selection(tools: List[Dict[str, str]]) -> List[Dict[str, str]]:
                 print("\n⚠️  No valid tools selected. Try again.")
 
         except ValueError as e:
-            print(f"⚠️  Invalid input format. Please use numbers, ranges, or 'all'.")
+            print(f"⚠️  Invalid input format. Please use numbers, ranges, 'all' or a /search.")
         except KeyboardInterrupt:
             print("\n\n⏭️  Selection cancelled. Proceeding without tool generation.")
             return []
 
-def save_selected_tools(tools: List[Dict[str, Any]], spec: Dict[str, Any]):
-    """Save selected tools and spec to files for post-generation hook."""
-    import json
+def load_selection_rules(rules_source: str) -> Optional[Dict[str, Any]]:
+    """Load tool selection rules from inline JSON or a JSON/YAML file.
+
+    Rules that cannot be loaded or are invalid abort the generation: falling
+    back to another selection would silently generate the wrong tools.
+    """
+    rules_source = rules_source.strip()
+    if not rules_source:
+        return None
+
+    try:
+        if rules_source.startswith('{'):
+            rules = json.loads(rules_source)
+        elif os.path.exists(rules_source):
+            with open(rules_source, 'rb') as f:
+                rules = parse_spec_bytes(f.read())
+        else:
+            selection_rules_error(f"file not found: {rules_source}")
+    except Exception as e:
+        selection_rules_error(f"could not parse them: {e}")
+
+    if not isinstance(rules, dict):
+        selection_rules_error("they must be a mapping")
+
+    errors = [f"unknown rule '{key}'" for key in rules if key not in SELECTION_RULE_KEYS]
+    for section in ('include', 'exclude'):
+        filters = rules.get(section)
+        if filters is None:
+            continue
+        if not isinstance(filters, dict):
+            errors.append(f"'{section}' must be a mapping of filters")
+            continue
+        for key, value in filters.items():
+            if key not in SELECTION_FILTER_KEYS:
+                errors.append(f"unknown filter '{section}.{key}'")
+                continue
+            values = [value] if isinstance(value, str) else value
+            if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+                errors.append(f"'{section}.{key}' must be a string or a list of strings")
+            elif key == 'operation_ids':
+                for pattern in values:
+                    try:
+                        re.compile(pattern)
+                    except re.error as e:
+                        errors.append(f"'{section}.operation_ids' pattern {pattern!r} is not a valid regular expression: {e}")
+
+    if not isinstance(rules.get('deprecated', True), bool):
+        errors.append("'deprecated' must be true or false")
+    max_tools = rules.get('max_tools')
+    if max_tools is not None and (isinstance(max_tools, bool) or not isinstance(max_tools, int) or max_tools < 0):
+        errors.append("'max_tools' must be a non-negative integer")
+
+    if errors:
+        selection_rules_error("; ".join(errors))
+    return rules
+
+def selection_rules_error(message: str) -> NoReturn:
+    print(f"Error: Invalid tool selection rules: {message}")
+    sys.exit(1)
+
+def compile_selection_filter(section: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Precompile one include/exclude section so matching is a cheap per-operation check."""
+    section = section or {}
+
+    def as_list(value):
+        if value is None:
+            return []
+        return [value] if isinstance(value, str) else list(value)
+
+    path_patterns = [fnmatch.translate(p) for p in as_list(section.get('paths'))]
+    id_patterns = as_list(section.get('operation_ids'))
+
+    return {
+        'tags': {t.lower() for t in as_list(section.get('tags'))},
+        'methods': {m.upper() for m in as_list(section.get('methods'))},
+        'paths': re.compile('|'.join(f'(?:{p})' for p in path_patterns)) if path_patterns else None,
+        'operation_ids': re.compile('|'.join(f'(?:{p})' for p in id_patterns)) if id_patterns else None,
+    }
+
+def apply_selection_rules(tools: List[Dict[str, Any]], rules: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Select tools with declarative rules in a single pass over the operations.
 
-    # Extract base URL from spec (prefer HTTPS over HTTP)
+    An operation is kept when it matches every filter given under 'include'
+    (any value within a filter), matches no filter under 'exclude', is not
+    deprecated while 'deprecated' is false (they are kept by default), and
+    fits within 'max_tools'.
+    """
+    include = compile_selection_filter(rules.get('include'))
+    exclude = compile_selection_filter(rules.get('exclude'))
+    keep_deprecated = rules.get('deprecated', True)
+    max_tools = rules.get('max_tools')
+
+    selected = []
+    for tool in tools:
+        if max_tools is not None and len(selected) >= max_tools:
+            break
+
+        operation = tool.get('operation', {})
+        if operation.get('deprecated') and not keep_deprecated:
+            continue
+
+        tags = {t.lower() for t in operation.get('tags', [])}
+        method = tool['method']
+        path = tool['path']
+        operation_id = operation.get('operationId', tool['name'])
+
+        if include['tags'] and not tags & include['tags']:
+            continue
+        if include['methods'] and method not in include['methods']:
+            continue
+        if include['paths'] and not include['paths'].match(path):
+            continue
+        if include['operation_ids'] and not include['operation_ids'].search(operation_id):
+            continue
+
+        if tags & exclude['tags'] or method in exclude['methods']:
+            continue
+        if exclude['paths'] and exclude['paths'].match(path):
+            continue
+        if exclude['operation_ids'] and exclude['operation_ids'].search(operation_id):
+            continue
+
+        selected.append(tool)
+
+    return selected
+
+def extract_base_url(spec: Dict[str, Any]) -> str:
+    """Extract base URL from spec (prefer HTTPS over HTTP)."""
     base_url = ""
     if 'servers' in spec and spec['servers']:
         # Check all servers and prefer HTTPS URLs
@@ -282,6 +960,159 @@ def save_selected_tools(tools: List[Dict[str, Any]], spec: Dict[str, Any]):
         if host:
             base_url = f"{scheme}://{host}{base_path}"
 
+    return base_url
+
+def collect_local_refs(spec: Dict[str, Any], node: Any) -> Dict[str, Any]:
+    """Return every local $ref reachable from node, mapped to its target."""
+    refs: Dict[str, Any] = {}
+    pending = [node]
+
+    while pending:
+        current = pending.pop()
+        if isinstance(current, dict):
+            ref = current.get('$ref')
+            if isinstance(ref, str) and ref.startswith('#/') and ref not in refs:
+                target = resolve_local_ref(spec, ref)
+                refs[ref] = target
+                if target is not None:
+                    pending.append(target)
+            pending.extend(v for k, v in current.items() if k != '$ref')
+        elif isinstance(current, list):
+            pending.extend(current)
+
+    return refs
+
+def get_security_schemes(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Declared security schemes (OpenAPI 3 components or Swagger 2 securityDefinitions)."""
+    schemes = spec.get('components', {}).get('securitySchemes') or spec.get('securityDefinitions') or {}
+    return {name: scheme for name, scheme in schemes.items() if isinstance(scheme, dict)}
+
+def resolve_security(spec: Dict[str, Any], operation: Dict[str, Any]) -> List[Dict[str, List[str]]]:
+    """Effective security requirements of an operation.
+
+    An operation's own `security` replaces the global one. Each requirement is
+    an alternative; an empty requirement means the operation also works
+    without credentials. Requirements naming undeclared schemes are dropped.
+    """
+    security = operation.get('security', spec.get('security', []))
+    schemes = get_security_schemes(spec)
+    requirements = []
+    for requirement in security if isinstance(security, list) else []:
+        if isinstance(requirement, dict) and all(name in schemes for name in requirement):
+            requirements.append(requirement)
+    return requirements
+
+def get_key_scheme(schemes: Dict[str, Any], param: Dict[str, Any]) -> Optional[str]:
+    """Name of the apiKey scheme a parameter carries (same location and name), if any."""
+    for name, scheme in schemes.items():
+        if (scheme.get('type') == 'apiKey' and scheme.get('in') == param.get('in')
+                and str(scheme.get('name', '')).lower() == str(param.get('name', '')).lower()):
+            return name
+    return None
+
+def attach_security(spec: Dict[str, Any], tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Set each tool's effective `security` and return the schemes they use.
+
+    Operations that also declare an apiKey scheme's parameter get that scheme
+    as a requirement: always when the parameter is required, and as an
+    optional alternative when the operation declares no security of its own.
+    """
+    schemes = get_security_schemes(spec)
+    used = {}
+    for tool in tools:
+        security = resolve_security(spec, tool.get('operation', {}))
+        for param in tool.get('parameters', []):
+            name = get_key_scheme(schemes, param)
+            if name is None or any(name in requirement for requirement in security):
+                continue
+            if param.get('required'):
+                security = [{**requirement, name: []} for requirement in security] or [{name: []}]
+            elif not security:
+                security = [{name: []}, {}]
+        tool['security'] = security
+        for requirement in tool['security']:
+            for name in requirement:
+                used[name] = schemes[name]
+    return used
+
+def fingerprint_operation(spec: Dict[str, Any], tool: Dict[str, Any]) -> str:
+    """Hash an operation together with its path, method and resolved schemas.
+
+    Any change that would alter the generated tool (parameters, request body,
+    responses, descriptions or any schema they reference, however deeply)
+    changes the fingerprint, which lets `mcp-cookie-cutter update` regenerate
+    only the affected tools.
+    """
+    path_item = spec.get('paths', {}).get(tool['path'], {})
+    payload = {
+        'path': tool['path'],
+        'method': tool['method'],
+        'path_parameters': path_item.get('parameters', []),
+        'operation': tool.get('operation', {}),
+    }
+    # Global security and the scheme definitions change the tool's auth too
+    security = resolve_security(spec, payload['operation'])
+    schemes = get_security_schemes(spec)
+    payload['security'] = security
+    payload['security_schemes'] = {name: schemes[name] for requirement in security for name in requirement}
+    payload['refs'] = collect_local_refs(spec, payload)
+
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def prune_spec_for_models(spec: Dict[str, Any], tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Copy of the spec reduced to the schemas reachable from the selected tools.
+
+    Starting from each selected operation (and its path-level parameters), the
+    transitive closure of local $refs decides which `components` entries or
+    Swagger 2 `definitions` are kept. Whole entries are kept even when only a
+    part of one is referenced, so no model is generated from a partial schema.
+    """
+    kept: Dict[Tuple[str, ...], Any] = {}
+    pending: List[Any] = []
+    for tool in tools:
+        pending.append(spec.get('paths', {}).get(tool['path'], {}).get('parameters', []))
+        pending.append(tool.get('operation', {}))
+
+    while pending:
+        for ref in collect_local_refs(spec, pending.pop()):
+            parts = tuple(p.replace('~1', '/').replace('~0', '~') for p in ref[2:].split('/'))
+            # components/<section>/<name> or definitions/<name> (also Swagger 2 parameters/responses)
+            depth = 3 if parts[0] == 'components' else 2
+            key = parts[:depth]
+            if key in kept or len(key) < depth:
+                continue
+            entry = resolve_local_ref(spec, '#/' + '/'.join(k.replace('~', '~0').replace('/', '~1') for k in key))
+            if entry is None:
+                continue
+            kept[key] = entry
+            pending.append(entry)
+
+    pruned = {k: v for k, v in spec.items()
+              if k not in ('paths', 'components', 'definitions', 'parameters', 'responses')}
+    pruned['paths'] = {}
+    for key, entry in kept.items():
+        node = pruned
+        for part in key[:-1]:
+            node = node.setdefault(part, {})
+        node[key[-1]] = entry
+    return pruned
+
+def count_model_schemas(spec: Dict[str, Any]) -> int:
+    """Number of schemas datamodel-codegen generates models from."""
+    return len(spec.get('components', {}).get('schemas', {}) or {}) + len(spec.get('definitions', {}) or {})
+
+def save_selected_tools(tools: List[Dict[str, Any]], spec: Dict[str, Any],
+                        selection: Optional[Dict[str, Any]] = None):
+    """Save selected tools and spec to files for post-generation hook.
+
+    `selection` records how the tools were chosen ('all', 'rules' or 'manual')
+    so `mcp-cookie-cutter update` can repeat the same choice against a new spec.
+    """
+    import json
+
+    base_url = extract_base_url(spec)
+
     # Collect all schema references needed by selected tools
     schema_refs = set()
     for tool in tools:
@@ -289,33 +1120,54 @@ def save_selected_tools(tools: List[Dict[str, Any]], spec: Dict[str, Any]):
             schema_refs.add(tool['request_schema_ref'])
         for schema_ref in tool.get('response_schema_refs', {}).values():
             schema_refs.add(schema_ref)
+        tool['fingerprint'] = fingerprint_operation(spec, tool)
+
+    # Auth is generated from the declared schemes the selected tools require
+    security_schemes = attach_security(spec, tools)
 
     # Save tool selection data
     tool_data = {
         'base_url': base_url,
         'tools': tools,
+        'security_schemes': security_schemes,
+        'has_security_schemes': bool(get_security_schemes(spec)),
         'schema_refs': list(schema_refs),
-        'spec_version': spec.get('openapi') or spec.get('swagger', 'unknown')
+        'spec_version': spec.get('openapi') or spec.get('swagger', 'unknown'),
+        'selection': selection or {'mode': 'manual'},
     }
 
     with open('.openapi_tools.json', 'w') as f:
         json.dump(tool_data, f, indent=2)
 
-    # Save the full OpenAPI spec for datamodel-code-generator
+    # Save only the schemas the selected tools reach for datamodel-code-generator
+    model_spec = prune_spec_for_models(spec, tools)
+    total_schemas = count_model_schemas(spec)
+    if total_schemas:
+        print(f"   📐 Models: {count_model_schemas(model_spec)} of {total_schemas} schema(s) "
+              f"reachable from the selected tools")
     with open('.openapi_spec.json', 'w') as f:
-        json.dump(spec, f, indent=2)
+        json.dump(model_spec, f, indent=2)
 
 def show_openapi_info():
     """Show information about OpenAPI spec if provided."""
     openapi_spec_path = "{{ cookiecutter.openapi_spec_path }}"
+    validation_mode = "{{ cookiecutter.openapi_validation }}"
+    selection_rules = r"""{{ cookiecutter.tool_selection_rules }}"""
+
+    if validation_mode not in VALIDATION_MODES:
+        print(f"⚠️  Warning: Unknown openapi_validation '{validation_mode}', using 'full'")
+        validation_mode = 'full'
 
     if openapi_spec_path:
         print(f"\n📋 OpenAPI Specification: {openapi_spec_path}")
 
         # Try to parse the spec
-        spec = load_openapi_spec(openapi_spec_path)
+        entry = load_spec_entry(openapi_spec_path)
+        spec = entry['spec'] if entry else None
 
         if spec:
+            # Full validation overlaps with tool selection below
+            validation = start_spec_validation(entry, validation_mode)
             tools = extract_tools_from_spec(spec)
 
             if tools:
@@ -333,31 +1185,53 @@ def show_openapi_info():
 
                 print("-" * 70)
 
-                # Ask if user wants to select tools interactively
-                print("\n💡 Would you like to select which tools to implement now?")
-                print("   (You can always add more tools later using CUSTOMIZATION.md)")
-
-                try:
-                    choice = input("\nSelect tools interactively? [Y/n]: ").strip().lower()
-                except (EOFError, KeyboardInterrupt):
-                    # No input available (--no-input mode) or user cancelled
-                    # Default to selecting all tools
-                    print("n")
-                    choice = 'n'
-
-                if choice in ['', 'y', 'yes']:
+                rules = load_selection_rules(selection_rules)
+                if rules is not None:
+                    # Declarative rules replace the interactive prompt (e.g. CI with --no-input)
+                    choice = 'rules'
+                else:
+                    # Ask if user wants to select tools interactively
+                    print("\n💡 Would you like to select which tools to implement now?")
+                    print("   (You can always add more tools later using CUSTOMIZATION.md)")
+
+                    try:
+                        choice = input("\nSelect tools interactively? [Y/n]: ").strip().lower()
+                    except (EOFError, KeyboardInterrupt):
+                        # No input available (--no-input mode) or user cancelled
+                        # Default to selecting all tools
+                        print("n")
+                        choice = 'n'
+
+                interactive = choice in ['', 'y', 'yes', 'rules']
+                if choice == 'rules':
+                    selected_tools = apply_selection_rules(tools, rules)
+                    print(f"\n📐 Selection rules matched {len(selected_tools)} of {len(tools)} operation(s)")
+                elif interactive:
                     selected_tools = prompt_tool_selection(tools)
-                    if selected_tools:
-                        save_selected_tools(selected_tools, spec)
-                        print(f"\n✓ Will generate {len(selected_tools)} MCP tool(s)")
-                    else:
-                        print("\n⏭️  No tools selected. Use CUSTOMIZATION.md to add them later.")
                 else:
                     # Default to selecting all tools when not doing interactive selection
                     print("\n⏭️  Skipping interactive selection. Selecting all tools by default.")
-                    save_selected_tools(tools, spec)
-                    print(f"✓ Will generate all {len(tools)} MCP tool(s)")
+                    selected_tools = tools
+
+                report_spec_validation(entry, validation_mode, validation, selected_tools)
+
+                if choice == 'rules':
+                    selection = {'mode': 'rules', 'rules': rules}
+                elif selected_tools is tools:
+                    selection = {'mode': 'all'}
+                else:
+                    selection = {'mode': 'manual'}
+
+                if not selected_tools:
+                    print("\n⏭️  No tools selected. Use CUSTOMIZATION.md to add them later.")
+                elif interactive:
+                    save_selected_tools(selected_tools, spec, selection)
+                    print(f"\n✓ Will generate {len(selected_tools)} MCP tool(s)")
+                else:
+                    save_selected_tools(selected_tools, spec, selection)
+                    print(f"✓ Will generate all {len(selected_tools)} MCP tool(s)")
             else:
+                report_spec_validation(entry, validation_mode, validation, [])
                 print("   No API operations found in the spec.")
         else:
             print("   Could not parse OpenAPI spec - proceeding without tool suggestions.")
@@ -0,0 +1,85 @@
+"""Run several tool calls of this server inside one MCP call.
+
+Tools are looked up among the tool modules the server has loaded and called
+directly, so the calls share the pooled HTTP client and skip a round trip
+through the MCP client each. Arguments are validated and coerced against the
+tool's signature first, as FastMCP does for a direct call ("5" becomes 5 for
+an int parameter, a missing argument is reported by name). Each call's result
+is bounded by its own tool; the batch as a whole is bounded again by
+OUTPUT_MAX_BYTES (see output.py), so one batch returns no more than one tool
+call could.
+"""
+
+import asyncio
+import os
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Dict, List
+
+from pydantic import TypeAdapter, ValidationError
+
+from .output import guard_output
+
+# Calls of one batch that run at the same time, and calls accepted per batch
+BATCH_CONCURRENCY = max(1, int(os.getenv("BATCH_CONCURRENCY", "8")))
+BATCH_MAX_CALLS = int(os.getenv("BATCH_MAX_CALLS", "100"))
+
+
+def resolve_tool(package: str, name: str) -> Callable[..., Any]:
+    """Find the function of tool `name` in the loaded `<package>.tools` modules."""
+    module = sys.modules.get(f"{package}.tools.{name}")
+    tool = getattr(module, name, None) if module is not None else None
+    if tool is None:
+        raise ValueError(f"Unknown tool: {name}")
+    # Some FastMCP versions return a Tool object from @mcp.tool()
+    return getattr(tool, "fn", tool)
+
+
+@lru_cache(maxsize=None)
+def get_call_adapter(tool: Callable[..., Any]) -> TypeAdapter:
+    """Validator of a tool's arguments that calls the tool with the validated values."""
+    return TypeAdapter(tool)
+
+
+def describe_validation_error(error: ValidationError) -> str:
+    """One line naming each invalid argument, e.g. "limit: Input should be a valid integer"."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in problem['loc'])}: {problem['msg']}" for problem in error.errors()
+    )
+
+
+async def run_batch(package: str, calls: List[Dict[str, Any]], exclude: str = "") -> Any:
+    """Run `calls` concurrently and return one result or error per call, in order.
+
+    Once OUTPUT_MAX_BYTES is used up, the result that crosses it is cut short
+    and the later entries are replaced by a "[showing N of M items]" note.
+    """
+    if len(calls) > BATCH_MAX_CALLS:
+        raise ValueError(f"A batch takes at most {BATCH_MAX_CALLS} calls, got {len(calls)}")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run(call: Dict[str, Any]) -> Dict[str, Any]:
+        name = call.get("tool", "") if isinstance(call, dict) else ""
+        try:
+            if not name or name == exclude:
+                raise ValueError(f"Invalid tool: {name!r}")
+            tool = resolve_tool(package, name)
+            arguments = call.get("arguments") or {}
+            if not isinstance(arguments, dict):
+                raise ValueError("arguments must be an object")
+            async with semaphore:
+                try:
+                    pending = get_call_adapter(tool).validate_python(arguments)
+                except ValidationError as e:
+                    return {"tool": name, "error": f"Invalid arguments: {describe_validation_error(e)}"}
+                result = await pending
+            return {"tool": name, "result": result}
+        except Exception as e:
+            message = str(e).splitlines()[0] if str(e) else ""
+            return {"tool": name, "error": f"{type(e).__name__}: {message}"}
+
+    results = await asyncio.gather(*(run(call) for call in calls))
+    # Results were already cut to the item and string limits by their tools
+    # (compact JSON results are strings), so only the byte budget applies here
+    return guard_output(list(results), max_items=len(results), max_string_chars=0)
@@ -0,0 +1,145 @@
+"""Binary responses: images, files and other content that is not text.
+
+Such responses are returned as MCP content instead of being decoded as text:
+images as ImageContent, anything else as an EmbeddedResource holding a blob.
+Both carry the body base64-encoded, which MCP requires.
+
+- Tools whose spec declares a binary response stream it into a
+  SpooledTemporaryFile, which moves to disk past BINARY_SPOOL_BYTES
+  (default 1 MiB), so the raw body is never held in memory in full.
+- Other tools check the Content-Type of their buffered response, so an
+  unexpected image is not decoded as text either.
+
+BINARY_MAX_BYTES (default 5 MiB) bounds a body; larger ones are refused,
+before the download when the response announces its Content-Length. The body
+is base64-encoded in chunks straight from the spool or buffer, so no second
+copy of the raw bytes is made.
+"""
+
+import asyncio
+import binascii
+import io
+import os
+import tempfile
+from functools import lru_cache
+from typing import Any, BinaryIO, Union
+
+import httpx
+from mcp.types import BlobResourceContents, EmbeddedResource, ImageContent
+
+from .compression import record_response
+
+MAX_BYTES = int(os.getenv("BINARY_MAX_BYTES", str(5 * 1024 * 1024)))
+SPOOL_BYTES = int(os.getenv("BINARY_SPOOL_BYTES", str(1024 * 1024)))
+
+# Bytes base64-encoded at a time; a multiple of 3, so the chunks concatenate
+ENCODE_CHUNK_BYTES = 3 * 64 * 1024
+
+# application/* types that carry text
+TEXT_APPLICATION_TYPES = frozenset((
+    "json", "xml", "javascript", "ecmascript", "x-www-form-urlencoded", "x-ndjson", "yaml", "x-yaml",
+    "graphql", "sql", "csv",
+))
+
+BinaryContent = Union[ImageContent, EmbeddedResource]
+
+
+@lru_cache(maxsize=128)
+def is_binary_type(content_type: str) -> bool:
+    """Whether a Content-Type is binary, e.g. image/png or application/octet-stream."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    main, _, sub = media_type.partition("/")
+    if main in ("image", "audio", "video", "font"):
+        return True
+    if main != "application":
+        return False
+    # application/problem+json, application/atom+xml, ...
+    suffix = sub.rsplit("+", 1)[-1]
+    return sub not in TEXT_APPLICATION_TYPES and suffix not in TEXT_APPLICATION_TYPES
+
+
+def is_binary(response: httpx.Response) -> bool:
+    """Whether a response carries binary content, by its Content-Type."""
+    content_type = response.headers.get("content-type")
+    return content_type is not None and is_binary_type(content_type)
+
+
+def check_size(size: int, response: httpx.Response) -> None:
+    if MAX_BYTES > 0 and size > MAX_BYTES:
+        raise ValueError(
+            f"{response.headers.get('content-type')} response of {size:,} bytes from {response.url} "
+            f"exceeds BINARY_MAX_BYTES ({MAX_BYTES:,})"
+        )
+
+
+def encode_base64(source: BinaryIO) -> str:
+    """Base64 of everything left in `source`, encoded chunk by chunk.
+
+    The chunks are encoded into one buffer of the exact encoded size, so the
+    only other copy is the str the MCP content types take.
+    """
+    start = source.tell()
+    size = source.seek(0, os.SEEK_END) - start
+    source.seek(start)
+
+    encoded = bytearray(-(-size // 3) * 4)
+    with memoryview(encoded) as view:
+        position = 0
+        while True:
+            chunk = source.read(ENCODE_CHUNK_BYTES)
+            if not chunk:
+                break
+            end = position + -(-len(chunk) // 3) * 4
+            view[position:end] = binascii.b2a_base64(chunk, newline=False)
+            position = end
+    return encoded.decode("ascii")
+
+
+def to_content(response: httpx.Response, source: BinaryIO) -> BinaryContent:
+    """The MCP content of a binary response whose body is in `source`."""
+    mime_type = response.headers.get("content-type", "application/octet-stream").split(";", 1)[0].strip()
+    data = encode_base64(source)
+    if mime_type.startswith("image/"):
+        return ImageContent(type="image", data=data, mimeType=mime_type)
+    return EmbeddedResource(
+        type="resource",
+        resource=BlobResourceContents(uri=str(response.url), mimeType=mime_type, blob=data),
+    )
+
+
+def binary_content(response: httpx.Response) -> BinaryContent:
+    """MCP content of a buffered binary response."""
+    check_size(len(response.content), response)
+    # A BytesIO over bytes shares their buffer instead of copying it
+    return to_content(response, io.BytesIO(response.content))
+
+
+async def _spool(response: httpx.Response, spool: Any) -> int:
+    size = 0
+    async for chunk in response.aiter_bytes():
+        size += len(chunk)
+        check_size(size, response)
+        spool.write(chunk)
+    return size
+
+
+async def read_binary(response: httpx.Response, client: Any) -> BinaryContent:
+    """MCP content of a streamed binary response, spooled to disk if large.
+
+    The download is bounded by what is left of the deadline of the tool call
+    (the ToolClient `client`).
+    """
+    length = response.headers.get("content-length")
+    if length is not None and length.isdigit():
+        check_size(int(length), response)
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) as spool:
+        try:
+            size = await asyncio.wait_for(_spool(response, spool), max(client.remaining(), 0))
+        except asyncio.TimeoutError:
+            raise httpx.TimeoutException(
+                f"Downloading {response.url} exceeded the tool call's {client.timeouts['total']}s deadline"
+            ) from None
+        record_response(response, size)
+        spool.seek(0)
+        return to_content(response, spool)
@@ -0,0 +1,263 @@
+"""Response cache for the GET requests of the generated tools.
+
+RESPONSE_CACHE selects the backend (default "off"):
+
+- "memory": an LRU cache in each server process, bounded by
+  RESPONSE_CACHE_MAX_ENTRIES (default 1024) and RESPONSE_CACHE_MAX_BYTES
+- "sqlite": a SQLite database in WAL mode at RESPONSE_CACHE_PATH (default in
+  $XDG_CACHE_HOME/<package>, or ~/.cache/<package>), shared by every worker
+  process on the host and kept across restarts. Its directory is created
+  private to the user (0700), the file readable by the user only (0600), and
+  a file owned by another user is refused. Reads go through a memory map of
+  the file. Expired entries are dropped, and the oldest ones once the stored
+  bodies exceed RESPONSE_CACHE_MAX_BYTES (default 64 MiB).
+- "package.module:ClassName": any other ResponseCache subclass, e.g. a stand-in
+  for a networked cache
+
+Successful (200) responses are kept for RESPONSE_CACHE_TTL seconds (default
+60), or less if their Cache-Control says so; "no-store", "no-cache" and
+"private" responses are not cached. Entries are keyed by a hash of the URL,
+the query parameters and the request headers, so callers with different
+credentials never share an entry. CACHE_METRICS counts hits and misses.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+BACKEND = os.getenv("RESPONSE_CACHE", "off").strip()
+TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+PACKAGE = __name__.split(".")[0]
+PATH = os.getenv("RESPONSE_CACHE_PATH") or os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), PACKAGE, "responses.sqlite3"
+)
+
+# Cache-Control directives that keep a response out of the cache
+NO_STORE_RE = re.compile(r"no-store|no-cache|private", re.IGNORECASE)
+MAX_AGE_RE = re.compile(r"max-age=(\d+)", re.IGNORECASE)
+# Headers that describe the encoded body, which is stored decoded
+SKIPPED_HEADERS = frozenset(("content-encoding", "content-length", "transfer-encoding", "set-cookie"))
+
+CACHE_METRICS = {"hits": 0, "misses": 0, "stores": 0}
+
+# Status, headers and body of a cached response
+Entry = Tuple[int, List[Tuple[str, str]], bytes]
+
+
+class ResponseCache(ABC):
+    """A response cache backend."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Entry]:
+        """The entry stored under `key`, or None if there is no fresh one."""
+
+    @abstractmethod
+    def set(self, key: str, entry: Entry, ttl: float) -> None:
+        """Store `entry` under `key` for `ttl` seconds."""
+
+
+class MemoryCache(ResponseCache):
+    """Least recently used entries of this process, bounded by count and body bytes."""
+
+    def __init__(self) -> None:
+        self.entries: "OrderedDict[str, Tuple[float, Entry]]" = OrderedDict()
+        self.size = 0
+
+    def get(self, key: str) -> Optional[Entry]:
+        item = self.entries.get(key)
+        if item is None:
+            return None
+        expires, entry = item
+        if expires <= time.monotonic():
+            self.remove(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def remove(self, key: str) -> None:
+        _, entry = self.entries.pop(key)
+        self.size -= len(entry[2])
+
+    def set(self, key: str, entry: Entry, ttl: float) -> None:
+        if len(entry[2]) > MAX_BYTES:
+            return
+        if key in self.entries:
+            self.remove(key)
+        self.entries[key] = (time.monotonic() + ttl, entry)
+        self.size += len(entry[2])
+        while len(self.entries) > MAX_ENTRIES or self.size > MAX_BYTES:
+            self.remove(next(iter(self.entries)))
+
+
+class SQLiteCache(ResponseCache):
+    """Entries in a SQLite file shared by the worker processes of this host."""
+
+    # Stores between two prunes of expired and excess entries
+    PRUNE_EVERY = 64
+
+    def __init__(self, path: str = PATH) -> None:
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.local = threading.local()
+        self.stores = 0
+        create_private_file(self.path)
+
+    def connection(self) -> sqlite3.Connection:
+        # One connection per thread and process (workers may be forked)
+        connection = getattr(self.local, "connection", None)
+        if connection is None or self.local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=0.05, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={max(MAX_BYTES, 0)}")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, expires REAL, stored REAL, size INTEGER,"
+                " status INTEGER, headers TEXT, body BLOB)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_stored ON responses (stored)")
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Optional[Entry]:
+        row = self.connection().execute(
+            "SELECT status, headers, body FROM responses WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], [tuple(header) for header in json.loads(row[1])], row[2]
+
+    def set(self, key: str, entry: Entry, ttl: float) -> None:
+        status, headers, body = entry
+        if len(body) > MAX_BYTES:
+            return
+        now = time.time()
+        connection = self.connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, now + ttl, now, len(body), status, json.dumps(headers), body),
+        )
+        self.stores += 1
+        if self.stores % self.PRUNE_EVERY == 1:
+            self.prune(connection, now)
+
+    def prune(self, connection: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then the oldest ones while the bodies exceed MAX_BYTES."""
+        connection.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+        excess = (connection.execute("SELECT SUM(size) FROM responses").fetchone()[0] or 0) - MAX_BYTES
+        if excess > 0:
+            connection.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM ("
+                " SELECT key, SUM(size) OVER (ORDER BY stored) AS running FROM responses"
+                ") WHERE running - size < ?)",
+                (excess,),
+            )
+
+
+def create_private_file(path: str) -> None:
+    """Create the database file readable by this user only, refusing one owned by another user.
+
+    The cache holds responses fetched with the server's credentials, so other
+    local users must neither read it nor plant entries in it.
+    """
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+    os.close(fd)
+    getuid = getattr(os, "getuid", None)
+    if getuid is None:  # Windows: no owner to compare
+        return
+    # SQLite creates the WAL and shared-memory files next to the database
+    for name in (path, path + "-wal", path + "-shm"):
+        try:
+            owner = os.lstat(name).st_uid
+        except FileNotFoundError:
+            continue
+        if owner != getuid():
+            raise PermissionError(f"Response cache file {name} is owned by another user; set RESPONSE_CACHE_PATH")
+
+
+BACKENDS = {
+    "memory": MemoryCache,
+    "sqlite": SQLiteCache,
+}
+
+_cache: Optional[ResponseCache] = None
+_cache_loaded = False
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """The configured cache backend, or None when caching is off."""
+    global _cache, _cache_loaded
+    if not _cache_loaded:
+        _cache_loaded = True
+        if BACKEND.lower() not in ("", "off", "none", "0", "false"):
+            if ":" in BACKEND:
+                module_name, class_name = BACKEND.split(":", 1)
+                _cache = getattr(importlib.import_module(module_name), class_name)()
+            else:
+                _cache = BACKENDS[BACKEND.lower()]()
+            logger.info(f"Response cache: {BACKEND} (TTL {TTL:g}s)")
+    return _cache
+
+
+def cache_key(url: Any, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]]) -> str:
+    """Hash of what identifies a GET request, credentials included."""
+    material = json.dumps(
+        [str(url), sorted((params or {}).items()), sorted((headers or {}).items())], default=str
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def lookup(cache: ResponseCache, key: str, url: Any) -> Optional[httpx.Response]:
+    """The cached response for `key`, if there is a fresh one."""
+    try:
+        entry = cache.get(key)
+    except sqlite3.Error as e:
+        # A busy or unavailable cache is a miss, never a failed tool call
+        logger.debug(f"Response cache read failed: {e}")
+        entry = None
+    if entry is None:
+        CACHE_METRICS["misses"] += 1
+        return None
+    CACHE_METRICS["hits"] += 1
+    status, headers, body = entry
+    return httpx.Response(status, headers=headers, content=body, request=httpx.Request("GET", url))
+
+
+def store(cache: ResponseCache, key: str, response: httpx.Response) -> None:
+    """Keep a successful response for TTL seconds, unless its Cache-Control forbids it."""
+    if response.status_code != 200:
+        return
+    ttl = TTL
+    cache_control = response.headers.get("cache-control")
+    if cache_control:
+        if NO_STORE_RE.search(cache_control):
+            return
+        max_age = MAX_AGE_RE.search(cache_control)
+        if max_age:
+            ttl = min(ttl, float(max_age.group(1)))
+    if ttl <= 0:
+        return
+    headers = [(name, value) for name, value in response.headers.items() if name.lower() not in SKIPPED_HEADERS]
+    try:
+        cache.set(key, (response.status_code, headers, response.content), ttl)
+        CACHE_METRICS["stores"] += 1
+    except sqlite3.Error as e:
+        logger.debug(f"Response cache write failed: {e}")
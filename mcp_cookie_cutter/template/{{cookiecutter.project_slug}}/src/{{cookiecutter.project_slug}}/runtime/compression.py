@@ -0,0 +1,136 @@
+"""Content encodings of upstream requests and responses.
+
+Responses: httpx decodes gzip and deflate, and also br and zstd when brotli
+and zstandard are installed (the `compression` extra). The shared client
+advertises exactly the encodings it can decode; UPSTREAM_ACCEPT_ENCODING
+replaces that list, e.g. "identity" to ask for uncompressed responses.
+
+Requests: UPSTREAM_REQUEST_COMPRESSION chooses when JSON bodies of at least
+UPSTREAM_COMPRESS_MIN_BYTES (default 8 KiB) are compressed:
+
+- "auto" (default): only for operations whose spec declares an encoding,
+  through `x-mcp-request-compression` or a `Content-Encoding` header enum
+- "gzip", "deflate", "br" or "zstd": for every tool that sends a JSON body
+- "off": never
+
+A server that answers a compressed request with 415 Unsupported Media Type
+gets that request again uncompressed, and no compressed requests afterwards.
+
+TRANSFER_METRICS counts the bytes on the wire against the decoded bytes in
+both directions; see get_transfer_metrics().
+"""
+
+import gzip
+import json
+import logging
+import os
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Set
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+ACCEPT_ENCODING = os.getenv("UPSTREAM_ACCEPT_ENCODING", "")
+REQUEST_COMPRESSION = os.getenv("UPSTREAM_REQUEST_COMPRESSION", "auto").lower()
+COMPRESS_MIN_BYTES = int(os.getenv("UPSTREAM_COMPRESS_MIN_BYTES", "8192"))
+
+
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": gzip.compress,
+    "deflate": zlib.compress,
+}
+try:
+    import brotli
+
+    COMPRESSORS["br"] = lambda data: brotli.compress(data, quality=5)
+except ImportError:
+    pass
+try:
+    import zstandard
+
+    COMPRESSORS["zstd"] = zstandard.ZstdCompressor(level=3).compress
+except ImportError:
+    pass
+
+TRANSFER_METRICS = {
+    "responses": 0,
+    "response_wire_bytes": 0,
+    "response_bytes": 0,
+    "compressed_requests": 0,
+    "request_wire_bytes": 0,
+    "request_bytes": 0,
+}
+
+# Hosts that rejected a compressed request body
+_uncompressed_hosts: Set[str] = set()
+
+
+def client_headers() -> Dict[str, str]:
+    """Default headers of the shared client (empty unless UPSTREAM_ACCEPT_ENCODING is set)."""
+    return {"Accept-Encoding": ACCEPT_ENCODING} if ACCEPT_ENCODING else {}
+
+
+@lru_cache(maxsize=None)
+def resolve_request_encoding(spec_encoding: Optional[str] = None) -> Optional[str]:
+    """The encoding for a tool's request bodies, or None to send them as is."""
+    if REQUEST_COMPRESSION in ("off", "none", "identity", ""):
+        return None
+    encoding = spec_encoding if REQUEST_COMPRESSION == "auto" else REQUEST_COMPRESSION
+    if encoding is not None and encoding not in COMPRESSORS:
+        logger.warning(f"Request compression {encoding!r} is unavailable, sending bodies uncompressed")
+        return None
+    return encoding
+
+
+def compress_json_body(kwargs: Dict[str, Any], encoding: str, url: Any) -> Dict[str, Any]:
+    """Request arguments with the `json` body serialized and compressed, if worth it.
+
+    Returns `kwargs` itself when the body is too small or the host has
+    rejected compressed bodies before.
+    """
+    if urlsplit(str(url)).netloc in _uncompressed_hosts:
+        return kwargs
+    # Serialized the way httpx does it
+    body = json.dumps(kwargs["json"], ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+    if len(body) < COMPRESS_MIN_BYTES:
+        return kwargs
+
+    compressed = COMPRESSORS[encoding](body)
+    TRANSFER_METRICS["compressed_requests"] += 1
+    TRANSFER_METRICS["request_bytes"] += len(body)
+    TRANSFER_METRICS["request_wire_bytes"] += len(compressed)
+
+    encoded = {key: value for key, value in kwargs.items() if key != "json"}
+    encoded["content"] = compressed
+    encoded["headers"] = {
+        **(kwargs.get("headers") or {}),
+        "Content-Type": "application/json",
+        "Content-Encoding": encoding,
+    }
+    return encoded
+
+
+def disable_request_compression(url: Any) -> None:
+    """Stop compressing request bodies sent to the host of `url`."""
+    host = urlsplit(str(url)).netloc
+    logger.info(f"{host} rejected a compressed request body, sending uncompressed bodies from now on")
+    _uncompressed_hosts.add(host)
+
+
+def record_response(response: httpx.Response, decoded_bytes: Optional[int] = None) -> None:
+    """Count a read response's bytes on the wire and after decoding (`decoded_bytes` for a streamed one)."""
+    TRANSFER_METRICS["responses"] += 1
+    TRANSFER_METRICS["response_wire_bytes"] += response.num_bytes_downloaded
+    TRANSFER_METRICS["response_bytes"] += len(response.content) if decoded_bytes is None else decoded_bytes
+
+
+def get_transfer_metrics() -> Dict[str, Any]:
+    """A snapshot of TRANSFER_METRICS, with the compression ratio of each direction."""
+    metrics: Dict[str, Any] = dict(TRANSFER_METRICS)
+    for direction in ("response", "request"):
+        decoded = metrics[f"{direction}_bytes"]
+        metrics[f"{direction}_ratio"] = round(metrics[f"{direction}_wire_bytes"] / decoded, 3) if decoded else None
+    return metrics
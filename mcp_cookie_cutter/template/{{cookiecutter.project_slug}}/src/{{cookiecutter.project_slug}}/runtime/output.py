@@ -0,0 +1,102 @@
+"""Output guard: bound the size of what a tool returns to the MCP client.
+
+Upstream responses can be far larger than a client's context window. Every
+tool passes its result through guard_output(), which in one pass over the
+data applies these limits (0 disables a limit):
+
+- OUTPUT_MAX_ITEMS (default 100): arrays keep their first items, followed by
+  a note such as "[showing 100 of 10,000 items]"
+- OUTPUT_MAX_STRING_CHARS (default 4000): longer strings are cut, ending in
+  "… [N more characters]"
+- OUTPUT_MAX_BYTES (default 200000): once about this many bytes of JSON have
+  been produced, the remaining array items and object fields are left out and
+  counted instead ("[showing 40 of 10,000 items]", "…": "12 more fields")
+
+The pass stops descending once a limit is hit, so its cost follows the size
+of the output, not the size of the response. With OUTPUT_COMPACT_JSON=true
+the result is returned as compact JSON text instead of the client's default
+(indented) serialization.
+"""
+
+import json
+import os
+from typing import Any, Optional
+
+MAX_BYTES = int(os.getenv("OUTPUT_MAX_BYTES", "200000"))
+MAX_ITEMS = int(os.getenv("OUTPUT_MAX_ITEMS", "100"))
+MAX_STRING_CHARS = int(os.getenv("OUTPUT_MAX_STRING_CHARS", "4000"))
+COMPACT_JSON = os.getenv("OUTPUT_COMPACT_JSON", "false").lower() in ("1", "true", "yes")
+
+# Key of the note that replaces the omitted fields of an object
+OMITTED_FIELDS_KEY = "…"
+
+
+class _Guard:
+    """One pass over a JSON value, with the byte budget it has left."""
+
+    def __init__(self, max_bytes: int, max_items: int, max_string: int):
+        self.left = max_bytes if max_bytes > 0 else float("inf")
+        self.max_items = max_items
+        self.max_string = max_string
+
+    def string(self, value: str) -> str:
+        limit = self.max_string if self.max_string > 0 else len(value)
+        if limit > self.left:
+            limit = max(int(self.left), 0)
+        if len(value) > limit:
+            value = f"{value[:limit]}… [{len(value) - limit:,} more characters]"
+        self.left -= len(value) + 2
+        return value
+
+    def walk(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self.string(value)
+        if isinstance(value, dict):
+            return self.object(value)
+        if isinstance(value, list):
+            return self.array(value)
+        # Numbers, booleans and null
+        self.left -= 6
+        return value
+
+    def object(self, value: dict) -> dict:
+        self.left -= 2
+        out = {}
+        for index, (key, item) in enumerate(value.items()):
+            if self.left <= 0:
+                out[OMITTED_FIELDS_KEY] = f"{len(value) - index:,} more fields"
+                break
+            self.left -= len(key) + 4
+            out[key] = self.walk(item)
+        return out
+
+    def array(self, value: list) -> list:
+        self.left -= 2
+        total = len(value)
+        limit = total if self.max_items <= 0 else min(total, self.max_items)
+        out = []
+        for index in range(limit):
+            if self.left <= 0:
+                break
+            out.append(self.walk(value[index]))
+            self.left -= 2
+        if len(out) < total:
+            out.append(f"[showing {len(out):,} of {total:,} items]")
+        return out
+
+
+def guard_output(data: Any, max_items: Optional[int] = None, max_string_chars: Optional[int] = None) -> Any:
+    """`data` within the output limits, as compact JSON text if configured.
+
+    `max_items` raises the array limit, for tools whose caller asked for
+    that many items (pagination's `max_items`). `max_string_chars` replaces
+    OUTPUT_MAX_STRING_CHARS (0 leaves strings to the byte budget alone).
+    """
+    items = MAX_ITEMS
+    if max_items is not None and items > 0:
+        items = max(items, max_items)
+    max_string = MAX_STRING_CHARS if max_string_chars is None else max_string_chars
+    data = _Guard(MAX_BYTES, items, max_string).walk(data)
+    if COMPACT_JSON:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return data
@@ -0,0 +1,108 @@
+"""Response projection: keep only the requested fields of a JSON response.
+
+Fields are dotted paths such as "id,name,owner.name". A leading "$." and
+array markers ("items[*].id", "items[].id") are accepted and ignored: arrays
+are transparent, so a projection applies to every element. "*" (or an empty
+projection) returns the whole response.
+
+With the C backend of ijson installed, the projection is applied while the
+response is parsed: top-level elements are built and projected one at a time,
+so the unprojected response is never held in memory. Otherwise the response
+is parsed with json.loads and projected afterwards.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Union
+
+try:
+    import ijson
+
+    # The pure-Python ijson backend is slower than json.loads plus a projection
+    STREAMING = ijson.backend in ("yajl2_c", "yajl2_cffi")
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+    STREAMING = False
+
+# Below this size json.loads plus a projection is faster than streaming
+STREAMING_MIN_BYTES = 64 * 1024
+
+# A projection tree maps keys to sub-trees; None keeps the whole value
+FieldTree = Optional[Dict[str, Any]]
+
+
+def _split_fields(fields: Union[str, Iterable[str]]) -> tuple:
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    return tuple(field.strip() for field in fields if field and field.strip())
+
+
+@lru_cache(maxsize=256)
+def _build_tree(paths: tuple) -> FieldTree:
+    if not paths or "*" in paths or "$" in paths:
+        return None
+
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        if path.startswith("$"):
+            path = path[1:].lstrip(".")
+        parts = [part.replace("[*]", "").replace("[]", "") for part in path.split(".")]
+        parts = [part for part in parts if part]
+        if not parts:
+            return None
+
+        node = tree
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                break  # A shorter path already keeps this whole subtree
+            node = node.setdefault(part, child)
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def parse_fields(fields: Union[str, Iterable[str], None]) -> FieldTree:
+    """Parse a projection into a field tree (None means keep everything)."""
+    if fields is None:
+        return None
+    return _build_tree(_split_fields(fields))
+
+
+def project(data: Any, tree: FieldTree) -> Any:
+    """Apply a field tree to already-parsed JSON data."""
+    if tree is None:
+        return data
+    if isinstance(data, list):
+        return [project(item, tree) for item in data]
+    if isinstance(data, dict):
+        return {key: project(value, tree[key]) for key, value in data.items() if key in tree}
+    return data
+
+
+def _load_streaming(content: bytes, tree: Dict[str, Any]) -> Any:
+    # Build one top-level element (or member) at a time in C and project it
+    # straight away, so the full response never exists as Python objects
+    start = content.lstrip()[:1]
+    if start == b"[":
+        return [project(item, tree) for item in ijson.items(content, "item", use_float=True)]
+    if start == b"{":
+        return {
+            key: project(value, tree[key])
+            for key, value in ijson.kvitems(content, "", use_float=True)
+            if key in tree
+        }
+    return json.loads(content)
+
+
+def load_json(content: bytes, fields: Union[str, Iterable[str], None] = None) -> Any:
+    """Parse a JSON response body, keeping only `fields` when given."""
+    tree = parse_fields(fields)
+    if tree is None:
+        return json.loads(content)
+    if STREAMING and len(content) >= STREAMING_MIN_BYTES:
+        try:
+            return _load_streaming(content, tree)
+        except ijson.JSONError as e:
+            raise ValueError(str(e)) from e
+    return project(json.loads(content), tree)
@@ -0,0 +1,156 @@
+"""Credentials of the upstream API's security schemes.
+
+The generator records the spec's security schemes in security_schemes.py and
+each tool's security requirements in its SECURITY constant. One injector per
+scheme reads its environment variables once and adds the credential to the
+requests of every tool that needs it:
+
+- apiKey: a header, query parameter or cookie, e.g. X_API_KEY
+- http bearer: an `Authorization: Bearer` header from <SCHEME>_TOKEN
+- http basic: an `Authorization: Basic` header from <SCHEME>_USERNAME and <SCHEME>_PASSWORD
+- oauth2 / openIdConnect: <SCHEME>_TOKEN, or a client-credentials token from
+  runtime/upstream_auth.py (the scheme's tokenUrl unless UPSTREAM_OAUTH_TOKEN_URL is set)
+
+A tool uses the first of its requirements whose credentials are all set.
+Credentials the caller passed as parameters are never replaced.
+"""
+
+import base64
+import os
+from typing import Any, Dict, Sequence
+
+from ..security_schemes import SCHEMES
+from .upstream_auth import get_token_provider
+
+
+class Injector:
+    """Adds the credential of one security scheme to a request."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.values = [os.getenv(name, "") for name in config.get("env", [])]
+
+    def configured(self) -> bool:
+        return all(self.values)
+
+    def present(self, headers: Dict[str, str], params: Dict[str, Any]) -> bool:
+        return False
+
+    async def apply(self, headers: Dict[str, str], params: Dict[str, Any]) -> None:
+        pass  # Schemes without a credential (e.g. "noauth") send the request as is
+
+
+def has_header(headers: Dict[str, str], name: str) -> bool:
+    name = name.lower()
+    return any(key.lower() == name for key in headers)
+
+
+class ApiKeyInjector(Injector):
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.location = config["in"]
+        self.name = config["name"]
+
+    def present(self, headers: Dict[str, str], params: Dict[str, Any]) -> bool:
+        if self.location == "query":
+            return self.name in params
+        if self.location == "cookie":
+            cookies = headers.get("Cookie", "").split(";")
+            return any(cookie.split("=", 1)[0].strip() == self.name for cookie in cookies)
+        return has_header(headers, self.name)
+
+    async def apply(self, headers: Dict[str, str], params: Dict[str, Any]) -> None:
+        if self.present(headers, params):
+            return
+        if self.location == "query":
+            params[self.name] = self.values[0]
+        elif self.location == "cookie":
+            cookie = f"{self.name}={self.values[0]}"
+            headers["Cookie"] = f"{headers['Cookie']}; {cookie}" if headers.get("Cookie") else cookie
+        else:
+            headers[self.name] = self.values[0]
+
+
+class BearerInjector(Injector):
+    """Static bearer tokens, or OAuth client-credentials tokens when configured."""
+
+    def configured(self) -> bool:
+        return bool(self.values[0]) or get_token_provider(self.config.get("token_url", "")) is not None
+
+    def present(self, headers: Dict[str, str], params: Dict[str, Any]) -> bool:
+        return has_header(headers, "Authorization")
+
+    async def apply(self, headers: Dict[str, str], params: Dict[str, Any]) -> None:
+        if self.present(headers, params):
+            return
+        token = self.values[0]
+        if not token:
+            provider = get_token_provider(self.config.get("token_url", ""))
+            token = await provider.get_token()
+        headers["Authorization"] = f"Bearer {token}"
+
+
+class BasicInjector(Injector):
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        # Encoded once; the password may be empty
+        credentials = base64.b64encode(f"{self.values[0]}:{self.values[1]}".encode()).decode()
+        self.header = f"Basic {credentials}"
+
+    def configured(self) -> bool:
+        return bool(self.values[0])
+
+    def present(self, headers: Dict[str, str], params: Dict[str, Any]) -> bool:
+        return has_header(headers, "Authorization")
+
+    async def apply(self, headers: Dict[str, str], params: Dict[str, Any]) -> None:
+        if not self.present(headers, params):
+            headers["Authorization"] = self.header
+
+
+INJECTOR_TYPES = {
+    "apiKey": ApiKeyInjector,
+    "bearer": BearerInjector,
+    "oauth2": BearerInjector,
+    "basic": BasicInjector,
+}
+
+_injectors: Dict[str, Injector] = {}
+
+
+def get_injector(scheme_name: str) -> Injector:
+    """The shared injector of a security scheme, built on first use."""
+    injector = _injectors.get(scheme_name)
+    if injector is None:
+        config = SCHEMES.get(scheme_name, {"type": "none"})
+        injector = INJECTOR_TYPES.get(config["type"], Injector)(config)
+        _injectors[scheme_name] = injector
+    return injector
+
+
+def describe_requirement(requirement: Sequence[str]) -> str:
+    """Environment variables that satisfy a requirement, for error messages."""
+    names = []
+    for scheme_name in requirement:
+        config = SCHEMES.get(scheme_name, {})
+        names.extend(config.get("env", []))
+        if config.get("type") == "oauth2":
+            names[-1] += " (or UPSTREAM_OAUTH_CLIENT_ID/UPSTREAM_OAUTH_CLIENT_SECRET)"
+    return " + ".join(names) or "no credentials"
+
+
+async def apply_security(requirements: Sequence[Sequence[str]], headers: Dict[str, str], params: Dict[str, Any]) -> None:
+    """Add the credentials of the first requirement that can be met to a request.
+
+    Each requirement lists the schemes that must all be applied; an empty one
+    means the operation also works without credentials.
+    """
+    for requirement in requirements:
+        injectors = [get_injector(scheme_name) for scheme_name in requirement]
+        if all(injector.present(headers, params) or injector.configured() for injector in injectors):
+            for injector in injectors:
+                await injector.apply(headers, params)
+            return
+    if requirements:
+        options = " or ".join(describe_requirement(requirement) for requirement in requirements)
+        raise ValueError(f"Upstream API credentials required: set {options}")
@@ -0,0 +1,75 @@
+"""XML responses converted to JSON-like data.
+
+Tools of operations that answer only in XML parse their responses with
+parse_xml(). The document becomes nested dicts:
+
+- the root element is the only key of the result, {"pet": {...}}
+- child elements become keys; repeated ones become lists
+- attributes become "@name" keys, and an element's text sits next to them
+  (or next to child elements) as "#text"
+- an element with only text becomes that string, an empty one None
+- namespaces are dropped from names
+
+The document is parsed by lxml when it is installed (the `xml` extra), else
+by the standard library's ElementTree, whose C parser is expat. Both build the
+tree in C and share the conversion below, which is faster than converting
+from expat callbacks. Neither resolves external entities or fetches anything
+from the network.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+try:
+    from lxml import etree
+
+    _PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+    BACKEND = "lxml"
+except ImportError:  # pragma: no cover - optional dependency
+    from xml.etree import ElementTree as etree
+
+    _PARSER = None
+    BACKEND = "expat"
+
+@lru_cache(maxsize=1024)
+def _local(name: str) -> str:
+    """An element or attribute name without its namespace.
+
+    Bounded, as documents are free to use any number of distinct names.
+    """
+    return name.rsplit("}", 1)[-1]
+
+
+def _element_value(element: Any) -> Any:
+    attrib = element.attrib
+    node = {"@" + _local(key): value for key, value in attrib.items()} if attrib else {}
+    if len(element):
+        for child in element:
+            tag = child.tag
+            if type(tag) is not str:  # A comment or processing instruction
+                continue
+            key = _local(tag)
+            value = _element_value(child)
+            existing = node.get(key, node)
+            if existing is node:
+                node[key] = value
+            elif type(existing) is list:
+                existing.append(value)
+            else:
+                node[key] = [existing, value]
+
+    text = element.text
+    text = text.strip() if text else ""
+    if not node:
+        return text or None
+    if text:
+        node["#text"] = text
+    return node
+
+
+def parse_xml(data: bytes) -> Optional[Dict[str, Any]]:
+    """An XML document as nested dicts, or None if it is empty."""
+    if not data.strip():
+        return None
+    root = etree.fromstring(data, _PARSER)
+    return {_local(root.tag): _element_value(root)}
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Incrementally update a generated MCP server from a changed OpenAPI spec.
+
+`mcp-cookie-cutter update` reads the project's mcp-cookie-cutter.lock, reloads
+the spec, repeats the original tool selection and regenerates only the tools
+whose operation fingerprint changed. Tools that disappeared from the spec are
+removed, and generated files that were edited by hand are backed up as
+`<file>.orig` before they are overwritten or deleted.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from cookiecutter.environment import StrictEnvironment
+
+from mcp_cookie_cutter.cli import get_template_dir
+
+LOCKFILE_NAME = "mcp-cookie-cutter.lock"
+HOOK_NAMES = ("pre_gen_project", "post_gen_project")
+
+
+def load_lockfile(project_dir: Path) -> Dict[str, Any]:
+    """Load the lockfile written when the project was generated."""
+    lock_path = project_dir / LOCKFILE_NAME
+    if not lock_path.exists():
+        raise FileNotFoundError(
+            f"{lock_path} not found. Only projects generated with an OpenAPI spec "
+            "by mcp-cookie-cutter 0.2.0 or later can be updated."
+        )
+    with open(lock_path, "r") as f:
+        return json.load(f)
+
+
+def build_context(template_dir: str, lock: Dict[str, Any]) -> Dict[str, Any]:
+    """Template context from the lockfile, with defaults for newer template options."""
+    with open(Path(template_dir) / "cookiecutter.json", "r") as f:
+        defaults = json.load(f)
+
+    context = {}
+    for key, value in defaults.items():
+        if key.startswith("_"):
+            continue
+        context[key] = value[0] if isinstance(value, list) else value
+    context.update(lock.get("context", {}))
+    return context
+
+
+def load_hooks(template_dir: str, context: Dict[str, Any], work_dir: str) -> Dict[str, Any]:
+    """Render the template hooks for this project's context and import them.
+
+    The rendered hooks are written to `work_dir` and imported from there, the
+    same way cookiecutter runs them, so tool generation can still use a
+    process pool.
+    """
+    env = StrictEnvironment(context={"cookiecutter": context}, keep_trailing_newline=True)
+    hooks = {}
+
+    sys.path.insert(0, work_dir)
+    for name in HOOK_NAMES:
+        source = (Path(template_dir) / "hooks" / f"{name}.py").read_text()
+        rendered = env.from_string(source).render(cookiecutter=context)
+        (Path(work_dir) / f"{name}.py").write_text(rendered)
+        sys.modules.pop(name, None)
+        hooks[name] = importlib.import_module(name)
+    return hooks
+
+
+def select_tools(
+    pre_gen: Any, tools: List[Dict[str, Any]], lock: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Repeat the selection recorded in the lockfile against the new operations."""
+    selection = lock.get("selection", {})
+    mode = selection.get("mode", "manual")
+
+    if mode == "rules":
+        return pre_gen.apply_selection_rules(tools, selection.get("rules", {}))
+    if mode == "all":
+        return tools
+
+    locked = lock.get("operations", {})
+    selected = [tool for tool in tools if tool["name"] in locked]
+    unselected = len(tools) - len(selected)
+    if unselected:
+        print(
+            f"   ℹ️  {unselected} operation(s) are not selected in this project and were left out"
+        )
+    return selected
+
+
+def backup_if_modified(path: Path, expected_sha256: Optional[str], post_gen: Any) -> bool:
+    """Copy a hand-edited generated file to `<file>.orig`; return True if it was backed up."""
+    actual = post_gen.file_sha256(path)
+    if actual is None or actual == expected_sha256:
+        return False
+    backup = path.with_name(path.name + ".orig")
+    shutil.copy2(path, backup)
+    print(f"   💾 {path} was modified locally, saved a copy to {backup.name}")
+    return True
+
+
+def update_project(project_dir: str, spec_path: Optional[str] = None, dry_run: bool = False) -> int:
+    """Regenerate the tools of a project whose OpenAPI operations changed."""
+    project = Path(project_dir).resolve()
+    lock = load_lockfile(project)
+    template_dir = get_template_dir()
+    context = build_context(template_dir, lock)
+
+    if spec_path:
+        # Resolve local paths before changing into the project directory
+        if not spec_path.startswith(("http://", "https://")) and os.path.exists(spec_path):
+            spec_path = os.path.abspath(spec_path)
+        context["openapi_spec_path"] = spec_path
+    spec_source = context.get("openapi_spec_path", "")
+    if not spec_source:
+        print(
+            "Error: the project was generated without an OpenAPI spec; pass --spec", file=sys.stderr
+        )
+        return 1
+
+    print(f"\n🔄 Updating {project.name} from {spec_source}")
+
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="mcp-cookie-cutter-") as work_dir:
+        hooks = load_hooks(template_dir, context, work_dir)
+        pre_gen, post_gen = hooks["pre_gen_project"], hooks["post_gen_project"]
+        try:
+            os.chdir(project)
+            return apply_update(pre_gen, post_gen, lock, context, spec_source, dry_run)
+        finally:
+            os.chdir(previous_cwd)
+            sys.path.remove(work_dir)
+            for name in HOOK_NAMES:
+                sys.modules.pop(name, None)
+
+
+def apply_update(
+    pre_gen: Any,
+    post_gen: Any,
+    lock: Dict[str, Any],
+    context: Dict[str, Any],
+    spec_source: str,
+    dry_run: bool,
+) -> int:
+    """Diff the new spec against the lockfile and rewrite the affected files."""
+    spec = pre_gen.load_openapi_spec(spec_source)
+    if not spec:
+        print(f"Error: could not load OpenAPI spec from {spec_source}", file=sys.stderr)
+        return 1
+
+    base_url = pre_gen.extract_base_url(spec)
+    selected = select_tools(pre_gen, pre_gen.extract_tools_from_spec(spec), lock)
+    for tool in selected:
+        tool["fingerprint"] = pre_gen.fingerprint_operation(spec, tool)
+    security_schemes = pre_gen.attach_security(spec, selected)
+
+    locked = lock.get("operations", {})
+    current = {tool["name"]: tool for tool in selected}
+    base_url_changed = base_url != lock.get("base_url", "")
+
+    added = [name for name in current if name not in locked]
+    removed = [name for name in locked if name not in current]
+    changed = [
+        name
+        for name in current
+        if name in locked
+        and (base_url_changed or current[name]["fingerprint"] != locked[name].get("fingerprint"))
+    ]
+    unchanged = len(current) - len(added) - len(changed)
+
+    print(
+        f"   ➕ {len(added)} added   ✏️  {len(changed)} changed   ➖ {len(removed)} removed   "
+        f"= {unchanged} unchanged"
+    )
+    if base_url_changed:
+        print(f"   ℹ️  Base URL changed: {lock.get('base_url', '')} -> {base_url}")
+    for label, names in (("+", added), ("~", changed), ("-", removed)):
+        for name in names:
+            print(f"     {label} {name}")
+
+    if dry_run:
+        print("\n⏭️  Dry run: no files were changed.")
+        return 0
+    if not (added or changed or removed):
+        print("\n✓ Project is up to date.")
+        return 0
+
+    # Back up hand-edited files, then remove tools that are gone from the spec
+    for name in changed:
+        backup_if_modified(Path(locked[name]["tool_file"]), locked[name].get("sha256"), post_gen)
+    for name in removed:
+        tool_file = Path(locked[name]["tool_file"])
+        backup_if_modified(tool_file, locked[name].get("sha256"), post_gen)
+        if tool_file.exists():
+            tool_file.unlink()
+            print(f"   ✓ Removed {tool_file.name}")
+
+    # Models cover every selected tool, so regenerate them in one go
+    with open(".openapi_spec.json", "w") as f:
+        json.dump(pre_gen.prune_spec_for_models(spec, selected), f, indent=2)
+    try:
+        model_classes = post_gen.generate_pydantic_models()
+    finally:
+        os.remove(".openapi_spec.json")
+
+    tool_data = {
+        "base_url": base_url,
+        "context": context,
+        "selection": lock.get("selection", {"mode": "manual"}),
+        "model_classes": model_classes or {},
+        "security_schemes": security_schemes,
+        "has_security_schemes": bool(pre_gen.get_security_schemes(spec)),
+    }
+    regenerate = [current[name] for name in added + changed]
+    if regenerate:
+        print(f"\n🔧 Regenerating {len(regenerate)} tool implementation(s)...")
+        auth_env_vars = post_gen.generate_fastmcp_tools(regenerate, tool_data)
+        if auth_env_vars:
+            print(
+                f"   ℹ️  Tools use API authentication: {', '.join(sorted(auth_env_vars))} "
+                "(check .env.example)"
+            )
+
+    # Only prompt categories that gained, lost or changed operations are rewritten
+    categories = {post_gen.get_tool_category(current[name]) for name in added + changed}
+    categories.update(locked[name].get("category", "general") for name in changed + removed)
+    remaining = {post_gen.get_tool_category(tool) for tool in selected}
+    noun = "category" if len(categories) == 1 else "categories"
+    print(f"\n✨ Updating prompts for {len(categories)} {noun}...")
+    post_gen.generate_fastmcp_prompts(selected, categories & remaining)
+
+    prompts_dir = Path(f"src/{context['project_slug']}/prompts")
+    for category in sorted(categories - remaining):
+        prompt_file = prompts_dir / f"{post_gen.sanitize_tool_name(category)}_operations.py"
+        if prompt_file.exists():
+            prompt_file.unlink()
+            print(f"   ✓ Removed {prompt_file.name}")
+
+    # Keep recorded hashes of untouched files so later edits are still detected
+    regenerated = set(added + changed)
+    file_hashes = {
+        name: locked[name].get("sha256")
+        for name in current
+        if name in locked and name not in regenerated
+    }
+    post_gen.write_lockfile(selected, tool_data, file_hashes)
+
+    print(
+        f"\n✓ Updated {len(regenerated)} tool(s), removed {len(removed)}; {LOCKFILE_NAME} rewritten"
+    )
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for `mcp-cookie-cutter update`."""
+    parser = argparse.ArgumentParser(
+        prog="mcp-cookie-cutter update",
+        description=(
+            "Regenerate the tools of a generated MCP server whose OpenAPI operations changed."
+        ),
+    )
+    parser.add_argument(
+        "project_dir",
+        nargs="?",
+        default=".",
+        help="Generated project directory (default: current directory)",
+    )
+    parser.add_argument(
+        "--spec",
+        help="OpenAPI spec path or URL to update from "
+        "(default: the spec the project was generated from)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show which operations changed without writing any files",
+    )
+    args = parser.parse_args(argv)
+
+    return update_project(args.project_dir, args.spec, args.dry_run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
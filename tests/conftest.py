@@ -0,0 +1,58 @@
+"""Shared fixtures: the template hooks rendered for a test project."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+from cookiecutter.environment import StrictEnvironment
+
+from mcp_cookie_cutter.update import build_context
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def render_hook(name: str, work_dir: Path):
+    """Render hooks/<name>.py with the default context and import it."""
+    context = build_context(
+        str(REPO_ROOT), {"context": {"project_name": "Test Server", "project_slug": "test_server"}}
+    )
+    env = StrictEnvironment(context={"cookiecutter": context}, keep_trailing_newline=True)
+    source = (REPO_ROOT / "hooks" / f"{name}.py").read_text()
+    path = work_dir / f"{name}.py"
+    path.write_text(env.from_string(source).render(cookiecutter=context))
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def pre_gen(tmp_path_factory):
+    return render_hook("pre_gen_project", tmp_path_factory.mktemp("hooks"))
+
+
+@pytest.fixture(scope="session")
+def post_gen(tmp_path_factory):
+    return render_hook("post_gen_project", tmp_path_factory.mktemp("hooks"))
+
+
+@pytest.fixture(scope="session")
+def runtime():
+    """The generated servers' runtime package, imported from the template."""
+    path = (
+        REPO_ROOT
+        / "{{cookiecutter.project_slug}}"
+        / "src"
+        / "{{cookiecutter.project_slug}}"
+        / "runtime"
+    )
+    spec = importlib.util.spec_from_file_location(
+        "test_server_runtime", path / "__init__.py", submodule_search_locations=[str(path)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = package
+    spec.loader.exec_module(package)
+    return package
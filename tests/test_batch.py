@@ -0,0 +1,69 @@
+"""The batch_call tool's runner, with stand-in tool modules."""
+
+import asyncio
+import importlib
+import json
+import sys
+import types
+
+import pytest
+
+
+@pytest.fixture
+def batch(runtime, monkeypatch):
+    module = importlib.import_module(f"{runtime.__name__}.batch")
+    output = importlib.import_module(f"{runtime.__name__}.output")
+    monkeypatch.setattr(output, "MAX_BYTES", 10000)
+
+    async def big(size: int):
+        return output.guard_output({"text": "x" * size})
+
+    async def fail():
+        raise RuntimeError("upstream down\nmore detail")
+
+    async def page(limit: int, tags: list[str] | None = None):
+        return {"limit": limit, "tags": tags}
+
+    for tool in (big, fail, page):
+        tools = types.ModuleType(f"fake.tools.{tool.__name__}")
+        setattr(tools, tool.__name__, tool)
+        monkeypatch.setitem(sys.modules, tools.__name__, tools)
+    return module
+
+
+def test_results_and_errors_in_order(batch):
+    calls = [{"tool": "big", "arguments": {"size": 10}}, {"tool": "fail"}, {"tool": "missing"}]
+    assert asyncio.run(batch.run_batch("fake", calls)) == [
+        {"tool": "big", "result": {"text": "x" * 10}},
+        {"tool": "fail", "error": "RuntimeError: upstream down"},
+        {"tool": "missing", "error": "ValueError: Unknown tool: missing"},
+    ]
+
+
+def test_batch_output_is_bounded(batch):
+    # Each result fits the per-call limits; together they would exceed OUTPUT_MAX_BYTES
+    calls = [{"tool": "big", "arguments": {"size": 3000}}] * 20
+    results = asyncio.run(batch.run_batch("fake", calls))
+    assert len(json.dumps(results)) < 11000
+    assert results[0] == {"tool": "big", "result": {"text": "x" * 3000}}
+    assert "more characters" in results[-2]["result"]["text"]
+    assert results[-1] == f"[showing {len(results) - 1} of 20 items]"
+
+
+def test_arguments_are_validated_like_a_direct_call(batch):
+    calls = [
+        {"tool": "page", "arguments": {"limit": "5", "tags": ["a"]}},
+        {"tool": "page", "arguments": {}},
+        {"tool": "page", "arguments": {"limit": "five", "other": 1}},
+        {"tool": "page", "arguments": [5]},
+    ]
+    assert asyncio.run(batch.run_batch("fake", calls)) == [
+        {"tool": "page", "result": {"limit": 5, "tags": ["a"]}},
+        {"tool": "page", "error": "Invalid arguments: limit: Missing required argument"},
+        {
+            "tool": "page",
+            "error": "Invalid arguments: limit: Input should be a valid integer, unable to parse "
+            "string as an integer; other: Unexpected keyword argument",
+        },
+        {"tool": "page", "error": "ValueError: arguments must be an object"},
+    ]
@@ -0,0 +1,26 @@
+"""Base64 encoding of binary response bodies."""
+
+import base64
+import importlib
+import io
+import tempfile
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def binary(runtime):
+    return importlib.import_module(f"{runtime.__name__}.binary")
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 4, 3 * 64 * 1024 - 1, 3 * 64 * 1024 + 1, 1_000_003])
+def test_encode_base64_matches_b64encode(binary, size):
+    data = bytes(range(256)) * (size // 256) + bytes(size % 256)
+    assert binary.encode_base64(io.BytesIO(data)) == base64.b64encode(data).decode("ascii")
+
+
+def test_encode_base64_starts_at_the_current_position(binary):
+    with tempfile.SpooledTemporaryFile(max_size=16) as spool:
+        spool.write(b"skipped" + b"x" * 100)
+        spool.seek(len(b"skipped"))
+        assert binary.encode_base64(spool) == base64.b64encode(b"x" * 100).decode("ascii")
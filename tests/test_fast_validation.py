@@ -0,0 +1,51 @@
+"""Structural checks of the selected operations (openapi_validation=fast)."""
+
+
+def spec_with_parameter(parameter):
+    return {
+        "openapi": "3.0.0",
+        "paths": {
+            "/pets/{petId}": {
+                "get": {"parameters": [parameter], "responses": {"200": {"description": "ok"}}}
+            }
+        },
+        "components": {
+            "parameters": {
+                "PetId": {
+                    "name": "petId",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                },
+                "Optional": {"name": "petId", "in": "path", "schema": {"type": "string"}},
+            }
+        },
+    }
+
+
+def validate(pre_gen, spec):
+    operation = spec["paths"]["/pets/{petId}"]["get"]
+    tool = {
+        "method": "GET",
+        "path": "/pets/{petId}",
+        "operation": operation,
+        "parameters": operation["parameters"],
+    }
+    return pre_gen.validate_operations_fast(spec, [tool])
+
+
+def test_referenced_path_parameter_is_declared(pre_gen):
+    assert validate(pre_gen, spec_with_parameter({"$ref": "#/components/parameters/PetId"})) == []
+
+
+def test_referenced_parameter_is_checked(pre_gen):
+    problems = validate(pre_gen, spec_with_parameter({"$ref": "#/components/parameters/Optional"}))
+    assert problems == ["GET /pets/{petId}: path parameter 'petId' must be required"]
+
+
+def test_unresolvable_parameter_ref(pre_gen):
+    problems = validate(pre_gen, spec_with_parameter({"$ref": "#/components/parameters/Missing"}))
+    assert problems == [
+        "GET /pets/{petId}: unresolvable $ref #/components/parameters/Missing",
+        "GET /pets/{petId}: path parameter 'petId' is not declared",
+    ]
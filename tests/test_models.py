@@ -0,0 +1,48 @@
+"""Pydantic model generation from the spec's schemas."""
+
+import importlib
+import json
+import sys
+
+import pytest
+
+pytest.importorskip("datamodel_code_generator")
+
+SPEC = {
+    "swagger": "2.0",
+    "info": {"title": "Pets", "version": "1"},
+    "paths": {},
+    "definitions": {
+        "Category": {"type": "object", "properties": {"id": {"type": "integer"}}},
+        "Pet": {
+            "type": "object",
+            "required": ["name"],
+            "properties": {
+                "name": {"type": "string", "example": "doggie"},
+                "category": {"$ref": "#/definitions/Category"},
+            },
+        },
+    },
+}
+
+
+def test_models_are_generated_one_module_each(post_gen, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".openapi_spec.json").write_text(json.dumps(SPEC))
+
+    classes = post_gen.generate_pydantic_models()
+
+    assert classes == {"#/definitions/Category": "Category", "#/definitions/Pet": "Pet"}
+    models_dir = tmp_path / "src" / "test_server" / "models"
+    assert {path.name for path in models_dir.glob("*.py")} >= {
+        "__init__.py",
+        "category.py",
+        "pet.py",
+    }
+
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    for name in [name for name in sys.modules if name.startswith("test_server.")]:
+        monkeypatch.delitem(sys.modules, name)
+    models = importlib.import_module("test_server.models")
+    pet = models.Pet.model_validate({"name": "Rex", "category": {"id": 1}})
+    assert pet.category.id == 1
@@ -0,0 +1,81 @@
+"""Page merging of the generated list tools, against a mock upstream."""
+
+import asyncio
+import importlib
+
+import httpx
+import pytest
+
+ITEMS = list(range(10))
+
+
+def cursor_page(request):
+    """Two items per page; the cursor is the index of the next page's first item."""
+    start = int(request.url.params.get("cursor", 0))
+    body = {"data": ITEMS[start : start + 2]}
+    if start + 2 < len(ITEMS):
+        body["next_cursor"] = str(start + 2)
+    return httpx.Response(200, json=body)
+
+
+@pytest.fixture
+def paginate(runtime):
+    pagination = importlib.import_module(f"{runtime.__name__}.pagination")
+    client = importlib.import_module(f"{runtime.__name__}.client")
+
+    def run(handler, pagination_config, max_items, params=None, **kwargs):
+        async def main():
+            http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            tool_client = client.ToolClient(http, {"connect": 5, "read": 5, "total": 10})
+            return await pagination.paginate(
+                tool_client,
+                "https://api.test/items",
+                params or {},
+                {},
+                pagination_config,
+                max_items,
+                **kwargs,
+            )
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_result_carries_the_last_page_cursor(paginate):
+    result = paginate(cursor_page, {"style": "cursor", "param": "cursor"}, 6)
+    assert result == {"data": [0, 1, 2, 3, 4, 5], "next_cursor": "6"}
+
+
+def test_trimmed_result_has_no_cursor(paginate):
+    result = paginate(cursor_page, {"style": "cursor", "param": "cursor"}, 5)
+    assert result == {"data": [0, 1, 2, 3, 4]}
+
+
+def test_last_page_without_cursor_ends_the_listing(paginate):
+    result = paginate(cursor_page, {"style": "cursor", "param": "cursor"}, 100)
+    assert result == {"data": ITEMS}
+
+
+def test_link_pages_keep_query_credentials(paginate):
+    seen = []
+
+    def handler(request):
+        seen.append(request.url)
+        page = int(request.url.params.get("page", 1))
+        headers = (
+            {"Link": f'<https://api.test/items?page={page + 1}>; rel="next"'} if page < 3 else {}
+        )
+        return httpx.Response(200, headers=headers, json=[page])
+
+    result = paginate(
+        handler,
+        {"style": "link"},
+        10,
+        params={"api_key": "secret", "status": "open"},
+        credential_params=("api_key",),
+    )
+    assert result == [1, 2, 3]
+    assert [url.params.get("api_key") for url in seen] == ["secret"] * 3
+    # Other parameters of the first request are left to the next-page URL
+    assert [url.params.get("status") for url in seen] == ["open", None, None]
@@ -0,0 +1,143 @@
+"""Conditional, compressed fetching of remote specs against a local HTTP server."""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+SPEC = json.dumps(
+    {"openapi": "3.0.0", "info": {"title": "Test", "version": "1"}, "paths": {}}
+).encode()
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 05 Oct 2026 10:00:00 GMT"
+
+
+class SpecHandler(BaseHTTPRequestHandler):
+    """Serves SPEC at /etag, /last-modified, /gzip and a truncated body at /broken."""
+
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append((self.path, dict(self.headers)))
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == ETAG:
+                return self.reply(304)
+            return self.reply(200, SPEC, {"ETag": ETAG})
+        if self.path == "/last-modified":
+            if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                return self.reply(304)
+            return self.reply(200, SPEC, {"Last-Modified": LAST_MODIFIED})
+        if self.path == "/gzip":
+            return self.reply(200, gzip.compress(SPEC), {"Content-Encoding": "gzip"})
+        if self.path == "/broken":
+            # Announce more than is sent, then close the connection
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(SPEC) * 10))
+            self.end_headers()
+            self.wfile.write(SPEC)
+            self.close_connection = True
+            return
+        self.reply(404)
+
+    def reply(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SpecHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    SpecHandler.requests = []
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_etag_is_stored_and_revalidated(pre_gen, server, tmp_path):
+    sha, body_path = pre_gen.fetch_remote_spec(f"{server}/etag", tmp_path)
+    assert sha == hashlib.sha256(SPEC).hexdigest()
+    assert body_path.read_bytes() == SPEC
+
+    again_sha, again_path = pre_gen.fetch_remote_spec(f"{server}/etag", tmp_path)
+    assert (again_sha, again_path) == (sha, body_path)
+    assert SpecHandler.requests[-1][1].get("If-None-Match") == ETAG
+    assert again_path.read_bytes() == SPEC
+
+
+def test_last_modified_is_revalidated(pre_gen, server, tmp_path):
+    sha, _ = pre_gen.fetch_remote_spec(f"{server}/last-modified", tmp_path)
+    again_sha, body_path = pre_gen.fetch_remote_spec(f"{server}/last-modified", tmp_path)
+    assert SpecHandler.requests[-1][1].get("If-Modified-Since") == LAST_MODIFIED
+    assert again_sha == sha == hashlib.sha256(SPEC).hexdigest()
+    assert body_path.read_bytes() == SPEC
+
+
+def test_gzip_body_is_stored_decoded(pre_gen, server, tmp_path):
+    sha, body_path = pre_gen.fetch_remote_spec(f"{server}/gzip", tmp_path)
+    assert "gzip" in SpecHandler.requests[-1][1].get("Accept-Encoding", "")
+    assert body_path.read_bytes() == SPEC
+    assert sha == hashlib.sha256(SPEC).hexdigest()
+
+
+def test_failed_download_leaves_no_partial_file(pre_gen, server, tmp_path):
+    with pytest.raises(requests.RequestException):
+        pre_gen.fetch_remote_spec(f"{server}/broken", tmp_path)
+    assert list((tmp_path / "http").iterdir()) == []
+
+
+def test_interrupted_refresh_does_not_pair_new_body_with_old_metadata(
+    pre_gen, server, tmp_path, monkeypatch
+):
+    pre_gen.fetch_remote_spec(f"{server}/last-modified", tmp_path)
+    meta_path = next((tmp_path / "http").glob("*.json"))
+    meta = json.loads(meta_path.read_text())
+    meta["last_modified"], meta["sha256"] = "Thu, 01 Jan 2026 00:00:00 GMT", "stale"
+    meta_path.write_text(json.dumps(meta))
+
+    replace = os.replace
+
+    def interrupted(src, dst):
+        replace(src, dst)
+        raise KeyboardInterrupt
+
+    # The server answers the outdated date with a new body; stop right after storing it
+    monkeypatch.setattr(pre_gen.os, "replace", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        pre_gen.fetch_remote_spec(f"{server}/last-modified", tmp_path)
+    monkeypatch.undo()
+
+    sha, _ = pre_gen.fetch_remote_spec(f"{server}/last-modified", tmp_path)
+    assert "If-Modified-Since" not in SpecHandler.requests[-1][1]
+    assert sha == hashlib.sha256(SPEC).hexdigest()
+
+
+def test_downloads_count_against_the_cache_budget(pre_gen, server, tmp_path, monkeypatch):
+    (tmp_path / "specs").mkdir()
+    old_entry = tmp_path / "specs" / "old.json"
+    old_entry.write_bytes(b"x" * 600)
+    os.utime(old_entry, (0, 0))
+    pre_gen.fetch_remote_spec(f"{server}/etag", tmp_path)
+
+    # Room for the download, not for both
+    monkeypatch.setenv("MCP_COOKIE_CUTTER_CACHE_MAX_MB", str(800 / 1024 / 1024))
+    pre_gen.evict_spec_cache(tmp_path)
+    assert not old_entry.exists()
+    assert {path.suffix for path in (tmp_path / "http").iterdir()} == {".body", ".json"}
+
+    monkeypatch.setenv("MCP_COOKIE_CUTTER_CACHE_MAX_MB", "0")
+    pre_gen.evict_spec_cache(tmp_path)
+    assert list((tmp_path / "http").iterdir()) == []
@@ -0,0 +1,24 @@
+"""How generated tools decode responses, by the media types an operation offers."""
+
+import pytest
+
+
+def responses(*media_types):
+    return {"responses": {"200": {"content": {media_type: {} for media_type in media_types}}}}
+
+
+@pytest.mark.parametrize(
+    "operation, expected",
+    [
+        (responses("application/json"), ("json", None)),
+        (responses("application/json", "application/xml"), ("json", "application/json")),
+        (responses("application/xml"), ("xml", "application/xml")),
+        (responses("image/png"), ("binary", None)),
+        (responses("application/octet-stream", "application/json"), ("json", None)),
+        ({"produces": ["image/jpeg"], "responses": {"200": {}}}, ("binary", None)),
+        ({"responses": {"200": {"schema": {"type": "file"}}}}, ("binary", None)),
+        ({"responses": {"204": {}}}, ("json", None)),
+    ],
+)
+def test_response_codec(post_gen, operation, expected):
+    assert post_gen.get_response_codec(operation) == expected
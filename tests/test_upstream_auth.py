@@ -0,0 +1,107 @@
+"""Client-credentials tokens of the generated servers, against a fake token endpoint."""
+
+import asyncio
+import base64
+import importlib
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+
+class TokenServer:
+    """Answers client-credentials requests with numbered tokens per endpoint."""
+
+    def __init__(self, expires_in=3600, access_token=True):
+        self.requests = []
+        self.expires_in = expires_in
+        self.access_token = access_token
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if not self.access_token:
+            return httpx.Response(200, json={"token_type": "bearer"})
+        token = f"{request.url.host}-{len(self.requests)}"
+        return httpx.Response(200, json={"access_token": token, "expires_in": self.expires_in})
+
+
+@pytest.fixture
+def auth(runtime, monkeypatch):
+    module = importlib.import_module(f"{runtime.__name__}.upstream_auth")
+    monkeypatch.setattr(module, "TOKEN_URL", "")
+    monkeypatch.setattr(module, "CLIENT_ID", "client")
+    monkeypatch.setattr(module, "CLIENT_SECRET", "secret")
+    monkeypatch.setattr(module, "_providers", {})
+    monkeypatch.delenv("UPSTREAM_OAUTH_SCOPE", raising=False)
+    return module
+
+
+def use_server(auth, monkeypatch, server):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+    monkeypatch.setattr(auth, "get_client", lambda: client)
+
+
+def test_concurrent_callers_share_one_fetch(auth, monkeypatch):
+    server = TokenServer()
+    use_server(auth, monkeypatch, server)
+
+    async def main():
+        provider = auth.get_token_provider("https://auth.test/token")
+        return await asyncio.gather(*(provider.get_token() for _ in range(10)))
+
+    assert asyncio.run(main()) == ["auth.test-1"] * 10
+    assert len(server.requests) == 1
+    request = server.requests[0]
+    assert parse_qs(request.content.decode()) == {"grant_type": ["client_credentials"]}
+    assert (
+        request.headers["Authorization"] == "Basic " + base64.b64encode(b"client:secret").decode()
+    )
+
+
+def test_token_is_refreshed_in_the_background(auth, monkeypatch):
+    # A 2-second lifetime puts the token inside its refresh margin at once
+    server = TokenServer(expires_in=2)
+    use_server(auth, monkeypatch, server)
+
+    async def main():
+        provider = auth.get_token_provider("https://auth.test/token")
+        first = await provider.get_token()
+        provider.refresh_at = 0.0
+        during = await provider.get_token()
+        await provider._refresh_task
+        return first, during, await provider.get_token()
+
+    assert asyncio.run(main()) == ("auth.test-1", "auth.test-1", "auth.test-2")
+
+
+def test_each_token_url_has_its_own_provider(auth, monkeypatch):
+    server = TokenServer()
+    use_server(auth, monkeypatch, server)
+
+    async def main():
+        first = auth.get_token_provider("https://one.test/token")
+        second = auth.get_token_provider("https://two.test/token")
+        assert first is not second
+        assert auth.get_token_provider("https://one.test/token") is first
+        return await first.get_token(), await second.get_token()
+
+    assert asyncio.run(main()) == ("one.test-1", "two.test-2")
+
+
+def test_missing_access_token_is_an_error(auth, monkeypatch):
+    use_server(auth, monkeypatch, TokenServer(access_token=False))
+
+    async def main():
+        await auth.get_token_provider("https://auth.test/token").get_token()
+
+    with pytest.raises(ValueError, match="no access_token"):
+        asyncio.run(main())
+
+
+def test_unconfigured_client_has_no_provider(auth, monkeypatch):
+    monkeypatch.setattr(auth, "CLIENT_SECRET", "")
+
+    async def main():
+        return auth.get_token_provider("https://auth.test/token")
+
+    assert asyncio.run(main()) is None
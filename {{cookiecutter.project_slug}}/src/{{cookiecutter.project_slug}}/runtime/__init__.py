@@ -0,0 +1 @@
+"""Runtime helpers shared by the generated tools."""
@@ -0,0 +1,205 @@
+"""Shared HTTP client for the generated tools.
+
+All tools send their requests through one httpx.AsyncClient, so calls to the
+API reuse pooled keep-alive connections instead of opening (and TLS
+handshaking) a new connection per call. Each tool call wraps it in a
+ToolClient, which applies the tool's timeouts and deadline (see timeouts.py),
+compresses its request bodies when configured (see compression.py) and answers
+GET requests from the response cache when one is enabled (see cache.py).
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .cache import cache_key, get_cache, lookup, store
+from .compression import (
+    client_headers,
+    compress_json_body,
+    disable_request_compression,
+    record_response,
+    resolve_request_encoding,
+)
+from .timeouts import RETRIES, RETRY_BACKOFF, resolve_timeouts
+
+# Requests that may be repeated without side effects, and statuses worth retrying
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+RETRY_STATUSES = frozenset((429, 502, 503, 504))
+
+# Connection pool bounds, shared by every tool
+MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+# asyncio.timeout (Python 3.11+) bounds a request without wrapping it in a task
+_asyncio_timeout = getattr(asyncio, "timeout", None)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it for the running event loop.
+
+    Pooled connections belong to the loop that opened them, so a new client is
+    created if the server (or a test) starts another loop.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            follow_redirects=True,
+            headers=client_headers(),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+class ToolClient:
+    """The shared client, bounded by one tool call's timeouts and deadline.
+
+    The deadline starts when the ToolClient is created and covers every request
+    made through it, including retries and further pages.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, timeouts: Dict[str, float], timeout: Optional[httpx.Timeout] = None,
+                 request_encoding: Optional[str] = None):
+        self.client = client
+        self.timeouts = timeouts
+        self.request_encoding = request_encoding
+        self.deadline = time.monotonic() + timeouts["total"]
+        # Used as is while the deadline is further away than the connect and read timeouts
+        self.timeout = timeout or build_timeout(timeouts, timeouts["total"])
+        self.longest = max(timeouts["connect"], timeouts["read"])
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    async def request(self, method: str, url: str, stream: bool = False, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying idempotent ones while the deadline allows.
+
+        With `stream`, the response body is left unread: the caller reads it
+        (within remaining()) and closes the response. GET requests that are not
+        streamed go through the response cache, if one is enabled.
+        """
+        cache = get_cache() if method.upper() == "GET" and not stream and "auth" not in kwargs else None
+        if cache is None:
+            return await self.send(method, url, stream, **kwargs)
+        key = cache_key(url, kwargs.get("params"), kwargs.get("headers"))
+        response = lookup(cache, key, url)
+        if response is None:
+            response = await self.send(method, url, stream, **kwargs)
+            store(cache, key, response)
+        return response
+
+    async def send(self, method: str, url: str, stream: bool = False, **kwargs: Any) -> httpx.Response:
+        """Send a request past the cache, retrying idempotent ones while the deadline allows."""
+        attempts = RETRIES + 1 if method.upper() in IDEMPOTENT_METHODS else 1
+        if not kwargs.get("params"):
+            # httpx parses the URL a second time to merge even an empty params dict
+            kwargs.pop("params", None)
+        plain = kwargs
+        if self.request_encoding is not None and kwargs.get("json") is not None:
+            kwargs = compress_json_body(kwargs, self.request_encoding, url)
+        attempt = 0
+        while True:
+            remaining = self.remaining()
+            if remaining <= 0:
+                raise httpx.TimeoutException(f"{method} {url} exceeded its {self.timeouts['total']}s deadline")
+
+            timeout = self.timeout if remaining >= self.longest else build_timeout(self.timeouts, remaining)
+            attempt += 1
+            error: Optional[httpx.TransportError] = None
+            try:
+                # The read timeout applies per chunk, so bound the whole exchange too
+                if stream:
+                    sending = self.client.send(self.client.build_request(method, url, timeout=timeout, **kwargs), stream=True)
+                else:
+                    sending = self.client.request(method, url, timeout=timeout, **kwargs)
+                if _asyncio_timeout is not None:
+                    async with _asyncio_timeout(remaining):
+                        response = await sending
+                else:
+                    response = await asyncio.wait_for(sending, remaining)
+            except asyncio.TimeoutError:
+                raise httpx.TimeoutException(
+                    f"{method} {url} exceeded its {self.timeouts['total']}s deadline"
+                ) from None
+            except httpx.TransportError as e:
+                error = e
+            else:
+                if not stream:
+                    record_response(response)
+                if response.status_code == 415 and kwargs is not plain:
+                    # The server does not take compressed bodies: resend this one as is
+                    await response.aclose()
+                    disable_request_compression(url)
+                    kwargs = plain
+                    attempt -= 1
+                    continue
+
+            # Retry only if another attempt is allowed and its backoff fits in the deadline
+            backoff = RETRY_BACKOFF * 2 ** (attempt - 1)
+            can_retry = attempt < attempts and backoff < self.remaining()
+            if error is not None:
+                if not can_retry:
+                    raise error
+            elif not can_retry or response.status_code not in RETRY_STATUSES:
+                return response
+            else:
+                await response.aclose()
+            await asyncio.sleep(backoff)
+
+    async def read(self, response: httpx.Response) -> None:
+        """Read the body of a streamed response within the deadline."""
+        try:
+            await asyncio.wait_for(response.aread(), max(self.remaining(), 0))
+        except asyncio.TimeoutError:
+            raise httpx.TimeoutException(
+                f"Reading {response.url} exceeded its {self.timeouts['total']}s deadline"
+            ) from None
+        record_response(response)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+
+def build_timeout(timeouts: Dict[str, float], remaining: float) -> httpx.Timeout:
+    """httpx timeouts of one request, none longer than the time left."""
+    return httpx.Timeout(
+        connect=min(timeouts["connect"], remaining),
+        read=min(timeouts["read"], remaining),
+        write=min(timeouts["read"], remaining),
+        pool=min(timeouts["connect"], remaining),
+    )
+
+
+_request_timeouts: Dict[str, httpx.Timeout] = {}
+
+
+def get_tool_client(tool_name: str, spec_timeouts: Optional[Dict[str, Any]] = None,
+                    spec_encoding: Optional[str] = None) -> ToolClient:
+    """The shared client with the timeouts and request encoding of `tool_name`, for one tool call."""
+    timeouts = resolve_timeouts(tool_name, spec_timeouts)
+    timeout = _request_timeouts.get(tool_name)
+    if timeout is None:
+        timeout = _request_timeouts[tool_name] = build_timeout(timeouts, timeouts["total"])
+    return ToolClient(get_client(), timeouts, timeout, resolve_request_encoding(spec_encoding))
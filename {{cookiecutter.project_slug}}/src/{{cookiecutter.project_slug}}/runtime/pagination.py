@@ -0,0 +1,211 @@
+"""Fetch and merge the pages of a paginated list endpoint.
+
+The generator detects how an operation paginates and records it in the tool's
+PAGINATION constant:
+
+- "page": a page number parameter (with its first page number)
+- "offset": an item offset parameter
+- "cursor": a cursor parameter whose next value is found in the response body
+- "link": RFC 8288 `Link: <...>; rel="next"` response headers
+
+Page and offset listings have predictable next requests, so further pages are
+prefetched PAGINATION_PREFETCH at a time. Cursor and Link listings name their
+next page in each response and are followed one page at a time. Every page is
+requested through the tool call's ToolClient, so all pages share its deadline.
+Next-page URLs are requested with the tool's credential query parameters
+(e.g. an apiKey sent in the query), which servers leave out of those URLs.
+
+The merged result carries the next-page fields (next_cursor, ...) of the last
+page fetched, so a caller can resume after it. When items were cut off at
+max_items no cursor resumes right after the last item returned, and these
+fields are removed.
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from .client import ToolClient
+
+# Number of page/offset requests in flight at once
+PREFETCH_PAGES = max(1, int(os.getenv("PAGINATION_PREFETCH", "4")))
+
+# Keys of the item list in object responses, checked in order
+ITEM_KEYS = ("data", "items", "results", "records", "entries", "values")
+# Keys (and objects holding them) that carry the next cursor
+CURSOR_KEYS = ("next_cursor", "nextCursor", "next_page_token", "nextPageToken", "next", "cursor")
+CURSOR_CONTAINERS = ("meta", "pagination", "paging", "links", "response_metadata")
+# Headers that report the total number of items
+TOTAL_HEADERS = ("x-total-count", "x-total", "pagination-count")
+
+
+def find_items(data: Any) -> Tuple[Optional[List[Any]], Optional[str]]:
+    """Return the item list of a page and the key it was found under."""
+    if isinstance(data, list):
+        return data, None
+    if not isinstance(data, dict):
+        return None, None
+    for key in ITEM_KEYS:
+        if isinstance(data.get(key), list):
+            return data[key], key
+    lists = [key for key, value in data.items() if isinstance(value, list)]
+    if len(lists) == 1:
+        return data[lists[0]], lists[0]
+    return None, None
+
+
+def find_cursor(data: Any) -> Optional[str]:
+    """Return the next-page cursor (or URL) of a page, if any."""
+    if not isinstance(data, dict):
+        return None
+    for container in (data, *(data.get(key) for key in CURSOR_CONTAINERS)):
+        if not isinstance(container, dict):
+            continue
+        for key in CURSOR_KEYS:
+            value = container.get(key)
+            if value and isinstance(value, (str, int)):
+                return str(value)
+    return None
+
+
+def with_next_page_fields(merged: Dict[str, Any], last: Any, trimmed: bool) -> Dict[str, Any]:
+    """`merged` with the next-page fields of `last`, or without them if `trimmed`."""
+    last = last if isinstance(last, dict) else {}
+
+    def update(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+        for key in CURSOR_KEYS:
+            if key in target:
+                if trimmed or key not in source:
+                    del target[key]
+                else:
+                    target[key] = source[key]
+
+    update(merged, last)
+    for container in CURSOR_CONTAINERS:
+        if isinstance(merged.get(container), dict):
+            merged[container] = dict(merged[container])
+            source = last.get(container)
+            update(merged[container], source if isinstance(source, dict) else {})
+    return merged
+
+
+def with_params(url: str, params: Dict[str, Any]) -> str:
+    """`url` with `params` added to its query string (httpx would replace it)."""
+    return str(httpx.URL(url).copy_merge_params(params)) if params else url
+
+
+def get_total(response: httpx.Response) -> Optional[int]:
+    """Total item count advertised in the response headers, if any."""
+    for header in TOTAL_HEADERS:
+        value = response.headers.get(header)
+        if value and value.isdigit():
+            return int(value)
+    return None
+
+
+def parse_page(response: httpx.Response, adapter: Any = None) -> Any:
+    """Parse one page as JSON, validating it when the tool has a response adapter."""
+    response.raise_for_status()
+    if not response.content:
+        return []
+    if adapter is not None:
+        return adapter.dump_python(adapter.validate_json(response.content), mode="json", by_alias=True, exclude_unset=True)
+    return response.json()
+
+
+async def paginate(
+    client: ToolClient,
+    url: str,
+    params: Dict[str, Any],
+    headers: Dict[str, str],
+    pagination: Dict[str, Any],
+    max_items: int,
+    adapter: Any = None,
+    credential_params: Sequence[str] = (),
+) -> Any:
+    """GET `url` and its following pages until `max_items` items are collected.
+
+    Items of all pages are merged into the first page: a list response becomes
+    the merged list, and an object response keeps its other fields with the
+    merged item list in place of its own. `credential_params` name the query
+    parameters in `params` that are sent with next-page URLs too.
+    """
+    response = await client.get(url, params=params, headers=headers)
+    first = parse_page(response, adapter)
+    items, key = find_items(first)
+    if items is None:
+        return first  # Not a list response, nothing to merge
+
+    collected = list(items)
+    last = first
+    credentials = {name: params[name] for name in credential_params if name in params}
+    style = pagination.get("style")
+    page_size = len(items)
+    total = get_total(response)
+    if total is not None:
+        max_items = min(max_items, total)
+
+    if style in ("page", "offset") and page_size:
+        param = pagination["param"]
+        if style == "page":
+            start = int(params.get(param, pagination.get("first", 1)))
+            step = 1
+        else:
+            start = int(params.get(param, 0))
+            step = page_size
+
+        fetched = 0
+        done = False
+        while not done and len(collected) < max_items:
+            # Request only as many pages as can still be needed, a window at a time
+            needed = -(-(max_items - len(collected)) // page_size)
+            window = range(fetched + 1, fetched + 1 + min(needed, PREFETCH_PAGES))
+            responses = await asyncio.gather(*(
+                client.get(url, params={**params, param: start + index * step}, headers=headers)
+                for index in window
+            ))
+            fetched += len(window)
+            for page_response in responses:
+                page = parse_page(page_response, adapter)
+                page_items, _ = find_items(page)
+                if page_items == items:
+                    done = True  # The API ignored the page parameter
+                    break
+                if page_items:
+                    collected.extend(page_items)
+                    last = page
+                # A short or empty page is the last one
+                if not page_items or len(page_items) < page_size:
+                    done = True
+                    break
+    else:
+        page = first
+        while len(collected) < max_items:
+            next_url = response.links.get("next", {}).get("url")
+            if next_url:
+                response = await client.get(with_params(next_url, credentials), headers=headers)
+            elif style == "cursor":
+                cursor = find_cursor(page)
+                if not cursor:
+                    break
+                if cursor.startswith(("http://", "https://")):
+                    response = await client.get(with_params(cursor, credentials), headers=headers)
+                else:
+                    response = await client.get(url, params={**params, pagination["param"]: cursor}, headers=headers)
+            else:
+                break
+
+            page = parse_page(response, adapter)
+            page_items, _ = find_items(page)
+            if not page_items:
+                break
+            collected.extend(page_items)
+            last = page
+
+    trimmed = len(collected) > max_items
+    collected = collected[:max_items]
+    if key is None:
+        return collected
+    return with_next_page_fields({**first, key: collected}, last, trimmed)
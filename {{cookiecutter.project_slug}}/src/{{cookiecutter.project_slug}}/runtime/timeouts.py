@@ -0,0 +1,92 @@
+"""Upstream timeouts of the generated tools.
+
+Each tool call has a connect timeout, a read timeout and a total deadline that
+covers all of its requests, including retries and pagination. They are
+resolved per tool, each source overriding the previous one:
+
+1. UPSTREAM_CONNECT_TIMEOUT / UPSTREAM_READ_TIMEOUT / UPSTREAM_TOTAL_TIMEOUT
+2. The operation's `x-mcp-timeout` extension (the tool's TIMEOUTS constant)
+3. The latency profile named by UPSTREAM_LATENCY_PROFILE, a JSON file such as
+   {"getPetById": {"p99": 0.4}, "findPets": {"read": 10, "total": 30}}.
+   A measured "p99" (seconds) sets the read timeout to PROFILE_FACTOR times
+   the p99, and the total to that times the number of attempts.
+4. UPSTREAM_TIMEOUT_<TOOL_NAME>, e.g. UPSTREAM_TIMEOUT_GETPETBYID="read=10,total=20"
+   (a single number sets the total)
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUTS = {
+    "connect": float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "5")),
+    "read": float(os.getenv("UPSTREAM_READ_TIMEOUT", "30")),
+    "total": float(os.getenv("UPSTREAM_TOTAL_TIMEOUT", "60")),
+}
+# Extra attempts for idempotent requests that time out or get a 429/502/503/504
+RETRIES = max(0, int(os.getenv("UPSTREAM_RETRIES", "0")))
+RETRY_BACKOFF = float(os.getenv("UPSTREAM_RETRY_BACKOFF", "0.2"))
+# Read timeout as a multiple of the profiled p99 latency, and its floor
+PROFILE_FACTOR = 3.0
+PROFILE_MIN_READ = 1.0
+
+_profile: Optional[Dict[str, Any]] = None
+_resolved: Dict[str, Dict[str, float]] = {}
+
+
+def parse_timeouts(value: Any) -> Dict[str, float]:
+    """Normalise a timeout setting: a number (total) or connect/read/total values."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {"total": float(value)}
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return {}
+        if "=" not in value:
+            return {"total": float(value)}
+        value = dict(part.split("=", 1) for part in value.split(",") if "=" in part)
+    if not isinstance(value, dict):
+        return {}
+    return {key: float(value[key]) for key in DEFAULT_TIMEOUTS if value.get(key) is not None}
+
+
+def load_profile() -> Dict[str, Any]:
+    """The latency profile named by UPSTREAM_LATENCY_PROFILE, loaded once."""
+    global _profile
+    if _profile is None:
+        _profile = {}
+        path = os.getenv("UPSTREAM_LATENCY_PROFILE")
+        if path:
+            try:
+                with open(path, "r") as f:
+                    _profile = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring latency profile {path}: {e}")
+    return _profile
+
+
+def profile_timeouts(entry: Any) -> Dict[str, float]:
+    """Timeouts from a latency profile entry."""
+    if isinstance(entry, dict) and entry.get("p99") is not None:
+        read = max(PROFILE_MIN_READ, PROFILE_FACTOR * float(entry["p99"]))
+        return {"read": read, "total": read * (RETRIES + 1), **parse_timeouts(entry)}
+    return parse_timeouts(entry)
+
+
+def resolve_timeouts(tool_name: str, spec_timeouts: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """Connect, read and total timeouts of a tool (cached per tool)."""
+    timeouts = _resolved.get(tool_name)
+    if timeouts is None:
+        env_name = "UPSTREAM_TIMEOUT_" + re.sub(r"[^A-Z0-9]", "_", tool_name.upper())
+        timeouts = {
+            **DEFAULT_TIMEOUTS,
+            **parse_timeouts(spec_timeouts or {}),
+            **profile_timeouts(load_profile().get(tool_name)),
+            **parse_timeouts(os.getenv(env_name, "")),
+        }
+        _resolved[tool_name] = timeouts
+    return timeouts
@@ -0,0 +1,96 @@
+"""Request bodies streamed from local files, for upload operations.
+
+A tool's file argument is a local path or a file:// URI. The file is never
+read into memory whole:
+
+- multipart/form-data bodies are built by httpx from the open files, which it
+  reads in chunks while sending (multipart_body)
+- raw bodies (application/octet-stream, image/png, ...) are sent from a
+  FileUpload, read in chunks of UPLOAD_CHUNK_BYTES (default 64 KiB)
+
+Both state their Content-Length, and both can be sent again when a request
+is retried. Raw bodies are read in a worker thread, so other tool calls keep
+running during a large upload.
+
+Uploads are refused until UPLOAD_DIR names the directory they may come from;
+otherwise any MCP client could make the server send any file it can read
+(.env, SSH keys, ...) upstream. Relative paths are taken from UPLOAD_DIR, and
+paths that resolve outside it, through ".." or symlinks, are refused.
+"""
+
+import asyncio
+import mimetypes
+import os
+from contextlib import ExitStack, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+from urllib.request import url2pathname
+
+CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", "65536"))
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "")
+
+
+def resolve_path(source: str) -> str:
+    """The local path of a file argument, a path or a file:// URI."""
+    if "://" in source:
+        parts = urlsplit(source)
+        if parts.scheme != "file" or parts.netloc not in ("", "localhost"):
+            raise ValueError(f"Cannot upload {source!r}: only local paths and file:// URIs are supported")
+        source = url2pathname(unquote(parts.path))
+    if not UPLOAD_DIR:
+        raise ValueError(f"Cannot upload {source!r}: uploads are disabled until UPLOAD_DIR is set")
+    root = os.path.realpath(os.path.expanduser(UPLOAD_DIR))
+    path = os.path.realpath(os.path.join(root, os.path.expanduser(source)))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"Cannot upload {source!r}: files must be inside UPLOAD_DIR ({root})")
+    if not os.path.isfile(path):
+        raise ValueError(f"Cannot upload {source!r}: no such file")
+    return path
+
+
+class FileUpload:
+    """A local file sent as a raw request body, in chunks.
+
+    Each iteration opens the file again, so a retried request resends it
+    from the start.
+    """
+
+    def __init__(self, source: str):
+        self.path = resolve_path(source)
+        self.size = os.path.getsize(self.path)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        file = await asyncio.to_thread(open, self.path, "rb")
+        try:
+            while True:
+                chunk = await asyncio.to_thread(file.read, CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            file.close()
+
+
+def form_value(value: Any) -> str:
+    """A form field's text: JSON spelling for booleans, str() otherwise."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+@contextmanager
+def multipart_body(fields: Dict[str, Any], files: Dict[str, Optional[str]]) -> Iterator[Dict[str, Tuple[Any, ...]]]:
+    """The `files` argument of httpx for a multipart body, with the files open.
+
+    `fields` are plain form fields; `files` map field names to file arguments
+    (None leaves the field out). The files are closed on exit.
+    """
+    parts: Dict[str, Tuple[Any, ...]] = {name: (None, form_value(value)) for name, value in fields.items()}
+    with ExitStack() as stack:
+        for name, source in files.items():
+            if source is None:
+                continue
+            path = resolve_path(source)
+            content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            parts[name] = (os.path.basename(path), stack.enter_context(open(path, "rb")), content_type)
+        yield parts
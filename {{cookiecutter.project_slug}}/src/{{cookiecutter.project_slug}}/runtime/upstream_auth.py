@@ -0,0 +1,159 @@
+"""OAuth 2.0 client-credentials tokens for the upstream API.
+
+When UPSTREAM_OAUTH_TOKEN_URL, UPSTREAM_OAUTH_CLIENT_ID and
+UPSTREAM_OAUTH_CLIENT_SECRET are set, tools that take a bearer token get one
+from the token endpoint instead of a static environment variable:
+
+- A token is fetched once and cached until UPSTREAM_OAUTH_REFRESH_MARGIN
+  seconds (default 60, at most half its lifetime) before it expires.
+- Inside that margin the cached token is still used while one background task
+  fetches the next one.
+- Without a usable token, callers wait on a single shared fetch (single-flight),
+  so concurrent tool calls never stampede the token endpoint.
+
+There is one provider per token endpoint, client and scope, so security
+schemes with different tokenUrls each get their tokens from their own endpoint.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from .client import get_client
+
+logger = logging.getLogger(__name__)
+
+# Read once at import; tool calls ask for a provider on every call
+TOKEN_URL = os.getenv("UPSTREAM_OAUTH_TOKEN_URL", "")
+CLIENT_ID = os.getenv("UPSTREAM_OAUTH_CLIENT_ID", "")
+CLIENT_SECRET = os.getenv("UPSTREAM_OAUTH_CLIENT_SECRET", "")
+REFRESH_MARGIN = float(os.getenv("UPSTREAM_OAUTH_REFRESH_MARGIN", "60"))
+# Lifetime assumed when the token response has no expires_in
+DEFAULT_EXPIRES_IN = 3600.0
+TOKEN_TIMEOUT = httpx.Timeout(10.0)
+
+
+class TokenProvider:
+    """Fetches and caches client-credentials access tokens."""
+
+    def __init__(self, token_url: str, client_id: str, client_secret: str,
+                 scope: str = "", audience: str = "", client_auth: str = "basic"):
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self.audience = audience
+        self.client_auth = client_auth
+        self.token: Optional[str] = None
+        self.expires_at = 0.0
+        self.refresh_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def get_token(self) -> str:
+        """Return a valid access token, fetching one only when needed."""
+        now = time.monotonic()
+        if self.token and now < self.refresh_at:
+            return self.token
+        if self.token and now < self.expires_at:
+            # Still valid: refresh in the background and answer immediately
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._refresh_in_background())
+            return self.token
+
+        async with self._lock:
+            # Another caller may have fetched a token while this one waited
+            if not self.token or time.monotonic() >= self.expires_at:
+                await self._fetch()
+            if not self.token:
+                raise RuntimeError(f"No access token from {self.token_url}")
+            return self.token
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            async with self._lock:
+                if time.monotonic() >= self.refresh_at:
+                    await self._fetch()
+        except Exception as e:
+            # The current token stays in use; the next call past expiry retries
+            logger.warning(f"Background token refresh failed: {e}")
+
+    async def _fetch(self) -> None:
+        data: Dict[str, Any] = {"grant_type": "client_credentials"}
+        if self.scope:
+            data["scope"] = self.scope
+        if self.audience:
+            data["audience"] = self.audience
+
+        auth = None
+        if self.client_auth == "post":
+            data.update(client_id=self.client_id, client_secret=self.client_secret)
+        else:
+            auth = httpx.BasicAuth(self.client_id, self.client_secret)
+
+        started = time.monotonic()
+        response = await get_client().post(self.token_url, data=data, auth=auth, timeout=TOKEN_TIMEOUT)
+        response.raise_for_status()
+        payload = response.json()
+        if not payload.get("access_token"):
+            raise ValueError(f"Token endpoint {self.token_url} returned no access_token")
+
+        self.token = payload["access_token"]
+        # Count the lifetime from when the request was sent
+        lifetime = float(payload.get("expires_in") or DEFAULT_EXPIRES_IN)
+        self.expires_at = started + lifetime
+        self.refresh_at = self.expires_at - min(REFRESH_MARGIN, lifetime / 2)
+
+
+# Providers by token endpoint, client ID and scope
+_providers: Dict[Tuple[str, str, str], TokenProvider] = {}
+_providers_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_token_provider(default_token_url: str = "") -> Optional[TokenProvider]:
+    """The provider configured from UPSTREAM_OAUTH_* variables, or None if unset.
+
+    `default_token_url` (a security scheme's tokenUrl) is used when
+    UPSTREAM_OAUTH_TOKEN_URL is not set.
+    """
+    global _providers_loop
+    token_url = TOKEN_URL or default_token_url
+    if not (token_url and CLIENT_ID and CLIENT_SECRET):
+        return None
+
+    # Their locks and refresh tasks belong to one event loop, like the shared client
+    loop = asyncio.get_running_loop()
+    if _providers_loop is not loop:
+        _providers.clear()
+        _providers_loop = loop
+
+    scope = os.getenv("UPSTREAM_OAUTH_SCOPE", "")
+    key = (token_url, CLIENT_ID, scope)
+    provider = _providers.get(key)
+    if provider is None:
+        provider = _providers[key] = TokenProvider(
+            token_url,
+            CLIENT_ID,
+            CLIENT_SECRET,
+            scope=scope,
+            audience=os.getenv("UPSTREAM_OAUTH_AUDIENCE", ""),
+            client_auth=os.getenv("UPSTREAM_OAUTH_CLIENT_AUTH", "basic"),
+        )
+    return provider
+
+
+async def upstream_credential(kind: str) -> str:
+    """An OAuth credential for a tool's auth parameter, or "" if OAuth is not configured.
+
+    `kind` is "bearer" for an Authorization header value and "token" for a
+    bare access token.
+    """
+    provider = get_token_provider()
+    if provider is None:
+        return ""
+    token = await provider.get_token()
+    return f"Bearer {token}" if kind == "bearer" else token